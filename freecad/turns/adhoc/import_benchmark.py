@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Import-time benchmark for the workbench modules.
+
+Each module is imported in a fresh interpreter, reporting the mean
+import time and the number of workbench modules it loads:
+
+    python -m freecad.turns.adhoc.import_benchmark [module ...] [-n repeats]
+        [--stub module ...]
+
+FreeCAD, FreeCADGui, PySide and the other modules only FreeCAD provides
+are replaced by empty stub modules in the child interpreter when they
+cannot be imported, so the command and task modules can be measured
+outside FreeCAD.  Stubbed modules are not counted as loaded.  Modules
+which fail to import are reported with the error.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+#modules imported by the workbench Initialize(), followed by the stacks
+#they previously imported eagerly
+MODULES = [
+    'freecad.turns.commands.analysis_command',
+    'freecad.turns.commands.vehicle_template_command',
+    'freecad.turns.commands.path_editor_command',
+    'freecad.turns.tasks.analysis_task',
+    'freecad.turns.tasks.vehicle_template_task',
+    'freecad.turns.trackers.project.analysis_tracker',
+    'freecad.turns.model.vehicle',
+    'freecad.turns.model.path',
+    'freecad.turns.model.analysis',
+]
+
+#modules replaced by stubs if they cannot be imported
+STUBS = ['FreeCAD', 'FreeCADGui', 'PySide', 'PySide2', 'pivy', 'Part',
+         'Sketcher']
+
+#child process script, installing the stubs as a last-resort import
+#finder, then printing the import time and loaded modules as json
+_PROBE = """
+import importlib.abc, importlib.machinery, json, sys, time, types
+
+class _Meta(type):
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _Meta(name, (_Stub,), {{}})
+
+class _Stub(metaclass=_Meta):
+    def __init__(self, *args, **kwargs):
+        pass
+    def __call__(self, *args, **kwargs):
+        return _Stub()
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _Stub()
+
+class _Module(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(_Stub, name)
+
+class _Finder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, name, path, target=None):
+        if any(name == _s or name.startswith(_s + '.') for _s in {stubs!r}):
+            return importlib.machinery.ModuleSpec(name, self, is_package=True)
+    def create_module(self, spec):
+        return _Module(spec.name)
+    def exec_module(self, module):
+        module.__path__ = []
+
+sys.meta_path.append(_Finder())
+
+_start = time.perf_counter()
+try:
+    __import__({module!r})
+    _error = None
+except Exception as _e:
+    _error = '{{}}: {{}}'.format(type(_e).__name__, _e)
+_time = time.perf_counter() - _start
+print(json.dumps({{
+    'time': _time, 'error': _error,
+    'modules': sorted(
+        _m for _m, _v in sys.modules.items()
+        if _m.startswith('freecad.turns') and not isinstance(_v, _Module))
+}}))
+"""
+
+def measure(module, repeats=5, stubs=None):
+    """
+    Import a module in repeated fresh interpreters, returning the mean
+    import time, the workbench modules loaded and any import error
+
+    stubs - modules replaced by stubs if they cannot be imported
+    """
+
+    if stubs is None:
+        stubs = STUBS
+
+    _times = []
+    _result = None
+
+    for _i in range(repeats):
+
+        _out = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, stubs=stubs)],
+            capture_output=True, text=True, check=False
+        )
+
+        try:
+            _result = json.loads(_out.stdout.strip().splitlines()[-1])
+
+        except (IndexError, ValueError):
+            return None, [], _out.stderr.strip().splitlines()[-1:]
+
+        if _result['error']:
+            return None, _result['modules'], _result['error']
+
+        _times.append(_result['time'])
+
+    return sum(_times) / len(_times), _result['modules'], None
+
+def main(args=None):
+    """
+    Run the benchmark, printing a table of results
+    """
+
+    _parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    _parser.add_argument('modules', nargs='*', default=MODULES)
+    _parser.add_argument('-n', '--repeats', type=int, default=5)
+    _parser.add_argument(
+        '--stub', action='append', default=[], metavar='module',
+        help='additional module to stub if it cannot be imported')
+
+    _args = _parser.parse_args(args)
+
+    print('{:<52} {:>10} {:>8}'.format('module', 'time (ms)', 'loaded'))
+
+    for _m in _args.modules:
+
+        _time, _loaded, _error = measure(_m, _args.repeats, STUBS + _args.stub)
+
+        if _error:
+            print('{:<52} {}'.format(_m, _error))
+            continue
+
+        print('{:<52} {:>10.1f} {:>8}'.format(_m, _time * 1000.0, len(_loaded)))
+
+if __name__ == '__main__':
+    main()
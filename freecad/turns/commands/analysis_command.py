@@ -29,8 +29,6 @@ import FreeCADGui as Gui
 
 from freecad.turns import ICONPATH
 
-from ..tasks.analysis_task import AnalysisTask
-
 class AnalysisCommand():
     """
     Analysis Command
@@ -60,6 +58,10 @@ class AnalysisCommand():
         Activation callback
         """
 
+        #the task / tracker stack is imported on first use, so the
+        #command registers without loading it
+        from ..tasks.analysis_task import AnalysisTask
+
         _task = AnalysisTask()
         Gui.Control.showDialog(_task)
         _task.setup_ui()
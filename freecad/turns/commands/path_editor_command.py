@@ -24,8 +24,6 @@ DrawPath Command
 """
 import os
 
-from PySide import QtGui
-
 import FreeCAD as App
 import FreeCADGui as Gui
 
@@ -55,6 +53,8 @@ class PathEditorCommand():
         Activation callback - create / edit a sketch
         """
 
+        from PySide import QtGui
+
         _sel = Gui.Selection.getSelection()
 
         #edit an existing sketch, if selected
@@ -29,8 +29,6 @@ import FreeCADGui as Gui
 
 from freecad.turns import ICONPATH
 
-from ..tasks.vehicle_template_task import VehicleTemplateTask
-
 class VehicleTemplateCommand():
     """
     Vehicle template design Command
@@ -60,6 +58,10 @@ class VehicleTemplateCommand():
         Activation callback
         """
 
+        #the task / tracker stack is imported on first use, so the
+        #command registers without loading it
+        from ..tasks.vehicle_template_task import VehicleTemplateTask
+
         _task = VehicleTemplateTask()
         Gui.Control.showDialog(_task)
         _task.setup_ui()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Headless swept path analysis, usable without FreeCADGui or coin
+"""
+
+from types import SimpleNamespace
+
+from .clearance import ClearanceEngine
+from .geometry import get_edges
+from .kinematics import Kinematics
+from .path import Path
+from .result_writer import write_results
+from .swept_envelope import SweptEnvelope
+from .vehicle import Vehicle
+
+def load_sketch(file_name, name=None):
+    """
+    Return the geometry of a sketch in a saved FreeCAD document.  Only the
+    FreeCAD application module is required, so this runs under FreeCADCmd.
+
+    file_name - path to the FCStd document
+    name - name or label of the sketch.  Defaults to the first sketch
+    """
+
+    import FreeCAD as App
+
+    _doc = App.openDocument(file_name, True)
+
+    try:
+
+        _sketch = None
+
+        if name:
+
+            _sketch = _doc.getObject(name)
+
+            if not _sketch:
+                _sketch = next(iter(_doc.getObjectsByLabel(name)), None)
+
+        else:
+
+            _sketch = next((_o for _o in _doc.Objects
+                            if _o.TypeId == 'Sketcher::SketchObject'), None)
+
+        assert _sketch, 'Sketch "{}" not found in {}'.format(name, file_name)
+
+        return [
+            _g.copy() for _i, _g in enumerate(_sketch.Geometry)
+            if not _sketch.getConstruction(_i)
+        ]
+
+    finally:
+
+        App.closeDocument(_doc.Name)
+
+def get_geometry(source):
+    """
+    Return path geometry from a saved document (file name, or a (file name,
+    sketch name) tuple), a plain description (see geometry.get_edges) or
+    a list of edges
+    """
+
+    if isinstance(source, str):
+        return load_sketch(source)
+
+    if isinstance(source, tuple) and len(source) == 2 \
+        and isinstance(source[0], str) and source[0].lower().endswith('.fcstd'):
+
+        return load_sketch(*source)
+
+    if source and isinstance(source[0], (tuple, list)):
+        return get_edges(source)
+
+    return list(source)
+
+def get_vehicle(vehicle):
+    """
+    Return a Vehicle model object from a template symbol or a vehicle
+    """
+
+    if not isinstance(vehicle, str):
+        return vehicle
+
+    Vehicle.populate_templates()
+
+    return Vehicle.from_template(vehicle)
+
+def run_analysis(vehicle, path, steps=100, spacing=None, tolerance=None,
+                 envelope=True, tracking=Kinematics.TRACTRIX, substeps=1,
+                 obstacles=None, clearance=0.0, radius=None, resolution=None,
+                 output=None):
+    """
+    Run a swept path analysis, returning the per-step vehicle state and
+    the left / right envelopes
+
+    vehicle - template symbol or Vehicle model object
+    path - path geometry source (see get_geometry) or Path model object
+    steps - number of points to discretize curved edges
+    spacing - target arc-length distance between path points
+    tolerance - maximum chord error for arc-length discretization
+    envelope - if True, build the swept envelope
+    tracking - off-tracking method, Kinematics.TRACTRIX or Kinematics.SNAP
+    substeps - number of integration sub-steps per path segment
+    obstacles - obstacle geometry source (see get_geometry) to check for
+                encroachment
+    clearance - minimum required clearance to the obstacles
+    radius - search distance for reporting the minimum clearance
+    resolution - if given, the clearance of every footprint corner at
+                 every step is looked up in a cached obstacle distance
+                 field of this grid spacing
+    output - if given, the per-step state of every unit is streamed to
+             this binary result file and a CSV file alongside it
+    """
+
+    _vehicle = get_vehicle(vehicle)
+
+    if not isinstance(path, Path):
+        path = Path(get_geometry(path), steps, columnar=True, spacing=spacing,
+                    tolerance=tolerance)
+
+    _kinematics = Kinematics(_vehicle, path, tracking, substeps)
+
+    _result = SimpleNamespace(
+        vehicle=_vehicle.name,
+        count=_kinematics.count,
+        position=_kinematics.position,
+        orientation=_kinematics.orientation,
+        angle=_kinematics.angle,
+        radius=_kinematics.radius,
+        center=_kinematics.center,
+        wheel_angles=_kinematics.wheel_angles,
+        units=[
+            SimpleNamespace(
+                name=_k.vehicle.name, position=_k.position,
+                orientation=_k.orientation)
+            for _k in _kinematics.trailers
+        ],
+        left=None,
+        right=None,
+        clearance=None
+    )
+
+    if not _kinematics.count:
+        return _result
+
+    if output:
+        write_results(output, [_kinematics] + _kinematics.trailers)
+
+    _footprints = None
+
+    if envelope or obstacles:
+        _footprints = _kinematics.transform_units()
+
+    if envelope:
+        _result.left, _result.right = SweptEnvelope(_footprints).build()
+
+    if obstacles:
+
+        _engine = ClearanceEngine(
+            get_geometry(obstacles), clearance=clearance, radius=radius)
+
+        _result.clearance = _engine.check(
+            _footprints,
+            [_k.vehicle.name for _k in [_kinematics] + _kinematics.trailers]
+        )
+
+        if resolution:
+
+            _result.clearance.corners = [
+                _engine.get_point_clearance(_f, resolution) for _f in _footprints
+            ]
+
+        _engine.finish()
+
+    return _result
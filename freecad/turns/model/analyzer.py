@@ -23,13 +23,50 @@
 Swept Path Analysis
 """
 
-from freecad_python_support.singleton import Singleton
+from threading import Lock
 
-class Analyzer(metaclass=Singleton):
+from .clearance import ClearanceEngine
+from .result_writer import write_results
+from .timeline import Timeline
+
+class Analyzer():
     """
-    Swept Path Analysis
+    Swept Path Analysis session.  Each instance holds its own vehicles,
+    path and step state.  Named sessions are kept in a registry, with the
+    'default' session used by the GUI.
     """
 
+    #static dictionary of named analysis sessions
+    sessions = {}
+
+    #guards the session registry across threads
+    sessions_lock = Lock()
+
+    @staticmethod
+    def get_session(name='default'):
+        """
+        Return the named analysis session, creating it if necessary
+        """
+
+        with Analyzer.sessions_lock:
+
+            if name not in Analyzer.sessions:
+                Analyzer.sessions[name] = Analyzer()
+
+            return Analyzer.sessions[name]
+
+    @staticmethod
+    def remove_session(name='default'):
+        """
+        Finish and remove a named analysis session
+        """
+
+        with Analyzer.sessions_lock:
+            _session = Analyzer.sessions.pop(name, None)
+
+        if _session:
+            _session.finish()
+
     def __init__(self):
         """
         Constructor
@@ -50,6 +87,16 @@ class Analyzer(metaclass=Singleton):
         #loop analysis
         self.loop = False
 
+        #precomputed state of every vehicle at every step
+        self.timeline = None
+
+        #result store holding the timeline tracks, if not held in memory
+        self.store = None
+
+        #obstacle clearance engine and the clearance of the last solution
+        self.obstacles = None
+        self.clearance = None
+
         self.set_step(0, True)
 
     def set_vehicle(self, vehicle):
@@ -64,6 +111,18 @@ class Analyzer(metaclass=Singleton):
             vehicle.set_path(self.path)
 
         self.vehicles = [vehicle]
+        self.build_timeline()
+
+    def add_vehicle(self, vehicle):
+        """
+        Add a vehicle to the analysis
+        """
+
+        if self.path:
+            vehicle.set_path(self.path)
+
+        self.vehicles.append(vehicle)
+        self.build_timeline()
 
     def set_path(self, path):
         """
@@ -75,6 +134,103 @@ class Analyzer(metaclass=Singleton):
         for _v in self.vehicles:
             _v.set_path(path)
 
+        self.build_timeline()
+
+    def build_timeline(self):
+        """
+        Build the timeline of the vehicles solved along the path
+        """
+
+        if self.timeline:
+            self.timeline.finish()
+
+        self.timeline = None
+
+        if self.path:
+            self.timeline = Timeline(self.vehicles, self.store)
+
+        self.check_clearance()
+
+    def set_store(self, store):
+        """
+        Set the ResultStore to hold the timeline tracks, so memory use
+        does not grow with the path length.  None holds them in memory.
+
+        The store is only attached, and holds the tracks of the timeline
+        built by the next set_path().
+        """
+
+        self.store = store
+
+    def set_obstacles(self, sources, clearance=0.0, radius=None):
+        """
+        Set the obstacle geometry to check the vehicles against
+
+        sources - dictionary of obstacle edge lists keyed to their source
+                  names (e.g. sketch names), or None to clear the obstacles
+        clearance - minimum required clearance to the obstacles
+        radius - search distance for reporting the minimum clearance
+        """
+
+        if self.obstacles:
+            self.obstacles.finish()
+
+        self.obstacles = None
+
+        if sources:
+
+            self.obstacles = ClearanceEngine(
+                clearance=clearance, radius=radius)
+
+            for _k, _v in sources.items():
+                self.obstacles.add_obstacles(_v, _k)
+
+        self.check_clearance()
+
+    def check_clearance(self):
+        """
+        Check every vehicle unit along the path against the obstacles
+        """
+
+        self.clearance = None
+
+        if not (self.obstacles and self.timeline and self.timeline.count):
+            return self.clearance
+
+        self.clearance = self.obstacles.check(
+            self.timeline.get_footprints(),
+            [_v.name for _v in self.timeline.units]
+        )
+
+        return self.clearance
+
+    def check_steps(self, start, end):
+        """
+        Check only the slivers the vehicle units sweep from the start step
+        to the end step against the obstacles, returning None if there are
+        no obstacles
+        """
+
+        if not (self.obstacles and self.timeline and self.timeline.count):
+            return None
+
+        return self.obstacles.check(
+            self.timeline.get_footprints(),
+            [_v.name for _v in self.timeline.units], start, end
+        )
+
+    def export(self, file_name, csv=True):
+        """
+        Write the per-step state of every vehicle unit to a binary result
+        file, and a CSV file if requested, returning the rows written
+        """
+
+        if not (self.timeline and self.timeline.count):
+            return 0
+
+        return write_results(
+            file_name, list(self.timeline.units.values()), csv=csv)
+
     def move_steps(self, steps):
         """
         Move the analysis a number of steps from the current step
@@ -130,7 +286,7 @@ class Analyzer(metaclass=Singleton):
         Update the vehicles with a list of angles
         """
 
-        for _i, _v in self.vehicles:
+        for _i, _v in enumerate(self.vehicles):
             _v.update(angles[_i])
 
     def finish(self):
@@ -138,5 +294,15 @@ class Analyzer(metaclass=Singleton):
         Cleanup
         """
 
+        if self.timeline:
+            self.timeline.finish()
+
+        if self.obstacles:
+            self.obstacles.finish()
+
+        self.timeline = None
+        self.obstacles = None
+        self.clearance = None
+        self.store = None
         self.vehicles = []
         self.path = []
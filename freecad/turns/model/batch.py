@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Batch swept path analysis of vehicle templates against paths, using a
+process pool
+"""
+
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from types import SimpleNamespace
+
+from .analysis import get_geometry, run_analysis
+from .cache import get_file_stamp
+from .vehicle import Vehicle
+
+def list_sketches(file_name):
+    """
+    Return the names of the sketches in a saved FreeCAD document
+    """
+
+    import FreeCAD as App
+
+    _doc = App.openDocument(file_name, True)
+
+    try:
+
+        return [_o.Name for _o in _doc.Objects
+                if _o.TypeId == 'Sketcher::SketchObject']
+
+    finally:
+
+        App.closeDocument(_doc.Name)
+
+def get_paths(paths):
+    """
+    Return a dictionary of path sources keyed by name.
+
+    paths - a dictionary of path sources, a list of saved documents, or a
+            single saved document, in which case every sketch is a path
+    """
+
+    if isinstance(paths, dict):
+        return paths
+
+    if isinstance(paths, str):
+        paths = [paths]
+
+    _result = {}
+
+    for _file in paths:
+
+        _base = os.path.splitext(os.path.basename(_file))[0]
+
+        for _name in list_sketches(_file):
+            _result['{}:{}'.format(_base, _name)] = (_file, _name)
+
+    return _result
+
+def get_jobs(vehicles, paths):
+    """
+    Return the list of (vehicle symbol, path name, path source) jobs for
+    every vehicle against every path.  All templates are used if no
+    vehicles are specified.
+    """
+
+    if not vehicles:
+
+        Vehicle.populate_templates()
+        vehicles = list(Vehicle.templates)
+
+    _paths = get_paths(paths)
+
+    return [
+        (_v, _name, _source) for _v in vehicles
+        for _name, _source in _paths.items()
+    ]
+
+@lru_cache(maxsize=16)
+def _load_geometry(source, stamp):
+    """
+    Load path geometry once per worker process for each saved sketch.
+    The file stamp is part of the key, so a saved document which changes
+    is loaded again instead of returning stale geometry.
+    """
+
+    return get_geometry(source)
+
+def _is_sketch(source):
+    """
+    Return True if a path source is a saved sketch: a document file name
+    or a (file name, sketch name) pair of strings
+    """
+
+    if isinstance(source, str):
+        return True
+
+    return isinstance(source, tuple) and len(source) == 2 \
+        and all(isinstance(_v, str) for _v in source)
+
+def _get_source_file(source):
+    """
+    Return the document file name of a saved sketch source
+    """
+
+    if isinstance(source, tuple):
+        return source[0]
+
+    return source
+
+def _run_job(job, options):
+    """
+    Run a single batch job in a worker process
+    """
+
+    _vehicle, _name, _source = job
+    _time = time.perf_counter()
+
+    _result = SimpleNamespace(
+        vehicle=_vehicle, path=_name, analysis=None, error=None, time=0.0)
+
+    try:
+
+        #saved sketches are loaded once per worker, and other sources
+        #(plain descriptions, edges) are passed to the analysis
+        if _is_sketch(_source):
+            _source = _load_geometry(
+                _source, get_file_stamp(_get_source_file(_source)))
+
+        _result.analysis = run_analysis(_vehicle, _source, **options)
+
+    except Exception as _e:
+        _result.error = '{}: {}'.format(type(_e).__name__, _e)
+
+    _result.time = time.perf_counter() - _time
+
+    return _result
+
+def run_batch(paths, vehicles=None, workers=None, **options):
+    """
+    Analyze every vehicle against every path in a process pool, yielding
+    the results as they complete
+
+    paths - path sources (see get_paths)
+    vehicles - list of template symbols.  Defaults to all templates
+    workers - number of worker processes.  Defaults to the cpu count
+    options - keyword arguments passed to analysis.run_analysis
+    """
+
+    _jobs = get_jobs(vehicles, paths)
+
+    if not _jobs:
+        return
+
+    _workers = min(workers or os.cpu_count() or 1, len(_jobs))
+
+    _pool = ProcessPoolExecutor(max_workers=_workers)
+    _futures = []
+
+    try:
+
+        for _j in _jobs:
+            _futures.append(_pool.submit(_run_job, _j, options))
+
+        for _f in as_completed(_futures):
+            yield _f.result()
+
+    finally:
+
+        #if iteration stops early (break, exception, generator close), the
+        #queued jobs are cancelled rather than run to completion.  Only the
+        #jobs already running are waited for.
+        for _f in _futures:
+            _f.cancel()
+
+        _pool.shutdown(wait=True)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Cache directory and file signature helpers
+"""
+
+import hashlib
+import os
+
+def get_cache_dir(name=None):
+    """
+    Return the workbench cache directory, creating it if necessary.
+    Uses the FreeCAD user cache path if FreeCAD is available, otherwise
+    ~/.cache/freecad_turns.  Returns None if no directory can be created.
+
+    name - optional subdirectory name
+    """
+
+    _root = None
+
+    try:
+        import FreeCAD as App
+        _root = os.path.join(App.getUserCachePath(), 'turns')
+
+    except (ImportError, AttributeError):
+        _root = os.path.join(os.path.expanduser('~'), '.cache', 'freecad_turns')
+
+    if name:
+        _root = os.path.join(_root, name)
+
+    try:
+        os.makedirs(_root, exist_ok=True)
+
+    except OSError:
+        return None
+
+    return _root
+
+def get_file_stamp(file_name):
+    """
+    Return the (modification time, size) stamp of a file
+    """
+
+    _stat = os.stat(file_name)
+
+    return (_stat.st_mtime_ns, _stat.st_size)
+
+def get_file_hash(file_name):
+    """
+    Return the sha256 hex digest of a file's contents
+    """
+
+    _hash = hashlib.sha256()
+
+    with open(file_name, 'rb') as _fp:
+
+        for _chunk in iter(lambda: _fp.read(1 << 16), b''):
+            _hash.update(_chunk)
+
+    return _hash.hexdigest()
+
+def get_cache_name(key, extension):
+    """
+    Return a cache file name derived from a key string
+    """
+
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + extension
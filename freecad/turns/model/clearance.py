@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Clearance analysis of swept vehicle footprints against obstacle geometry
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from .distance_field import DistanceField
+from .line_segment import LineSegment
+from .segment_index import SegmentIndex
+
+class ClearanceEngine():
+    """
+    Clearance analysis of swept vehicle footprints against obstacle edges
+    (curbs, islands, signal poles, opposing lanes), using a spatial index
+    over the discretized obstacle segments.
+
+    Vehicle parts are identified by footprint edge index, where edge k
+    runs from footprint point k to point k + 1.
+    """
+
+    def __init__(self, obstacles=None, clearance=0.0, radius=None,
+                 tolerance=0.05):
+        """
+        Constructor
+
+        obstacles - list of obstacle edges (Part geometry)
+        clearance - minimum required clearance.  Parts closer than the
+                    clearance to an obstacle encroach on it.
+        radius - search distance for reporting the minimum clearance.
+                 Defaults to the clearance.
+        tolerance - maximum chord error for discretizing curved obstacles
+        """
+
+        self.clearance = clearance
+        self.radius = max(clearance, radius or 0.0)
+        self.tolerance = tolerance
+
+        self.obstacles = []
+        self.sources = []
+        self.index = SegmentIndex()
+
+        #obstacle index of each indexed segment
+        self.owners = np.zeros(0, dtype=np.int64)
+
+        #distance field for point clearance lookups, built on demand
+        self.field = None
+
+        if obstacles:
+            self.add_obstacles(obstacles)
+
+    def get_points(self, edge):
+        """
+        Return the (n, 2) discretized points of an obstacle edge.
+        Points (e.g. signal poles) return a single point.
+        """
+
+        if edge.isDerivedFrom('Part::GeomPoint'):
+            return np.array([[edge.X, edge.Y]], dtype=np.float64)
+
+        if edge.isDerivedFrom('Part::GeomLineSegment'):
+            _points = [edge.StartPoint, edge.EndPoint]
+
+        else:
+            _points = edge.discretize(Deflection=self.tolerance)
+
+        return np.array([tuple(_v)[0:2] for _v in _points], dtype=np.float64)
+
+    def add_obstacles(self, edges, source=None):
+        """
+        Index a list of obstacle edges
+
+        edges - list of Part geometry
+        source - name of the obstacle source (e.g. the sketch name)
+        """
+
+        _starts, _ends, _owners = [], [], []
+
+        for _i, _edge in enumerate(edges):
+
+            _points = self.get_points(_edge)
+
+            #single points are indexed as zero-length segments
+            if len(_points) == 1:
+                _points = np.repeat(_points, 2, axis=0)
+
+            _starts.append(_points[:-1])
+            _ends.append(_points[1:])
+            _owners.append(np.full(len(_points) - 1, len(self.obstacles)))
+
+            self.sources.append((source, _i))
+            self.obstacles.append(_edge)
+
+        if not _starts:
+            return
+
+        _starts = np.concatenate(_starts)
+
+        self.index.add_lines(_starts, np.concatenate(_ends))
+        self.field = None
+        self.owners = np.concatenate((self.owners, np.concatenate(_owners)))
+
+    @staticmethod
+    def get_inside(points, polygons):
+        """
+        Crossing number test of (p, 2) points against the paired (p, m, 2)
+        closed polygons, returning a (p,) boolean array
+        """
+
+        _x, _y = points[:, 0:1], points[:, 1:2]
+
+        _a = polygons
+        _b = np.roll(polygons, -1, axis=1)
+
+        _cross = (_a[..., 1] > _y) != (_b[..., 1] > _y)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+
+            _t = (_y - _a[..., 1]) / (_b[..., 1] - _a[..., 1])
+            _cross &= _x < _a[..., 0] + _t * (_b[..., 0] - _a[..., 0])
+
+        return (np.count_nonzero(_cross, axis=1) % 2).astype(bool)
+
+    def check_polygons(self, polygons):
+        """
+        Return the clearance of (p, m, 2) closed polygons to the obstacles
+        within the search radius, as a SimpleNamespace of (polygon,
+        segment, edge, distance) arrays, one entry per polygon edge /
+        obstacle segment pair within the radius.  Obstacle segments with
+        an end point within a polygon are at zero distance to its nearest
+        edge.
+        """
+
+        _poly = np.asarray(polygons, dtype=np.float64)[..., 0:2]
+        _r = self.radius
+
+        _boxes = np.stack((
+            _poly[..., 0].min(axis=1) - _r, _poly[..., 0].max(axis=1) + _r,
+            _poly[..., 1].min(axis=1) - _r, _poly[..., 1].max(axis=1) + _r
+        ), axis=1)
+
+        _idx, _seg = self.index.query_pairs(_boxes)
+
+        _p, _m = len(_idx), _poly.shape[1]
+
+        if not _p:
+            return SimpleNamespace(
+                polygon=_idx, segment=_seg, edge=_idx.copy(),
+                distance=np.zeros(0))
+
+        #distance of each obstacle segment to each polygon edge
+        _starts = _poly[_idx]
+        _ends = np.roll(_poly, -1, axis=1)[_idx]
+
+        _other_starts = np.repeat(self.index.starts[_seg], _m, axis=0)
+        _other_ends = np.repeat(self.index.ends[_seg], _m, axis=0)
+
+        _d = LineSegment.distance_arrays(
+            _starts.reshape(-1, 2), _ends.reshape(-1, 2),
+            _other_starts, _other_ends
+        ).reshape(_p, _m)
+
+        #segments crossing the polygon edges are at zero distance to them,
+        #and segments with an end point within the polygon to its nearest
+        #edge, which covers segments wholly within it
+        _inside = np.flatnonzero(
+            ClearanceEngine.get_inside(self.index.starts[_seg], _starts)
+            | ClearanceEngine.get_inside(self.index.ends[_seg], _starts))
+
+        _d[_inside, np.argmin(_d[_inside], axis=1)] = 0.0
+
+        _pair, _edge = np.nonzero(_d <= _r)
+
+        return SimpleNamespace(
+            polygon=_idx[_pair], segment=_seg[_pair], edge=_edge,
+            distance=_d[_pair, _edge]
+        )
+
+    def check_unit(self, footprints):
+        """
+        Return the clearance of a unit's (n, m, 2) footprints to the
+        obstacles within the search radius, as a SimpleNamespace of
+        (step, segment, edge, distance) arrays
+        """
+
+        _c = self.check_polygons(footprints)
+
+        return SimpleNamespace(
+            step=_c.polygon, segment=_c.segment, edge=_c.edge,
+            distance=_c.distance
+        )
+
+    def check_sweep(self, footprints, start, end):
+        """
+        Return the clearance of the slivers a unit's (n, m, 2) footprints
+        sweep from the start step to the end step, as a SimpleNamespace
+        of (step, segment, edge, distance) arrays.
+
+        The sliver of step k is the footprint at k and the quadrilaterals
+        swept by each footprint edge from step k - 1.  Only obstacles near
+        the slivers are tested, so the cost depends on the local obstacle
+        density, not the total obstacle count.
+        """
+
+        _fp = np.asarray(footprints, dtype=np.float64)[..., 0:2]
+
+        _steps = np.arange(max(start + 1, 0), min(end + 1, len(_fp)))
+        _m = _fp.shape[1]
+
+        _c = self.check_polygons(_fp[_steps])
+
+        _step = [_steps[_c.polygon]]
+        _result = [_c]
+
+        _prev = _steps[_steps > 0]
+
+        if len(_prev):
+
+            #quadrilateral swept by edge i: the edge at k - 1, the path of
+            #its end point, the edge at k and the path of its start point
+            _a = _fp[_prev - 1]
+            _b = _fp[_prev]
+
+            _quads = np.stack((
+                _a, np.roll(_a, -1, axis=1), np.roll(_b, -1, axis=1), _b
+            ), axis=2).reshape(-1, 4, 2)
+
+            _c = self.check_polygons(_quads)
+
+            #the footprint edge is the swept edge, not the quad edge
+            _c.edge = _c.polygon % _m
+
+            _step.append(_prev[_c.polygon // _m])
+            _result.append(_c)
+
+        return SimpleNamespace(
+            step=np.concatenate(_step),
+            segment=np.concatenate([_c.segment for _c in _result]),
+            edge=np.concatenate([_c.edge for _c in _result]),
+            distance=np.concatenate([_c.distance for _c in _result])
+        )
+
+    def check(self, footprints, names=None, start=None, end=None):
+        """
+        Check the footprints of each vehicle unit against the obstacles
+
+        footprints - list of (n, m, 2) unit footprints at each path step,
+                     as returned by Kinematics.transform_units()
+        names - list of unit names (optional)
+        start, end - if given, check only the slivers swept from the
+                     start step to the end step (see check_sweep)
+
+        Returns a SimpleNamespace of:
+            conflicts - SimpleNamespace of (unit, step, edge, obstacle,
+                        distance) arrays, one entry per encroaching
+                        part / obstacle pair, sorted by step and unit
+            steps - list of the checked steps of each unit
+            minimum - list of arrays of the minimum clearance of each unit
+                      at each checked step (infinite beyond the search
+                      radius)
+            nearest - list of arrays of the nearest obstacle of each unit
+                      at each checked step (-1 beyond the search radius)
+            names - unit names
+            report - list of encroachment dictionaries (see get_report)
+        """
+
+        _conflicts = {_k: [] for _k in
+                      ('unit', 'step', 'edge', 'obstacle', 'distance')}
+
+        _result = SimpleNamespace(
+            conflicts=None, steps=[], minimum=[], nearest=[],
+            names=names or [str(_i) for _i in range(len(footprints))],
+            report=None
+        )
+
+        for _i, _fp in enumerate(footprints):
+
+            if start is None:
+                _c = self.check_unit(_fp)
+                _steps = np.arange(len(_fp))
+
+            else:
+                _c = self.check_sweep(_fp, start, end)
+                _steps = np.arange(max(start + 1, 0), min(end + 1, len(_fp)))
+
+            _owner = self.owners[_c.segment]
+
+            #minimum clearance and nearest obstacle at each step
+            _minimum = np.full(len(_steps), np.inf)
+            _nearest = np.full(len(_steps), -1, dtype=np.int64)
+
+            _order = np.lexsort((_c.distance, _c.step))
+            _first = _order[np.unique(_c.step[_order], return_index=True)[1]]
+
+            _minimum[_c.step[_first] - _steps[0:1]] = _c.distance[_first]
+            _nearest[_c.step[_first] - _steps[0:1]] = _owner[_first]
+
+            _result.steps.append(_steps)
+            _result.minimum.append(_minimum)
+            _result.nearest.append(_nearest)
+
+            #closest segment of each encroached obstacle to each part at
+            #each step
+            _hit = np.flatnonzero(_c.distance <= self.clearance)
+            _hit = _hit[np.lexsort((
+                _c.distance[_hit], _c.edge[_hit], _owner[_hit], _c.step[_hit]))]
+
+            _key = np.stack((_c.step[_hit], _owner[_hit], _c.edge[_hit]), axis=1)
+            _hit = _hit[np.unique(_key, axis=0, return_index=True)[1]]
+
+            _conflicts['unit'].append(np.full(len(_hit), _i))
+            _conflicts['step'].append(_c.step[_hit])
+            _conflicts['edge'].append(_c.edge[_hit])
+            _conflicts['obstacle'].append(_owner[_hit])
+            _conflicts['distance'].append(_c.distance[_hit])
+
+        _conflicts = {
+            _k: np.concatenate(_v) if _v else np.zeros(0, dtype=np.int64)
+            for _k, _v in _conflicts.items()
+        }
+
+        _order = np.lexsort((_conflicts['unit'], _conflicts['step']))
+
+        _result.conflicts = SimpleNamespace(
+            **{_k: _v[_order] for _k, _v in _conflicts.items()})
+
+        _result.report = self.get_report(_result)
+
+        return _result
+
+    def get_field(self, resolution=0.5):
+        """
+        Return the distance field of the obstacles at the resolution,
+        loaded from the cache or built and cached on first use
+        """
+
+        if not self.field or self.field.resolution != resolution:
+
+            self.field = DistanceField(
+                self.index.starts, self.index.ends, resolution,
+                max(self.radius, resolution))
+
+        self.field.load()
+
+        return self.field
+
+    def get_point_clearance(self, points, resolution=0.5):
+        """
+        Return the clearance of (..., 2) points (e.g. vehicle corners or
+        wheel tracks), from the distance field at the resolution
+        """
+
+        return self.get_field(resolution).lookup(points)
+
+    def get_report(self, result):
+        """
+        Return a list of encroachment dictionaries for a check() result,
+        keyed to step, unit name, vehicle part, obstacle source and
+        minimum clearance
+        """
+
+        _c = result.conflicts
+
+        return [
+            {
+                'Step': _s,
+                'Unit': result.names[_u],
+                'Part': _e,
+                'Source': self.sources[_o][0],
+                'Obstacle': self.sources[_o][1],
+                'Clearance': _d
+            }
+            for _u, _s, _e, _o, _d in zip(
+                _c.unit.tolist(), _c.step.tolist(), _c.edge.tolist(),
+                _c.obstacle.tolist(), _c.distance.tolist())
+        ]
+
+    def finish(self):
+        """
+        Cleanup
+        """
+
+        self.obstacles = []
+        self.sources = []
+        self.owners = np.zeros(0, dtype=np.int64)
+        self.index.finish()
+
+        if self.field:
+            self.field.finish()
+
+        self.field = None
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Cached, memory-mapped obstacle distance field
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .cache import get_cache_dir
+from .segment_index import SegmentIndex
+
+class DistanceField():
+    """
+    Raster of the distance to the nearest obstacle segment, for constant
+    time clearance lookups of any point.
+
+    Distances are sampled at grid nodes and interpolated bilinearly, so
+    lookups are accurate to about the grid resolution.  Distances are
+    capped at the radius.  Fields are cached on disk as .npy files with
+    a .json sidecar, keyed to a hash of the obstacle segments, and are
+    memory-mapped when reused.
+    """
+
+    #cache format version, incremented when the field computation changes
+    version = 1
+
+    #grid rows computed per pass, bounding the memory used to build
+    chunk_size = 64
+
+    def __init__(self, starts, ends, resolution=0.5, radius=10.0,
+                 cache_dir=None):
+        """
+        Constructor
+
+        starts, ends - (n, 2) arrays of obstacle segment end points
+        resolution - grid node spacing
+        radius - maximum distance stored in the field
+        cache_dir - cache directory.  Defaults to the workbench cache.
+        """
+
+        self.starts = np.asarray(starts, dtype=np.float64)[:, 0:2]
+        self.ends = np.asarray(ends, dtype=np.float64)[:, 0:2]
+
+        self.resolution = float(resolution)
+        self.radius = float(radius)
+        self.cache_dir = cache_dir
+
+        self.key = self.get_key()
+
+        _points = np.concatenate((self.starts, self.ends))
+
+        if not len(_points):
+            _points = np.zeros((1, 2))
+
+        #grid origin and (rows, columns) shape, padded by the radius
+        self.origin = _points.min(axis=0) - self.radius
+
+        _extent = _points.max(axis=0) + self.radius - self.origin
+
+        self.shape = tuple(
+            (np.ceil(_extent[::-1] / self.resolution) + 1).astype(int).tolist())
+
+        self.values = None
+
+    def get_key(self):
+        """
+        Return the hash of the obstacle segments and field parameters
+        """
+
+        _hash = hashlib.sha256()
+
+        _hash.update(json.dumps(
+            [DistanceField.version, self.resolution, self.radius]).encode())
+
+        _hash.update(np.ascontiguousarray(self.starts).tobytes())
+        _hash.update(np.ascontiguousarray(self.ends).tobytes())
+
+        return _hash.hexdigest()
+
+    def get_cache_files(self):
+        """
+        Return the (.npy, .json) cache file names, or None if there is no
+        cache directory
+        """
+
+        if not self.cache_dir:
+            self.cache_dir = get_cache_dir('fields')
+
+        if not self.cache_dir:
+            return None
+
+        _base = os.path.join(self.cache_dir, self.key[:32])
+
+        return _base + '.npy', _base + '.json'
+
+    def load(self):
+        """
+        Load the field from the cache, building and caching it if missing
+        or stale.  Returns the (rows, columns) distance array.
+        """
+
+        if self.values is not None:
+            return self.values
+
+        _files = self.get_cache_files()
+
+        if _files:
+            self.values = self.read_cache(*_files)
+
+        if self.values is None:
+            self.values = self.build(_files)
+
+        return self.values
+
+    def get_header(self):
+        """
+        Return the sidecar description of the field
+        """
+
+        return {
+            'version': DistanceField.version, 'key': self.key,
+            'origin': self.origin.tolist(), 'resolution': self.resolution,
+            'radius': self.radius, 'shape': list(self.shape)
+        }
+
+    def read_cache(self, array_file, header_file):
+        """
+        Return the memory-mapped cached field, or None if missing,
+        unreadable or for other obstacles
+        """
+
+        if not (os.path.exists(array_file) and os.path.exists(header_file)):
+            return None
+
+        try:
+
+            with open(header_file, 'r') as _fp:
+                _header = json.load(_fp)
+
+            if _header != self.get_header():
+                return None
+
+            _values = np.load(array_file, mmap_mode='r')
+
+        except (OSError, ValueError):
+            return None
+
+        if _values.shape != self.shape:
+            return None
+
+        return _values
+
+    def build(self, files=None):
+        """
+        Compute the field, writing it to the cache files if given.
+        Rows are computed in chunks directly into the memory-mapped file.
+        """
+
+        _index = SegmentIndex()
+
+        if len(self.starts):
+            _index.add_lines(self.starts, self.ends)
+
+        _values = None
+        _temp = None
+
+        if files:
+
+            _temp = [_f + '.{}.tmp'.format(os.getpid()) for _f in files]
+
+            try:
+                _values = np.lib.format.open_memmap(
+                    _temp[0], mode='w+', dtype=np.float32, shape=self.shape)
+
+            except OSError:
+                _values, _temp = None, None
+
+        if _values is None:
+            _values = np.empty(self.shape, dtype=np.float32)
+
+        _x = self.origin[0] + np.arange(self.shape[1]) * self.resolution
+
+        for _row in range(0, self.shape[0], DistanceField.chunk_size):
+
+            _rows = np.arange(
+                _row, min(_row + DistanceField.chunk_size, self.shape[0]))
+
+            _y = self.origin[1] + _rows * self.resolution
+
+            _nodes = np.stack(np.meshgrid(_x, _y), axis=-1).reshape(-1, 2)
+
+            _values[_rows] = self.get_distances(_index, _nodes).reshape(-1, len(_x))
+
+        _index.finish()
+
+        if _temp:
+            _values = self.write_cache(_values, _temp, files)
+
+        return _values
+
+    def get_distances(self, index, points):
+        """
+        Return the distances of the points to the indexed segments, capped
+        at the radius.  The search radius starts small and is doubled for
+        the points not yet resolved, as the search cost grows with the
+        square of the radius.
+        """
+
+        _d = np.full(len(points), self.radius)
+        _pending = np.arange(len(points))
+
+        _r = min(4.0 * self.resolution, self.radius)
+
+        while len(_pending) and len(index):
+
+            _n = index.nearest(points[_pending], _r)
+            _hit = _n.index >= 0
+
+            _d[_pending[_hit]] = _n.distance[_hit]
+            _pending = _pending[~_hit]
+
+            if _r >= self.radius:
+                break
+
+            _r = min(2.0 * _r, self.radius)
+
+        return _d
+
+    def write_cache(self, values, temp_files, files):
+        """
+        Move the computed field and its sidecar into the cache, returning
+        the memory-mapped field.  Failures are ignored, as the cache is
+        only an optimization.
+        """
+
+        try:
+
+            values.flush()
+
+            with open(temp_files[1], 'w') as _fp:
+                json.dump(self.get_header(), _fp)
+
+            #the sidecar is written last, so a partial cache is not read
+            os.replace(temp_files[0], files[0])
+            os.replace(temp_files[1], files[1])
+
+        except OSError:
+
+            for _f in temp_files:
+                if os.path.exists(_f):
+                    os.remove(_f)
+
+            return np.array(values)
+
+        return np.load(files[0], mmap_mode='r')
+
+    def lookup(self, points):
+        """
+        Return the interpolated clearance of (..., 2) points, capped at
+        the radius.  Points outside the field are at the radius.
+        """
+
+        _values = self.load()
+
+        _pts = np.asarray(points, dtype=np.float64)
+        _shape = _pts.shape[:-1]
+        _pts = _pts.reshape(-1, _pts.shape[-1])[:, 0:2]
+
+        _g = (_pts - self.origin) / self.resolution
+
+        _result = np.full(len(_g), self.radius)
+
+        _inside = np.all(
+            (_g >= 0.0) & (_g <= np.array(self.shape[::-1]) - 1), axis=1)
+
+        #bilinear interpolation between the four surrounding nodes
+        _g = _g[_inside]
+
+        _i = np.minimum(np.floor(_g).astype(np.int64),
+                        np.array(self.shape[::-1]) - 2).clip(0)
+
+        _t = _g - _i
+
+        _c, _r = _i[:, 0], _i[:, 1]
+
+        _result[_inside] = \
+            _values[_r, _c] * (1.0 - _t[:, 0]) * (1.0 - _t[:, 1]) \
+            + _values[_r, _c + 1] * _t[:, 0] * (1.0 - _t[:, 1]) \
+            + _values[_r + 1, _c] * (1.0 - _t[:, 0]) * _t[:, 1] \
+            + _values[_r + 1, _c + 1] * _t[:, 0] * _t[:, 1]
+
+        return _result.reshape(_shape)
+
+    def finish(self):
+        """
+        Cleanup
+        """
+
+        self.values = None
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Headless path geometry, compatible with the Part geometry interface
+used by the Path model object
+"""
+
+import math
+
+class LineEdge():
+    """
+    Straight line edge between two points
+    """
+
+    def __init__(self, start, end):
+        """
+        Constructor
+
+        start - 2D / 3D start point tuple
+        end - 2D / 3D end point tuple
+        """
+
+        self.StartPoint = _to_point(start)
+        self.EndPoint = _to_point(end)
+
+        self.FirstParameter = 0.0
+        self.LastParameter = math.dist(self.StartPoint, self.EndPoint)
+
+    def isDerivedFrom(self, type_id):
+        """
+        Part geometry type test
+        """
+
+        return type_id in ('Part::Geometry', 'Part::GeomCurve',
+                           'Part::GeomBoundedCurve', 'Part::GeomLineSegment')
+
+    def value(self, parameter):
+        """
+        Return the point at the parameter (distance from the start)
+        """
+
+        if not self.LastParameter:
+            return self.StartPoint
+
+        _t = parameter / self.LastParameter
+
+        return tuple(
+            _p + (_q - _p) * _t for _p, _q in zip(self.StartPoint, self.EndPoint)
+        )
+
+    def length(self):
+        """
+        Return the edge length
+        """
+
+        return self.LastParameter
+
+    def discretize(self, *args, **kwargs):
+        """
+        Discretize the edge into a list of points.  Accepts a point count
+        (positional or Number), a Distance or a Deflection.
+        """
+
+        _count = _get_count(self, 0.0, *args, **kwargs)
+
+        return [
+            self.value(self.LastParameter * _i / (_count - 1))
+            for _i in range(_count)
+        ]
+
+
+class ArcEdge():
+    """
+    Circular arc edge, counter-clockwise from the first to the last angle
+    """
+
+    def __init__(self, center, radius, first, last):
+        """
+        Constructor
+
+        center - 2D / 3D center point tuple
+        radius - arc radius
+        first - starting angle in radians, ccw from +x
+        last - ending angle in radians, ccw from +x
+        """
+
+        while last <= first:
+            last += 2.0 * math.pi
+
+        self.Center = _to_point(center)
+        self.Radius = radius
+
+        self.FirstParameter = first
+        self.LastParameter = last
+
+        self.StartPoint = self.value(first)
+        self.EndPoint = self.value(last)
+
+    @staticmethod
+    def from_points(start, middle, end):
+        """
+        Create an arc passing through three points
+        """
+
+        _a, _b, _c = [_to_point(_p) for _p in (start, middle, end)]
+
+        _d = 2.0 * (_a[0] * (_b[1] - _c[1]) + _b[0] * (_c[1] - _a[1])
+                    + _c[0] * (_a[1] - _b[1]))
+
+        assert _d, 'Arc points are collinear'
+
+        _sq = [_p[0] ** 2 + _p[1] ** 2 for _p in (_a, _b, _c)]
+
+        _x = (_sq[0] * (_b[1] - _c[1]) + _sq[1] * (_c[1] - _a[1])
+              + _sq[2] * (_a[1] - _b[1])) / _d
+
+        _y = (_sq[0] * (_c[0] - _b[0]) + _sq[1] * (_a[0] - _c[0])
+              + _sq[2] * (_b[0] - _a[0])) / _d
+
+        _angles = [math.atan2(_p[1] - _y, _p[0] - _x) for _p in (_a, _c)]
+
+        #a clockwise arc is the ccw arc from the end point to the start
+        if _d < 0.0:
+            _angles.reverse()
+
+        return ArcEdge((_x, _y), math.dist((_x, _y), _a[0:2]), *_angles)
+
+    def isDerivedFrom(self, type_id):
+        """
+        Part geometry type test
+        """
+
+        return type_id in ('Part::Geometry', 'Part::GeomCurve',
+                           'Part::GeomBoundedCurve', 'Part::GeomTrimmedCurve',
+                           'Part::GeomConic', 'Part::GeomArcOfConic',
+                           'Part::GeomArcOfCircle')
+
+    def value(self, parameter):
+        """
+        Return the point at the parameter (angle)
+        """
+
+        return (
+            self.Center[0] + self.Radius * math.cos(parameter),
+            self.Center[1] + self.Radius * math.sin(parameter),
+            self.Center[2]
+        )
+
+    def length(self):
+        """
+        Return the edge length
+        """
+
+        return self.Radius * (self.LastParameter - self.FirstParameter)
+
+    def discretize(self, *args, **kwargs):
+        """
+        Discretize the edge into a list of points.  Accepts a point count
+        (positional or Number), a Distance or a Deflection.
+        """
+
+        _count = _get_count(self, self.Radius, *args, **kwargs)
+        _delta = self.LastParameter - self.FirstParameter
+
+        return [
+            self.value(self.FirstParameter + _delta * _i / (_count - 1))
+            for _i in range(_count)
+        ]
+
+
+def _to_point(point):
+    """
+    Return a 3D float tuple for a 2D / 3D point
+    """
+
+    _p = tuple(float(_v) for _v in point)
+
+    if len(_p) == 2:
+        _p += (0.0,)
+
+    return _p
+
+def _get_count(edge, radius, number=None, Number=None, Distance=None,
+               Deflection=None):
+    """
+    Return the number of discretization points for an edge
+    """
+
+    _count = number or Number
+
+    if not _count:
+
+        _count = 2
+
+        if Distance:
+            _count = int(math.ceil(edge.length() / Distance)) + 1
+
+        elif Deflection and radius > Deflection:
+
+            _delta = 2.0 * math.acos(1.0 - Deflection / radius)
+            _count = int(math.ceil(edge.length() / (radius * _delta))) + 1
+
+    return max(int(_count), 2)
+
+def get_edges(description):
+    """
+    Build a list of edges from a plain description.  Each item is one of:
+
+        ('line', start, end)
+        ('arc', center, radius, first_angle, last_angle)
+        ('arc3', start, middle, end)
+
+    A plain sequence of points is treated as a polyline.
+    """
+
+    if description and not isinstance(description[0][0], str):
+
+        return [
+            LineEdge(_p, _q) for _p, _q in zip(description[:-1], description[1:])
+        ]
+
+    _edges = []
+
+    for _d in description:
+
+        _type = _d[0].lower()
+
+        if _type == 'line':
+            _edges.append(LineEdge(*_d[1:]))
+
+        elif _type == 'arc':
+            _edges.append(ArcEdge(*_d[1:]))
+
+        elif _type == 'arc3':
+            _edges.append(ArcEdge.from_points(*_d[1:]))
+
+        else:
+            raise ValueError('Unknown edge type "{}"'.format(_d[0]))
+
+    return _edges
@@ -0,0 +1,516 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Vectorized vehicle kinematics
+"""
+
+import math
+
+from types import SimpleNamespace
+
+import numpy as np
+
+class Kinematics():
+    """
+    Vehicle state pre-computed for every step of a path.
+
+    Solves the orientation, steering angle, turning radius, rotation center
+    and wheel angles for all path segments in a single array pass, so the
+    vehicle state at any step becomes an array lookup.
+    """
+
+    #tracking methods - the rear axle follows the tractrix of the front
+    #axle, or the steering angle is snapped to the path look-ahead angle
+    TRACTRIX = 'tractrix'
+    SNAP = 'snap'
+
+    def __init__(self, vehicle, path=None, tracking=TRACTRIX, substeps=1):
+        """
+        Constructor
+
+        vehicle - the Vehicle model object to solve
+        path - the Path model object to solve along (optional)
+        tracking - Kinematics.TRACTRIX or Kinematics.SNAP
+        substeps - number of integration sub-steps per path segment
+        """
+
+        self.vehicle = vehicle
+        self.tracking = tracking
+        self.substeps = max(int(substeps), 1)
+        self.count = 0
+
+        #per-step position (n, 2) and orientation (n,)
+        self.position = None
+        self.orientation = None
+
+        #per-step steering angle, radius and rotation center (n, 2)
+        self.angle = None
+        self.radius = None
+        self.center = None
+
+        #per-step wheel angles (n, w), ordered by turning axle / wheel
+        self.wheel_angles = None
+
+        #index of the step which last updated the steering state
+        self.index = None
+
+        #solved towed units, in towing order
+        self.trailers = []
+
+        if path:
+            self.solve(path)
+
+    def solve(self, path):
+        """
+        Solve the vehicle state for every segment in the path
+        """
+
+        _veh = self.vehicle
+
+        if self.tracking == Kinematics.SNAP or not _veh.turn_axle \
+            or not _veh.axle_distance:
+
+            _cols = path.get_columns()
+
+            self.solve_snapped(_cols.position[:, 0:2], _cols.vector[:, 0:2],
+                _cols.angle)
+
+            self.solve_trailers()
+            return
+
+        _points, _curvature = Kinematics.subdivide(
+            np.asarray(path.points, dtype=np.float64)[:, 0:2],
+            path.get_curvatures(), self.substeps
+        )
+
+        self.solve_tractrix(_points, _curvature)
+        self.solve_trailers()
+
+        if self.substeps > 1:
+            self.decimate(self.substeps)
+
+    def solve_snapped(self, position, vector, angle):
+        """
+        Solve the vehicle state with the vehicle centered on the path
+        segment positions, aligned with the segments and steered by the
+        segment look-ahead angles
+        """
+
+        self.count = len(angle)
+        self.position = position
+
+        #orientation is the ccw angle of the segment vector from +x
+        self.orientation = np.arctan2(vector[:, 1], vector[:, 0])
+
+        self.set_steering(angle)
+
+    def solve_tractrix(self, points, curvature):
+        """
+        Solve the vehicle state with the front axle on the path points
+        and the rear axle following the tractrix of the front axle.
+
+        points - (n + 1, 2) array of path points
+        curvature - (n,) array of signed path segment curvatures
+        """
+
+        _veh = self.vehicle
+
+        _arcs = Kinematics.get_arcs(points, curvature)
+
+        self.count = len(curvature)
+
+        self.orientation = Kinematics.get_towed_headings(
+            points[:-1], _veh.axle_distance, _arcs.start[0], _arcs)
+
+        #the vehicle position follows from the front axle position
+        _front = np.array(_veh.turn_axle.center[0:2])
+
+        _cos = np.cos(self.orientation)
+        _sin = np.sin(self.orientation)
+
+        self.position = points[:-1] - np.stack((
+            _cos * _front[0] - _sin * _front[1],
+            _sin * _front[0] + _cos * _front[1]
+        ), axis=1)
+
+        #the steering angle is the angle between the vehicle and the
+        #direction of travel of the front axle
+        _angle = np.angle(np.exp(1j * (_arcs.start - self.orientation)))
+
+        self.set_steering(_angle)
+
+    def set_steering(self, angle):
+        """
+        Set the per-step steering state from an (n,) array of steering
+        angles
+        """
+
+        _veh = self.vehicle
+
+        #the steering state is only updated for non-zero angles within the
+        #steering limits of the vehicle, otherwise it persists from the
+        #previous step
+        _valid = (angle != 0.0) & (np.abs(angle) <= _veh.maximum_angle)
+
+        _idx = np.where(_valid, np.arange(self.count), -1)
+        self.index = np.maximum.accumulate(_idx) if self.count else _idx
+
+        #steering states are solved through the vehicle steering cache,
+        #which solves each distinct angle once
+        _radius = np.full(self.count, np.nan)
+        _center = np.full((self.count, 2), np.nan)
+        _wheels = np.zeros(
+            (self.count, 2 * sum(1 for _a in _veh.axles if not _a.is_fixed)))
+
+        _radius[_valid], _center[_valid], _wheels[_valid] = \
+            _veh.get_steering_states(angle[_valid])
+
+        #gather the persisting state, falling back to the initial vehicle
+        #state for steps preceding the first valid steering angle
+        _has = self.index >= 0
+        _src = np.maximum(self.index, 0)
+
+        self.angle = np.where(_has, angle[_src], 0.0)
+        self.radius = np.where(_has, _radius[_src], _veh.radius)
+        self.center = np.where(_has[:, None], _center[_src], np.nan)
+        self.wheel_angles = np.where(_has[:, None], _wheels[_src], 0.0)
+
+    def decimate(self, step):
+        """
+        Keep every step-th solved state of the vehicle and its towed units
+        """
+
+        for _k in [self] + self.trailers:
+
+            _k.count = len(range(0, _k.count, step))
+            _k.position = _k.position[::step]
+            _k.orientation = _k.orientation[::step]
+            _k.angle = _k.angle[::step]
+            _k.radius = _k.radius[::step]
+            _k.center = _k.center[::step]
+            _k.wheel_angles = _k.wheel_angles[::step]
+            _k.index = np.where(_k.index[::step] >= 0, _k.index[::step] // step, -1)
+
+    @staticmethod
+    def get_arcs(points, curvature):
+        """
+        Return the arc length and the start / end directions of travel
+        of each path segment, taken as a circular arc of the segment
+        curvature between its end points.
+
+        points - (n + 1, 2) array of path points
+        curvature - (n,) array of signed segment curvatures
+        """
+
+        _delta = np.diff(points, axis=0)
+        _chord = np.hypot(_delta[:, 0], _delta[:, 1])
+        _dir = np.arctan2(_delta[:, 1], _delta[:, 0])
+
+        #angle subtended by the arc, zero for straight segments
+        _sweep = 2.0 * np.arcsin(np.clip(curvature * _chord / 2.0, -1.0, 1.0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _length = np.where(curvature != 0.0, _sweep / curvature, _chord)
+
+        return SimpleNamespace(
+            length=_length, curvature=curvature, start=_dir - _sweep / 2.0,
+            end=_dir + _sweep / 2.0
+        )
+
+    @staticmethod
+    def subdivide(points, curvature, count):
+        """
+        Split each path segment into count sub-segments of equal arc length
+        along the segment arc, returning the subdivided points and
+        curvatures
+        """
+
+        if count < 2 or len(points) < 2:
+            return points, curvature
+
+        _arcs = Kinematics.get_arcs(points, curvature)
+
+        #arc length to each sub-point, measured from the segment start
+        _t = _arcs.length[:, None] * np.arange(count) / count
+        _k = curvature[:, None]
+
+        #chord to each sub-point, at the mean of the start and end angles
+        _dir = _arcs.start[:, None] + _k * _t / 2.0
+        _len = _t * np.sinc(_k * _t / (2.0 * math.pi))
+
+        _sub = points[:-1, None, :] + np.stack(
+            (_len * np.cos(_dir), _len * np.sin(_dir)), axis=2)
+
+        return (
+            np.concatenate((_sub.reshape(-1, 2), points[-1:])),
+            np.repeat(curvature, count)
+        )
+
+    def solve_trailers(self):
+        """
+        Solve the towed units of the vehicle, each following the hitch
+        point on the unit ahead of it
+        """
+
+        self.trailers = []
+
+        _solved = {self.vehicle: self}
+
+        for _unit in self.vehicle.get_units()[1:]:
+
+            _kinematics = Kinematics(_unit)
+            _kinematics.tow(_solved[_unit.lead_vehicle])
+
+            _solved[_unit] = _kinematics
+            self.trailers.append(_kinematics)
+
+    def tow(self, lead):
+        """
+        Solve the vehicle as a unit towed by the solved lead kinematics
+        """
+
+        _veh = self.vehicle
+        _lead = lead.vehicle
+
+        #hitch point behind the rear axle of the towing unit
+        _x = min(_lead.axle_dists) - _veh.pivot_offset
+
+        _hitch = lead.position + _x * np.stack(
+            (np.cos(lead.orientation), np.sin(lead.orientation)), axis=1)
+
+        self.count = lead.count
+
+        self.orientation = Kinematics.get_towed_headings(
+            _hitch, _veh.hitch_distance, lead.orientation[0])
+
+        self.position = _hitch - _veh.hitch * np.stack(
+            (np.cos(self.orientation), np.sin(self.orientation)), axis=1)
+
+        #towed units are not steered
+        self.index = np.full(self.count, -1)
+        self.angle = np.zeros(self.count)
+        self.radius = np.zeros(self.count)
+        self.center = np.full((self.count, 2), np.nan)
+        self.wheel_angles = np.zeros((self.count, 0))
+
+    @staticmethod
+    def get_towed_headings(hitch, distance, heading, arcs=None):
+        """
+        Return the heading of a towed unit at each of the (n, 2) hitch
+        positions, given the hitch-to-axle distance and initial heading.
+
+        Over each step the hitch moves along a circular arc, and the axle
+        follows the tractrix of the hitch.  Relative to the direction of
+        the hitch motion, the half-angle tangent t = tan(a / 2) of the unit
+        obeys the Riccati equation:
+
+            dt/ds = -k / 2 - t / distance - k * t^2 / 2
+
+        for an arc of curvature k.  Its solution over an arc of length s is
+        the linear map exp(G * s) of the half-angle vector (cos, sin), with
+
+            G = [[1 / (2 * distance), k / 2], [-k / 2, -1 / (2 * distance)]]
+
+        which reduces to tan(a' / 2) = exp(-s / distance) * tan(a / 2) on
+        straight steps.  The headings of all steps follow from the running
+        products of the step matrices, computed as a parallel prefix scan.
+
+        arcs - arc lengths, curvatures and start / end directions of each
+               step, as returned by get_arcs().  Straight steps between the
+               hitch positions if None.
+        """
+
+        _count = len(hitch)
+
+        if _count < 2 or distance <= 0.0:
+            return np.full(_count, float(heading))
+
+        if arcs is None:
+            arcs = Kinematics.get_arcs(hitch, np.zeros(_count - 1))
+
+        _len = arcs.length[:_count - 1]
+        _k = arcs.curvature[:_count - 1]
+
+        #exp(G * s) = a * I + b * G, as G^2 = q * I, scaled by a constant
+        #for q > 0 to avoid overflow on long steps
+        _q = 0.25 / (distance * distance) - 0.25 * _k * _k
+        _root = np.sqrt(np.abs(_q))
+
+        _a = np.where(_q < 0.0, np.cos(_root * _len), 1.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+
+            _b = np.where(
+                _q > 0.0, np.tanh(_root * _len) / _root,
+                np.sin(_root * _len) / _root
+            )
+
+        _b = np.where(_root * _len > 1e-12, _b, _len)
+
+        _exp = np.empty((_count - 1, 2, 2))
+        _exp[:, 0, 0] = _a + _b * 0.5 / distance
+        _exp[:, 0, 1] = _b * _k / 2.0
+        _exp[:, 1, 0] = -_exp[:, 0, 1]
+        _exp[:, 1, 1] = _a - _b * 0.5 / distance
+
+        #rotate into the start direction, map, and rotate out of the end
+        #direction of each step
+        _mat = np.empty((_count, 2, 2))
+        _mat[0] = np.eye(2)
+        _mat[1:] = Kinematics._rotations(arcs.end[:_count - 1] / 2.0) \
+            @ _exp @ Kinematics._rotations(-arcs.start[:_count - 1] / 2.0)
+
+        #inclusive prefix products, normalized against underflow
+        _offset = 1
+
+        while _offset < _count:
+
+            _prod = np.matmul(_mat[_offset:], _mat[:-_offset])
+            _prod /= np.abs(_prod).max(axis=(1, 2))[:, None, None]
+
+            _mat[_offset:] = _prod
+            _offset *= 2
+
+        _vec = _mat @ np.array([math.cos(heading / 2.0), math.sin(heading / 2.0)])
+
+        return np.unwrap(2.0 * np.arctan2(_vec[:, 1], _vec[:, 0]))
+
+    @staticmethod
+    def _rotations(angles):
+        """
+        Return an (n, 2, 2) array of rotation matrices
+        """
+
+        _c = np.cos(angles)
+        _s = np.sin(angles)
+
+        return np.stack((np.stack((_c, -_s), axis=1), np.stack((_s, _c), axis=1)), axis=1)
+
+    def get_unit(self, vehicle):
+        """
+        Return the solved kinematics of the vehicle or one of its towed
+        units, or None if the vehicle is not part of this solution
+        """
+
+        for _k in [self] + self.trailers:
+
+            if _k.vehicle is vehicle:
+                return _k
+
+        return None
+
+    def transform_units(self):
+        """
+        Return the body footprints of the vehicle and each towed unit at
+        every step, as a list of (n, m, 2) arrays
+        """
+
+        return [_k.transform(_k.vehicle.points) for _k in [self] + self.trailers]
+
+    def get_state(self, step):
+        """
+        Return the vehicle state at the specified step
+        """
+
+        _center = None
+
+        if self.index[step] >= 0:
+            _center = tuple(self.center[step].tolist())
+
+        return (
+            float(self.orientation[step]), float(self.angle[step]),
+            float(self.radius[step]), _center,
+            self.wheel_angles[step].tolist()
+        )
+
+    def apply(self, step):
+        """
+        Set the vehicle model attributes to the state at the specified step
+        """
+
+        _veh = self.vehicle
+
+        _veh.orientation, _angle, _radius, _center, _wheels = \
+            self.get_state(step)
+
+        _veh.position = tuple(self.position[step].tolist())
+        _veh.step = step
+
+        for _k in self.trailers:
+            _k.apply(step)
+
+        #nothing to update until the first valid steering angle
+        if self.index[step] < 0:
+            return
+
+        _veh.angle = _angle
+        _veh.axis.angle = _angle
+        _veh.radius = _radius
+        _veh.center = _center
+
+        _i = 0
+
+        for _axle in _veh.axles:
+
+            if _axle.is_fixed:
+                continue
+
+            for _wheel in _axle.wheels:
+                _wheel.angle = _wheels[_i]
+                _i += 1
+
+    def transform(self, points, start=0, end=None):
+        """
+        Transform a list of vehicle-relative 2D points into world coordinates
+        at every step from start to end, returning an (n, m, 2) array
+        """
+
+        _pts = np.array([_p[0:2] for _p in points], dtype=np.float64)
+        _pts = _pts.reshape(-1, 2)
+
+        _orientation = self.orientation[start:end]
+
+        _cos = np.cos(_orientation)[:, None]
+        _sin = np.sin(_orientation)[:, None]
+
+        _x = _cos * _pts[:, 0] - _sin * _pts[:, 1]
+        _y = _sin * _pts[:, 0] + _cos * _pts[:, 1]
+
+        return np.stack((_x, _y), axis=2) + self.position[start:end, None, :]
+
+    def finish(self):
+        """
+        Cleanup
+        """
+
+        for _k in self.trailers:
+            _k.finish()
+
+        self.trailers = []
+        self.vehicle = None
+        self.position = None
+        self.orientation = None
+        self.angle = None
+        self.radius = None
+        self.center = None
+        self.wheel_angles = None
+        self.index = None
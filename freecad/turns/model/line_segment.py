@@ -25,6 +25,10 @@ Line Segment class definition
 
 import math
 
+from types import SimpleNamespace
+
+import numpy as np
+
 from freecad_python_support.tuple_math import TupleMath
 
 class LineSegment():
@@ -50,6 +54,124 @@ class LineSegment():
 
         return '{}-{}'.format(str(self.start), str(self.end))
 
+    @staticmethod
+    def to_arrays(segments):
+        """
+        Return (n, 2) arrays of the start and end points of a list of
+        line segments
+        """
+
+        _pts = np.array(
+            [_s.start[0:2] + _s.end[0:2] for _s in segments], dtype=np.float64
+        ).reshape(-1, 4)
+
+        return _pts[:, 0:2], _pts[:, 2:4]
+
+    @staticmethod
+    def get_boxes(starts, ends):
+        """
+        Return the (n, 4) bounding boxes of arrays of start / end points
+        in the same form as LineSegment.box
+        """
+
+        return np.stack((
+            np.minimum(starts[:, 0], ends[:, 0]),
+            np.maximum(starts[:, 0], ends[:, 0]),
+            np.minimum(starts[:, 1], ends[:, 1]),
+            np.maximum(starts[:, 1], ends[:, 1])
+        ), axis=1)
+
+    @staticmethod
+    def intersect_arrays(starts, ends, other_starts, other_ends, paired=False):
+        """
+        Vectorized form of is_intersecting.
+
+        starts, ends - (n, 2) arrays of the query segment end points
+        other_starts, other_ends - (m, 2) arrays of the candidate segments
+        paired - if True, intersect the n segments pairwise with the
+                 candidates (n == m).  Otherwise, intersect every query
+                 segment with every candidate, returning (n, m) arrays
+
+        Returns a SimpleNamespace of:
+            u - parameter of the intersection along the query segments
+            v - parameter of the intersection along the candidates
+            hits - True where the segments intersect
+            points - intersection points on the query segments
+        """
+
+        _a0 = np.asarray(starts, dtype=np.float64)[:, 0:2]
+        _a1 = np.asarray(ends, dtype=np.float64)[:, 0:2]
+        _b0 = np.asarray(other_starts, dtype=np.float64)[:, 0:2]
+        _b1 = np.asarray(other_ends, dtype=np.float64)[:, 0:2]
+
+        if not paired:
+            _b0 = _b0[None, :, :]
+            _b1 = _b1[None, :, :]
+            _a0 = _a0[:, None, :]
+            _a1 = _a1[:, None, :]
+
+        _v21 = _a1 - _a0
+        _v43 = _b1 - _b0
+        _v31 = _b0 - _a0
+
+        _d = _v21[..., 0] * _v43[..., 1] - _v43[..., 0] * _v21[..., 1]
+
+        #parallel segments never intersect
+        _parallel = _d == 0.0
+        _d = np.where(_parallel, 1.0, _d)
+
+        _u = (_v43[..., 1] * _v31[..., 0] - _v43[..., 0] * _v31[..., 1]) / _d
+        _v = (_v21[..., 1] * _v31[..., 0] - _v21[..., 0] * _v31[..., 1]) / _d
+
+        _u = np.where(_parallel, np.nan, _u)
+        _v = np.where(_parallel, np.nan, _v)
+
+        _hits = (_u >= 0.0) & (_u <= 1.0) & (_v >= 0.0) & (_v <= 1.0)
+
+        return SimpleNamespace(
+            u=_u, v=_v, hits=_hits, points=_a0 + _u[..., None] * _v21)
+
+    @staticmethod
+    def point_distances(points, starts, ends):
+        """
+        Return the distances of (n, 2) points to the paired (n, 2)
+        segments, as an (n,) array
+        """
+
+        _start = np.asarray(starts, dtype=np.float64)[:, 0:2]
+        _vec = np.asarray(ends, dtype=np.float64)[:, 0:2] - _start
+        _rel = np.asarray(points, dtype=np.float64)[:, 0:2] - _start
+
+        _len_sq = np.einsum('ij,ij->i', _vec, _vec)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _t = np.clip(np.einsum('ij,ij->i', _rel, _vec) / _len_sq, 0.0, 1.0)
+
+        _t[_len_sq == 0.0] = 0.0
+
+        return np.hypot(*(_rel - _t[:, None] * _vec).T)
+
+    @staticmethod
+    def distance_arrays(starts, ends, other_starts, other_ends):
+        """
+        Return the minimum distances between the paired (n, 2) segments,
+        as an (n,) array.  Intersecting segments are at zero distance.
+        """
+
+        _d = np.minimum.reduce([
+            LineSegment.point_distances(starts, other_starts, other_ends),
+            LineSegment.point_distances(ends, other_starts, other_ends),
+            LineSegment.point_distances(other_starts, starts, ends),
+            LineSegment.point_distances(other_ends, starts, ends)
+        ])
+
+        _int = LineSegment.intersect_arrays(
+            starts, ends, other_starts, other_ends, paired=True)
+
+        _d[_int.hits] = 0.0
+
+        return _d
+
     def build_bounding_box(self):
         """
         Build the bounding box for the line
@@ -23,64 +23,268 @@
 Path model object
 """
 
+import math
+
+from types import SimpleNamespace
+
+import numpy as np
+
 from freecad_python_support.tuple_math import TupleMath
 
 from .path_segment import PathSegment
-
-from Part import BSplineCurve
+from .segment_array import SegmentArray
 
 class Path():
     """
     Path model object
     """
 
-    def __init__(self, geometry, steps):
+    def __init__(self, geometry, steps, columnar=False, spacing=None,
+                 tolerance=None):
         """
         Constructor
+
+        geometry - list of Part geometry edges, or headless edges from
+                   the geometry module
+        steps - number of points to discretize curved edges
+        columnar - if True, store segments in contiguous arrays
+        spacing - target arc-length distance between points.  If defined,
+                  edges are discretized by arc length instead of steps
+        tolerance - maximum chord error for arc-length discretization
         """
 
         self.segments = []
         self.steps = steps
+        self.spacing = spacing
+        self.tolerance = tolerance
         self.geometry = geometry
         self.points = []
+        self.columnar = columnar
+
+        #cached edge discretizations, keyed to the edge geometry
+        self.edge_points = {}
+
+        #(key, first point) signatures and point offsets of the edges
+        #used in the last update
+        self.edge_signatures = []
+        self.edge_offsets = []
+
+        #discretized edges, in path order
+        self.edges = []
+
+        #arc-length spacing overrides, keyed to the edge
+        self.edge_spacing = {}
+
+        #range of segment indices invalidated by the last update
+        self.invalidated = range(0)
 
         self.update()
 
-    def update(self):
+    def update(self, geometry=None):
         """
-        Update the path based on the current parameters
+        Update the path based on the current parameters, re-discretizing
+        only edges which have changed since the last update.
+
+        geometry - updated list of Part geometry edges (optional)
+
+        Returns the range of segment indices invalidated by the update
         """
 
-        _points = self._discretize()
+        if geometry is not None:
+
+            self.geometry = geometry
+
+            self.edge_spacing = {
+                _k: _v for _k, _v in self.edge_spacing.items() if _k in geometry
+            }
+
+        _prev_signatures = self.edge_signatures
+        _prev_offsets = self.edge_offsets
+        _prev_count = len(self.segments)
+
+        _points, _keys = self._discretize()
         self._flip_reversed_edges(_points)
+
+        #signatures of the discretized edges only, after flipping
+        self.edges = list(_points.keys())
+        self.edge_signatures = [
+            (_keys[_k], tuple(_v[0])) for _k, _v in _points.items()
+        ]
+
         self.points = self._combine_points(_points)
 
-        self._build_segments()
+        _count = len(self.points) - 1
+
+        self.invalidated = self._get_invalidated(
+            _prev_signatures, _prev_offsets, _prev_count, _count)
+
+        self._build_segments(_prev_count)
+
+        return self.invalidated
+
+    def _get_keys(self):
+        """
+        Return the cache keys of the current geometry edges
+        """
+
+        return [self._edge_key(_edge) for _edge in self.geometry]
+
+    def _edge_key(self, edge):
+        """
+        Return a key which identifies the edge by its geometry and
+        the discretization parameters
+        """
+
+        _mid = (edge.FirstParameter + edge.LastParameter) / 2.0
+
+        return (
+            type(edge).__name__, tuple(edge.StartPoint), tuple(edge.EndPoint),
+            tuple(edge.value(_mid)), self.steps, self.get_spacing(edge),
+            self.tolerance
+        )
+
+    def get_spacing(self, edge):
+        """
+        Return the arc-length spacing of an edge
+        """
+
+        return self.edge_spacing.get(edge, self.spacing)
+
+    def set_spacing(self, edge, spacing):
+        """
+        Override the arc-length spacing of an edge.  Takes effect on the
+        next update, which re-discretizes only the affected edges.
+        """
+
+        self.edge_spacing[edge] = spacing
+
+    def _get_spacing_count(self, edge):
+        """
+        Return the number of arc-length intervals for an edge, given the
+        target spacing and chord error tolerance
+        """
+
+        _length = edge.length()
+        _spacing = self.get_spacing(edge)
+
+        if self.tolerance:
+
+            #arcs - longest arc for which the chord error is in tolerance
+            if edge.isDerivedFrom('Part::GeomArcOfCircle'):
+
+                _radius = edge.Radius
+
+                if self.tolerance < _radius:
+
+                    _delta = 2.0 * math.acos(1.0 - self.tolerance / _radius)
+                    _spacing = min(_spacing, _radius * _delta)
+
+            #other curves - interval count of a deflection-based discretization
+            elif not edge.isDerivedFrom('Part::GeomLineSegment'):
+
+                _count = len(edge.discretize(Deflection=self.tolerance)) - 1
+                _spacing = min(_spacing, _length / max(_count, 1))
+
+        return max(int(math.ceil(_length / _spacing)), 1)
+
+    def _discretize_edge(self, edge):
+        """
+        Discretize a single edge into a list of point tuples
+        """
+
+        #uniform arc-length discretization for all edge types
+        if self.get_spacing(edge):
+
+            if not (edge.isDerivedFrom('Part::GeomArcOfCircle')
+                    or edge.isDerivedFrom('Part::GeomLineSegment')
+                    or edge.isDerivedFrom('Part::GeomBSplineCurve')):
+
+                return None
+
+            _count = self._get_spacing_count(edge)
+
+            return [tuple(_v) for _v in edge.discretize(Number=_count + 1)]
+
+        #discretize the edge
+        if edge.isDerivedFrom('Part::GeomArcOfCircle') \
+            or edge.isDerivedFrom('Part::GeomBSplineCurve'):
+
+            return [tuple(_v) for _v in edge.discretize(self.steps)]
+
+        if edge.isDerivedFrom('Part::GeomLineSegment'):
+            return [tuple(_v) for _v in [edge.StartPoint, edge.EndPoint]]
+
+        return None
 
     def _discretize(self):
         """
         Discretize geometry into points, returning a dict of points
-        keyed to the reference to the originating Part edge
+        and a dict of cache keys, both keyed to the reference to the
+        originating Part edge.  Unsupported edges are omitted from both.
+
+        Edges with unchanged geometry are taken from the cache.
         """
 
         _pts = {}
+        _keys = {}
+        _cache = {}
 
-        for _edge in self.geometry:
+        for _edge, _key in zip(self.geometry, self._get_keys()):
 
-            #discretize the edge
-            if _edge.isDerivedFrom('Part::GeomArcOfCircle') \
-                or isinstance(_edge, BSplineCurve):
+            _v = self.edge_points.get(_key)
 
-                _pts[_edge] = [
-                    tuple(_v) for _v in _edge.discretize(self.steps)
-                ]
+            if _v is None:
+                _v = self._discretize_edge(_edge)
 
-            elif _edge.isDerivedFrom('Part::GeomLineSegment'):
-                _pts[_edge] = [
-                    tuple(_v) for _v in [_edge.StartPoint, _edge.EndPoint]
-                ]
+            if _v is None:
+                continue
 
-        return _pts
+            _cache[_key] = _v
+            _pts[_edge] = _v
+            _keys[_edge] = _key
+
+        #keep only the discretizations of the current edges
+        self.edge_points = _cache
+
+        return _pts, _keys
+
+    def _get_invalidated(self, signatures, offsets, prev_count, count):
+        """
+        Return the range of segments affected by changes in the edges,
+        comparing the previous and current edge signatures
+        """
+
+        if not signatures:
+            return range(0, count)
+
+        _cur = self.edge_signatures
+        _len = min(len(signatures), len(_cur))
+
+        #leading and trailing edges which are unchanged
+        _head = 0
+
+        while _head < _len and signatures[_head] == _cur[_head]:
+            _head += 1
+
+        if _head == len(signatures) == len(_cur):
+            return range(0)
+
+        _tail = 0
+
+        while _tail < _len - _head \
+            and signatures[-1 - _tail] == _cur[-1 - _tail]:
+
+            _tail += 1
+
+        #first changed point and the first unchanged trailing point
+        _start = self.edge_offsets[_head] if _head < len(_cur) else count + 1
+        _end = count + 1
+
+        if _tail:
+            _end = self.edge_offsets[len(_cur) - _tail] - 1
+
+        #segment look-ahead angles depend on the following two points
+        return range(max(_start - 2, 0), min(max(_end, _start), count))
 
     def _flip_reversed_edges(self, dct):
         """
@@ -124,7 +328,11 @@ class Path():
         eliminating duplicates and building the vector / angle tuples
         """
 
+        if self.columnar:
+            return self._combine_arrays(dct)
+
         _points = []
+        self.edge_offsets = []
 
         for _v in dct.values():
 
@@ -135,35 +343,154 @@ class Path():
                 if TupleMath.manhattan(_p[0], _points[-1]) < 0.01:
                     _p = _p[1:]
 
+            self.edge_offsets.append(len(_points))
             _points += _p
 
         return _points
 
-    def _build_segments(self):
+    def _combine_arrays(self, dct):
+        """
+        Combine a dictionary of points into a single (n, 3) array,
+        eliminating duplicates at edge start / end points
+        """
+
+        _arrays = []
+        _offset = 0
+
+        self.edge_offsets = []
+
+        for _v in dct.values():
+
+            _a = np.array(_v, dtype=np.float64)
+
+            if _arrays and np.abs(_a[0] - _arrays[-1][-1]).sum() < 0.01:
+                _a = _a[1:]
+
+            self.edge_offsets.append(_offset)
+            _offset += len(_a)
+
+            _arrays.append(_a)
+
+        return np.concatenate(_arrays)
+
+    def get_columns(self):
+        """
+        Return the segment positions, unit vectors, look-ahead angles and
+        tangents as numpy arrays
+        """
+
+        if self.columnar:
+            return self.segments.columns
+
+        _segs = self.segments
+
+        return SimpleNamespace(
+            position=np.array([_s.position for _s in _segs], dtype=np.float64),
+            vector=np.array([_s.vector for _s in _segs], dtype=np.float64),
+            angle=np.array([_s.angle for _s in _segs], dtype=np.float64),
+            tangent=np.array([_s.tangent for _s in _segs], dtype=np.float64)
+        )
+
+    def get_segment_edges(self):
+        """
+        Return the index in Path.edges of the edge each segment belongs to,
+        as an (n,) array
+        """
+
+        _count = max(len(self.points) - 1, 0)
+
+        #each segment belongs to the edge holding its end point
+        return np.searchsorted(
+            np.array(self.edge_offsets), np.arange(1, _count + 1),
+            side='right') - 1
+
+    def get_curvatures(self):
         """
-        Build the path data set, pre-calculating key values
+        Return the signed curvature of each segment as an (n,) array,
+        positive for ccw turns.  Segments of arcs take the curvature of
+        the arc, all others are treated as straight.
         """
 
+        _pts = np.asarray(self.points, dtype=np.float64)
+        _owner = self.get_segment_edges()
+        _curv = np.zeros(len(_owner))
+
+        if not len(_owner):
+            return _curv
+
+        for _i, _edge in enumerate(self.edges):
+
+            if not _edge.isDerivedFrom('Part::GeomArcOfCircle'):
+                continue
+
+            _first = np.searchsorted(_owner, _i, side='left')
+            _last = np.searchsorted(_owner, _i, side='right')
+
+            if _first == _last:
+                continue
+
+            _mid = tuple(_edge.value(
+                (_edge.FirstParameter + _edge.LastParameter) / 2.0))
+
+            _chord = _pts[_last, 0:2] - _pts[_first, 0:2]
+            _offset = np.array(_mid[0:2]) - _pts[_first, 0:2]
+
+            #the arc turns ccw if it bulges to the right of its chord
+            _cross = _chord[0] * _offset[1] - _chord[1] * _offset[0]
+
+            if _cross:
+                _curv[_first:_last] = -math.copysign(1.0 / _edge.Radius, _cross)
+
+        return _curv
+
+    def _build_segments(self, prev_count=0):
+        """
+        Build the path data set, pre-calculating key values.
+
+        Only segments in the invalidated range are rebuilt. Unchanged
+        leading and trailing segments are kept from the previous build.
+
+        prev_count - the number of segments before the update
+        """
+
+        if self.columnar:
+            self.segments = SegmentArray(self.points)
+            return
+
+        _range = self.invalidated
+
+        if not _range:
+            return
+
+        _shift = len(self.points) - 1 - prev_count
+
         #define each segment starting point and unit vector
-        _prev = self.points[0]
+        _new = [
+            PathSegment(self.points[_i], self.points[_i + 1]) for _i in _range
+        ]
+
+        _head = self.segments[:_range.start]
+        _tail = self.segments[max(_range.stop - _shift, 0):]
 
-        for _pt in self.points[1:]:
-            self.segments.append(PathSegment(_prev, _pt))
-            _prev = _pt
+        self.segments = _head + _new + _tail
 
         #define each segment angle and tangent w.r.t next segment
-        _prev = self.segments[0]
+        for _i in range(max(_range.start - 1, 0), _range.stop):
 
-        for _seg in self.segments[1:]:
-            _prev.set_look_ahead(_seg.vector)
-            _prev = _seg
+            if _i + 1 < len(self.segments):
+                self.segments[_i].set_look_ahead(self.segments[_i + 1].vector)
 
     def finish(self):
         """
         Cleanup
         """
 
+        if self.columnar:
+            self.segments.finish()
+
         self.segments = []
         self.steps = 0
         self.geometry = None
         self.points = []
+        self.edges = []
+        self.edge_spacing = {}
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Convergence-driven path step refinement
+"""
+
+import numpy as np
+
+from .analysis import get_geometry, get_vehicle, run_analysis
+from .kinematics import Kinematics
+from .path import Path
+from .segment_index import SegmentIndex
+
+class StepRefinement():
+    """
+    Adaptive path discretization for swept path analysis.
+
+    The analysis is repeated with the arc-length spacing of unconverged
+    path edges halved on each pass.  An edge is converged once the
+    envelope points nearest to it move less than the tolerance between
+    successive passes.
+    """
+
+    def __init__(self, vehicle, geometry, tolerance=0.1, spacing=None,
+                 minimum_spacing=None, iterations=8,
+                 tracking=Kinematics.TRACTRIX, substeps=1):
+        """
+        Constructor
+
+        vehicle - template symbol or Vehicle model object
+        geometry - path geometry source (see analysis.get_geometry)
+        tolerance - maximum envelope change between passes
+        spacing - initial arc-length spacing.  Defaults to 1/100th of
+                  the path length
+        minimum_spacing - spacing below which edges are not refined.
+                          Defaults to 1/10th of the tolerance
+        iterations - maximum number of refinement passes
+        tracking - off-tracking method, Kinematics.TRACTRIX or SNAP
+        substeps - number of integration sub-steps per path segment
+        """
+
+        self.vehicle = get_vehicle(vehicle)
+        self.geometry = get_geometry(geometry)
+        self.tolerance = tolerance
+        self.iterations = iterations
+        self.tracking = tracking
+        self.substeps = substeps
+
+        if not spacing:
+            spacing = sum(_e.length() for _e in self.geometry) / 100.0
+
+        self.spacing = spacing
+        self.minimum_spacing = minimum_spacing or tolerance / 10.0
+
+        self.path = None
+        self.result = None
+
+        #maximum envelope change of each edge in the last pass
+        self.errors = {}
+
+        #number of passes run
+        self.passes = 0
+
+    def run(self):
+        """
+        Refine the path until the envelope converges, returning the
+        analysis result of the final pass
+        """
+
+        self.path = Path(
+            self.geometry, 100, columnar=True, spacing=self.spacing)
+
+        self.passes = 0
+        self.errors = {}
+
+        _previous = None
+        _active = list(self.path.edges)
+
+        while True:
+
+            self.result = run_analysis(
+                self.vehicle, self.path, tracking=self.tracking,
+                substeps=self.substeps
+            )
+
+            #the vehicle stops at the start of the last path segment
+            _stations = self.get_stations()
+            self.result.end = _stations[-2]
+
+            self.passes += 1
+
+            if _previous is not None:
+
+                self.errors.update(
+                    self.get_errors(_previous, self.result, _stations))
+
+                _active = [
+                    _e for _e in self.path.edges
+                    if self.errors.get(_e, 0.0) > self.tolerance
+                ]
+
+            _active = [
+                _e for _e in _active
+                if self.path.get_spacing(_e) / 2.0 >= self.minimum_spacing
+            ]
+
+            if not _active or self.passes >= self.iterations:
+                return self.result
+
+            for _e in _active:
+                self.path.set_spacing(_e, self.path.get_spacing(_e) / 2.0)
+
+            self.path.update()
+
+            _previous = self.result
+
+    def get_stations(self):
+        """
+        Return the distance along the path of each path point
+        """
+
+        _pts = np.asarray(self.path.points, dtype=np.float64)[:, 0:2]
+
+        return np.concatenate(
+            ([0.0], np.cumsum(np.hypot(*np.diff(_pts, axis=0).T))))
+
+    def get_errors(self, previous, current, stations):
+        """
+        Return the maximum distance of the current envelope points from
+        the previous envelope, keyed to the nearest path edge.
+
+        The final position of the vehicle changes with the spacing of the
+        last edge, so the envelope beyond the nearer of the two final
+        positions is not compared.
+        """
+
+        _errors = {}
+
+        #envelope points lie within the combined unit lengths of the path
+        _radius = sum(_u.dimensions[0] for _u in self.vehicle.get_units())
+
+        #locate envelope points along a coarse copy of the path, keeping
+        #the edge end points
+        _pts = np.asarray(self.path.points, dtype=np.float64)[:, 0:2]
+
+        _keep = np.unique(np.concatenate((
+            np.searchsorted(
+                stations, np.arange(0.0, stations[-1], _radius / 16.0)),
+            np.array(self.path.edge_offsets, dtype=np.int64),
+            [len(_pts) - 1]
+        )))
+
+        _keep = _keep[_keep < len(_pts)]
+
+        _path = SegmentIndex()
+        _path.add_lines(_pts[_keep[:-1]], _pts[_keep[1:]])
+
+        #edge owning each coarse segment, by the segment end point
+        _owners = self.path.get_segment_edges()[_keep[1:] - 1]
+        _ends = stations[_keep[1:]]
+
+        _end = min(previous.end, current.end)
+
+        for _prev, _cur in ((previous.left, current.left),
+                            (previous.right, current.right)):
+
+            if _prev is None or _cur is None or len(_prev) < 2:
+                continue
+
+            _index = SegmentIndex()
+            _index.add_lines(_prev[:-1], _prev[1:])
+
+            #envelope movement beyond the tolerance only marks the edge
+            #as unconverged, so the search stops there
+            _dist = _index.nearest(_cur, 2.0 * self.tolerance).distance
+            _dist = np.minimum(_dist, 2.0 * self.tolerance)
+
+            _near = _path.nearest(_cur, _radius).index
+            _found = _near >= 0
+
+            _found[_found] = _ends[_near[_found]] <= _end
+
+            _edge = _owners[_near[_found]]
+            _max = np.zeros(len(self.path.edges))
+
+            np.maximum.at(_max, _edge, _dist[_found])
+
+            for _i, _e in enumerate(self.path.edges):
+                _errors[_e] = max(_errors.get(_e, 0.0), float(_max[_i]))
+
+        return _errors
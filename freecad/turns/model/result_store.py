@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Memory-mapped, append-only store of per-step analysis results
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+class ResultStore():
+    """
+    Append-only store of the per-step state and track coordinates of
+    vehicle units, backed by memory-mapped files.
+
+    Each unit has a file of fixed-size records, one per step, holding the
+    position, orientation, steering angle, radius and the (m, 3) world
+    coordinates of its tracked points.  Files grow by doubling into a new
+    file, so read-only views of the records handed out earlier are never
+    resized or overwritten.  A json header records the units, their files
+    and row counts.  Steps are read as views of the mapped files, so
+    memory use does not grow with the path length.
+    """
+
+    #store format version
+    version = 2
+
+    #header file name within the store directory
+    header_name = 'store.json'
+
+    def __init__(self, directory, mode='w', capacity=1024):
+        """
+        Constructor
+
+        directory - store directory, created if necessary
+        mode - 'w' to create an empty store, 'a' to append to an existing
+               store, or 'r' to open an existing store read-only
+        capacity - initial number of records allocated per unit
+        """
+
+        self.directory = directory
+        self.mode = mode
+        self.capacity = max(capacity, 1)
+
+        #unit descriptions (name, point count, footprint point count,
+        #row count) and their mapped record arrays
+        self.units = []
+        self.records = []
+
+        if mode == 'w':
+            os.makedirs(directory, exist_ok=True)
+            self.clear()
+
+        else:
+            self.load()
+
+    @staticmethod
+    def get_dtype(points):
+        """
+        Return the record dtype of a unit with a number of tracked points
+        """
+
+        return np.dtype([
+            ('position', '<f8', (2,)),
+            ('orientation', '<f8'),
+            ('angle', '<f8'),
+            ('radius', '<f8'),
+            ('points', '<f8', (points, 3))
+        ])
+
+    def get_file(self, unit):
+        """
+        Return the record file name of a unit
+        """
+
+        return os.path.join(self.directory, self.units[unit]['file'])
+
+    def load(self):
+        """
+        Open the units of an existing store, checking the header against
+        the record files
+        """
+
+        with open(os.path.join(self.directory, ResultStore.header_name)) as _fp:
+            _header = json.load(_fp)
+
+        if _header.get('version') != ResultStore.version:
+            raise ValueError('Unsupported result store version')
+
+        self.units = _header['units']
+
+        for _i, _u in enumerate(self.units):
+
+            _itemsize = ResultStore.get_dtype(_u['points']).itemsize
+            _file = self.get_file(_i)
+
+            if _u.get('itemsize') != _itemsize or not os.path.exists(_file) \
+                or os.path.getsize(_file) < _u['rows'] * _itemsize:
+
+                raise ValueError(
+                    'Result store unit {} does not match its file'.format(_i))
+
+        self.records = [self._map(_i) for _i in range(len(self.units))]
+
+    def _map(self, unit):
+        """
+        Map the record file of a unit
+        """
+
+        _dtype = ResultStore.get_dtype(self.units[unit]['points'])
+        _file = self.get_file(unit)
+
+        _size = os.path.getsize(_file) // _dtype.itemsize
+
+        if not _size:
+            return np.zeros(0, dtype=_dtype)
+
+        return np.memmap(_file, dtype=_dtype, shape=(_size,),
+                         mode='r' if self.mode == 'r' else 'r+')
+
+    def _create(self, unit, capacity):
+        """
+        Create a new record file for a unit with the capacity, copying the
+        stored rows of its current file, and map it.  The current file is
+        removed, which is deferred to remove() on platforms where files
+        still mapped by earlier views cannot be removed.
+        """
+
+        _unit = self.units[unit]
+        _dtype = ResultStore.get_dtype(_unit['points'])
+
+        _fd, _file = tempfile.mkstemp(
+            prefix='unit_{}_'.format(unit), suffix='.dat', dir=self.directory)
+
+        with os.fdopen(_fd, 'wb') as _fp:
+            _fp.truncate(capacity * _dtype.itemsize)
+
+        _old = _unit.get('file')
+        _records = self.records[unit] if unit < len(self.records) else None
+
+        _unit['file'] = os.path.basename(_file)
+        _unit['itemsize'] = _dtype.itemsize
+
+        _mapped = self._map(unit)
+
+        if _records is not None and _unit['rows']:
+            _mapped[:_unit['rows']] = _records[:_unit['rows']]
+
+        if unit < len(self.records):
+            self.records[unit] = _mapped
+
+        else:
+            self.records.append(_mapped)
+
+        del _records
+
+        if _old:
+            ResultStore._remove_file(os.path.join(self.directory, _old))
+
+    @staticmethod
+    def _remove_file(file_name):
+        """
+        Remove a file, ignoring files which are still in use
+        """
+
+        try:
+            os.remove(file_name)
+
+        except OSError:
+            pass
+
+    def clear(self):
+        """
+        Remove all units from the store.  New units are written to new
+        record files, so views of the records of earlier units remain
+        valid.
+        """
+
+        _files = [self.get_file(_i) for _i in range(len(self.units))]
+
+        self.units = []
+        self.records = []
+
+        for _f in _files:
+            ResultStore._remove_file(_f)
+
+        self.flush()
+
+    def remove(self):
+        """
+        Remove the store files, ignoring files which are still in use
+        """
+
+        self.units = []
+        self.records = []
+
+        for _f in os.listdir(self.directory):
+
+            if not (_f.startswith('unit_') or _f == ResultStore.header_name):
+                continue
+
+            ResultStore._remove_file(os.path.join(self.directory, _f))
+
+        try:
+            os.rmdir(self.directory)
+
+        except OSError:
+            pass
+
+    def add_unit(self, name, points, footprint=0):
+        """
+        Add a vehicle unit, returning its index
+
+        name - unit name
+        points - number of tracked points per step
+        footprint - number of leading tracked points forming the body
+                    footprint polygon
+        """
+
+        _unit = len(self.units)
+
+        self.units.append({
+            'name': name, 'points': points, 'footprint': footprint, 'rows': 0
+        })
+
+        self._create(_unit, self.capacity)
+
+        return _unit
+
+    def append(self, unit, position, orientation, angle, radius, points):
+        """
+        Append the state of a unit at consecutive steps
+
+        position - (k, 2) positions
+        orientation, angle, radius - (k,) arrays
+        points - (k, m, 2) or (k, m, 3) tracked point coordinates
+        """
+
+        _rows = self.units[unit]['rows']
+        _count = len(orientation)
+
+        self.reserve(unit, _rows + _count)
+
+        _r = self.records[unit][_rows:_rows + _count]
+        _points = np.asarray(points, dtype=np.float64)
+
+        _r['position'] = position
+        _r['orientation'] = orientation
+        _r['angle'] = angle
+        _r['radius'] = radius
+        _r['points'][..., 0:_points.shape[2]] = _points
+        _r['points'][..., _points.shape[2]:] = 0.0
+
+        self.units[unit]['rows'] = _rows + _count
+
+    def reserve(self, unit, count):
+        """
+        Ensure capacity for count records of a unit, doubling the file
+        """
+
+        _capacity = len(self.records[unit])
+
+        if count <= _capacity:
+            return
+
+        _capacity = max(_capacity, 1)
+
+        while _capacity < count:
+            _capacity *= 2
+
+        self._create(unit, _capacity)
+
+    def write_kinematics(self, unit, kinematics, points, chunk_size=65536):
+        """
+        Append the solved state and tracked points of a unit at every step,
+        chunk by chunk
+
+        kinematics - solved Kinematics of the unit
+        points - list of vehicle-relative tracked points
+        """
+
+        self.reserve(unit, self.units[unit]['rows'] + kinematics.count)
+
+        for _s in range(0, kinematics.count, chunk_size):
+
+            _e = min(_s + chunk_size, kinematics.count)
+
+            self.append(
+                unit, kinematics.position[_s:_e], kinematics.orientation[_s:_e],
+                kinematics.angle[_s:_e], kinematics.radius[_s:_e],
+                kinematics.transform(points, _s, _e)
+            )
+
+        self.flush()
+
+    def flush(self):
+        """
+        Flush the mapped records and write the header
+        """
+
+        for _r in self.records:
+
+            if isinstance(_r, np.memmap) and self.mode != 'r':
+                _r.flush()
+
+        if self.mode == 'r':
+            return
+
+        _file = os.path.join(self.directory, ResultStore.header_name)
+        _temp = _file + '.{}.tmp'.format(os.getpid())
+
+        with open(_temp, 'w') as _fp:
+            json.dump({'version': ResultStore.version, 'units': self.units}, _fp)
+
+        os.replace(_temp, _file)
+
+    def get_count(self, unit):
+        """
+        Return the number of steps stored for a unit
+        """
+
+        return self.units[unit]['rows']
+
+    def get_rows(self, unit, start=0, end=None):
+        """
+        Return a read-only view of the records of a unit from the start
+        step to the end step
+        """
+
+        _rows = self.records[unit][:self.units[unit]['rows']][start:end]
+        _rows.flags.writeable = False
+
+        return _rows
+
+    def get(self, unit, step):
+        """
+        Return the record of a unit at a step
+        """
+
+        return self.get_rows(unit)[step]
+
+    def get_tracks(self, unit, start=0, end=None):
+        """
+        Return an (n, m, 3) view of the tracked points of a unit
+        """
+
+        return self.get_rows(unit, start, end)['points']
+
+    def get_footprints(self, unit, start=0, end=None):
+        """
+        Return an (n, f, 2) view of the footprint points of a unit
+        """
+
+        _f = self.units[unit]['footprint']
+
+        return self.get_tracks(unit, start, end)[:, 0:_f, 0:2]
+
+    def finish(self, remove=False):
+        """
+        Cleanup, removing the store files if requested
+        """
+
+        if remove and self.mode != 'r':
+            self.remove()
+
+        else:
+            self.flush()
+
+        self.units = []
+        self.records = []
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Streaming writer and reader for per-step analysis results
+"""
+
+import json
+import os
+import struct
+
+from types import SimpleNamespace
+
+import numpy as np
+
+#fixed result columns as (name, dtype) tuples.  Wheel track columns
+#(wheel_<i>_x, wheel_<i>_y) follow, one pair per wheel.
+RESULT_COLUMNS = (
+    ('step', '<i8'),
+    ('unit', '<i4'),
+    ('x', '<f8'),
+    ('y', '<f8'),
+    ('orientation', '<f8'),
+    ('angle', '<f8'),
+    ('radius', '<f8')
+)
+
+class ResultWriter():
+    """
+    Streaming writer of per-step vehicle state.
+
+    Rows are buffered and written in chunks to a columnar binary file,
+    with each chunk holding the rows of every column contiguously, and to
+    a CSV file alongside it.  Memory use is bounded by the chunk size, no
+    matter how many rows are written.
+
+    The binary file is a magic string, a length-prefixed json header
+    (version, columns, unit names), then chunks of a row count followed
+    by the little-endian data of each column in turn.
+    """
+
+    #file signature and format version
+    magic = b'TURNSRES'
+    version = 1
+
+    def __init__(self, file_name, names=None, wheels=0, chunk_size=65536,
+                 csv=True):
+        """
+        Constructor
+
+        file_name - binary result file name
+        names - list of vehicle unit names
+        wheels - number of wheel track column pairs
+        chunk_size - number of rows buffered per chunk
+        csv - if True, also write a CSV file with the file extension
+              replaced by .csv
+        """
+
+        self.file_name = file_name
+        self.names = list(names or [])
+        self.chunk_size = chunk_size
+        self.wheels = wheels
+
+        self.columns = list(RESULT_COLUMNS) + [
+            ('wheel_{}_{}'.format(_i, _a), '<f8')
+            for _i in range(wheels) for _a in ('x', 'y')
+        ]
+
+        self.rows = 0
+        self.chunks = 0
+
+        #buffered column arrays and their row count
+        self.pending = {_n: [] for _n, _t in self.columns}
+        self.pending_rows = 0
+
+        self.csv_name = None
+        self.csv_file = None
+
+        self.file = open(file_name, 'wb')
+
+        _header = json.dumps({
+            'version': ResultWriter.version, 'columns': self.columns,
+            'names': self.names
+        }).encode('utf-8')
+
+        self.file.write(ResultWriter.magic)
+        self.file.write(struct.pack('<I', len(_header)))
+        self.file.write(_header)
+
+        if csv:
+
+            self.csv_name = os.path.splitext(file_name)[0] + '.csv'
+            self.csv_file = open(self.csv_name, 'w', newline='')
+
+            self.csv_file.write(','.join(_n for _n, _t in self.columns) + '\n')
+
+    def __enter__(self):
+        """
+        Context manager entry
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Context manager exit, closing the files
+        """
+
+        self.close()
+
+    def write(self, **columns):
+        """
+        Write rows given as column arrays of equal length.  Missing wheel
+        track columns are written as NaN.
+        """
+
+        _count = len(columns['step'])
+
+        for _n, _t in self.columns:
+
+            _v = columns.get(_n)
+
+            if _v is None:
+                _v = np.full(_count, np.nan)
+
+            _v = np.asarray(_v, dtype=_t)
+
+            assert _v.shape == (_count,),\
+                'Column "{}" has {} rows, expected {}'.format(_n, len(_v), _count)
+
+            self.pending[_n].append(_v)
+
+        self.pending_rows += _count
+
+        if self.pending_rows >= self.chunk_size:
+            self.flush()
+
+    def write_kinematics(self, kinematics, unit=0):
+        """
+        Write the solved state of a vehicle unit at every step, chunk by
+        chunk
+
+        kinematics - solved Kinematics of the unit
+        unit - unit index
+        """
+
+        _wheels = [
+            _w.center for _a in kinematics.vehicle.axles for _w in _a.wheels
+        ][:self.wheels]
+
+        for _s in range(0, kinematics.count, self.chunk_size):
+
+            _e = min(_s + self.chunk_size, kinematics.count)
+
+            _columns = {
+                'step': np.arange(_s, _e),
+                'unit': np.full(_e - _s, unit),
+                'x': kinematics.position[_s:_e, 0],
+                'y': kinematics.position[_s:_e, 1],
+                'orientation': kinematics.orientation[_s:_e],
+                'angle': kinematics.angle[_s:_e],
+                'radius': kinematics.radius[_s:_e]
+            }
+
+            if _wheels:
+
+                _tracks = kinematics.transform(_wheels, _s, _e)
+
+                for _i in range(len(_wheels)):
+                    _columns['wheel_{}_x'.format(_i)] = _tracks[:, _i, 0]
+                    _columns['wheel_{}_y'.format(_i)] = _tracks[:, _i, 1]
+
+            self.write(**_columns)
+
+    def flush(self):
+        """
+        Write the buffered rows as a chunk
+        """
+
+        if not self.pending_rows:
+            return
+
+        _data = [np.concatenate(self.pending[_n]) for _n, _t in self.columns]
+
+        self.file.write(struct.pack('<Q', self.pending_rows))
+
+        for _v in _data:
+            self.file.write(_v.tobytes())
+
+        if self.csv_file:
+
+            _fmt = ['%d' if _t[1] == 'i' else '%.10g' for _n, _t in self.columns]
+
+            np.savetxt(self.csv_file, np.column_stack(_data),
+                       fmt=_fmt, delimiter=',')
+
+        self.rows += self.pending_rows
+        self.chunks += 1
+
+        self.pending = {_n: [] for _n, _t in self.columns}
+        self.pending_rows = 0
+
+    def close(self):
+        """
+        Flush the buffered rows and close the files
+        """
+
+        if not self.file:
+            return
+
+        self.flush()
+        self.file.close()
+
+        if self.csv_file:
+            self.csv_file.close()
+
+        self.file = None
+        self.csv_file = None
+
+def write_results(file_name, units, chunk_size=65536, csv=True):
+    """
+    Write the solved state of vehicle units to a result file, returning
+    the number of rows written
+
+    file_name - binary result file name
+    units - list of solved Kinematics of the vehicle and its towed units
+    chunk_size - number of rows buffered per chunk
+    csv - if True, also write a CSV file
+    """
+
+    _wheels = max(
+        (sum(len(_a.wheels) for _a in _k.vehicle.axles) for _k in units),
+        default=0
+    )
+
+    with ResultWriter(file_name, [_k.vehicle.name for _k in units], _wheels,
+                      chunk_size, csv) as _writer:
+
+        for _i, _k in enumerate(units):
+            _writer.write_kinematics(_k, _i)
+
+    return _writer.rows
+
+def read_header(file):
+    """
+    Read the header of an open binary result file
+    """
+
+    assert file.read(len(ResultWriter.magic)) == ResultWriter.magic,\
+        'Not a result file'
+
+    _size = struct.unpack('<I', file.read(4))[0]
+
+    return json.loads(file.read(_size).decode('utf-8'))
+
+def iter_chunks(file_name):
+    """
+    Yield the chunks of a binary result file as dictionaries of column
+    arrays
+    """
+
+    with open(file_name, 'rb') as _fp:
+
+        _header = read_header(_fp)
+
+        while True:
+
+            _size = _fp.read(8)
+
+            if len(_size) < 8:
+                return
+
+            _rows = struct.unpack('<Q', _size)[0]
+            _chunk = {}
+
+            for _n, _t in _header['columns']:
+
+                _dtype = np.dtype(_t)
+                _chunk[_n] = np.frombuffer(
+                    _fp.read(_rows * _dtype.itemsize), dtype=_dtype)
+
+            yield _chunk
+
+def read_results(file_name):
+    """
+    Read a binary result file, returning a SimpleNamespace of the unit
+    names and a dictionary of column arrays
+    """
+
+    with open(file_name, 'rb') as _fp:
+        _header = read_header(_fp)
+
+    _chunks = list(iter_chunks(file_name))
+
+    return SimpleNamespace(
+        names=_header['names'],
+        columns={
+            _n: np.concatenate([_c[_n] for _c in _chunks])
+                if _chunks else np.zeros(0, dtype=_t)
+            for _n, _t in _header['columns']
+        }
+    )
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Array-backed PathSegment storage
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+class SegmentView():
+    """
+    Lightweight, read-only view of a single segment in a SegmentArray,
+    exposing the same attributes as a PathSegment
+    """
+
+    __slots__ = ('columns', 'index')
+
+    def __init__(self, columns, index):
+        """
+        Constructor
+        """
+
+        self.columns = columns
+        self.index = index
+
+    def __str__(self):
+        """
+        Stringify
+        """
+
+        return 'pos: {}; vec: {}; ang: {}; tan: {}'.format(
+            str(self.position), str(self.vector), str(self.angle),
+            str(self.tangent)
+        )
+
+    @property
+    def position(self):
+        """
+        Segment starting point as a coordinate tuple
+        """
+
+        return tuple(self.columns.position[self.index].tolist())
+
+    @property
+    def vector(self):
+        """
+        Segment unit vector as a tuple
+        """
+
+        return tuple(self.columns.vector[self.index].tolist())
+
+    @property
+    def angle(self):
+        """
+        Angle between the segment and the next segment
+        """
+
+        return float(self.columns.angle[self.index])
+
+    @property
+    def tangent(self):
+        """
+        Sum of the segment vector and the next segment vector
+        """
+
+        return tuple(self.columns.tangent[self.index].tolist())
+
+class SegmentArray():
+    """
+    Path segments stored as contiguous float64 columns of positions,
+    unit vectors, look-ahead angles and tangents.
+
+    Indexing returns SegmentView objects for compatibility with code
+    written against lists of PathSegment objects.
+    """
+
+    @staticmethod
+    def build_columns(points):
+        """
+        Build the segment columns from an (n, 3) array of path points
+        """
+
+        _pts = np.asarray(points, dtype=np.float64)
+
+        _vec = np.diff(_pts, axis=0)
+        _len = np.linalg.norm(_vec, axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _vec = _vec / _len[:, None]
+
+        #look-ahead angle is the ccw angle from each vector to the next
+        _angle = np.zeros(len(_vec))
+        _tangent = _vec.copy()
+
+        _cur = _vec[:-1]
+        _next = _vec[1:]
+
+        _angle[:-1] = np.arctan2(
+            _cur[:, 0] * _next[:, 1] - _cur[:, 1] * _next[:, 0],
+            np.einsum('ij,ij->i', _cur[:, 0:2], _next[:, 0:2])
+        )
+
+        _tangent[:-1] = _cur + _next
+
+        return SimpleNamespace(
+            position=_pts[:-1], vector=_vec, angle=_angle, tangent=_tangent)
+
+    def __init__(self, points=None, columns=None):
+        """
+        Constructor
+
+        points - (n, 3) array of path points
+        columns - pre-built segment columns (optional)
+        """
+
+        if columns is None:
+            columns = SegmentArray.build_columns(points)
+
+        self.columns = columns
+
+    def __len__(self):
+        """
+        Number of segments
+        """
+
+        return len(self.columns.angle)
+
+    def __getitem__(self, index):
+        """
+        Return a view of the segment at the index, or a list of views
+        for a slice
+        """
+
+        if isinstance(index, slice):
+            return [
+                SegmentView(self.columns, _i)
+                for _i in range(*index.indices(len(self)))
+            ]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError('segment index out of range')
+
+        return SegmentView(self.columns, index)
+
+    def __iter__(self):
+        """
+        Iterate segment views
+        """
+
+        for _i in range(len(self)):
+            yield SegmentView(self.columns, _i)
+
+    def finish(self):
+        """
+        Cleanup
+        """
+
+        self.columns = None
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Uniform grid spatial index for LineSegment bounding boxes
+"""
+
+import math
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from .line_segment import LineSegment
+
+class SegmentIndex():
+    """
+    Uniform grid spatial index over LineSegment bounding boxes.
+
+    Boxes follow the LineSegment.box convention of
+    [x_min, x_max, y_min, y_max].  Items are referenced by their
+    insertion index.
+    """
+
+    def __init__(self, segments=None, cell_size=None):
+        """
+        Constructor
+
+        segments - list of LineSegment objects to index (optional)
+        cell_size - grid cell size.  Estimated from the segments if None
+        """
+
+        self.cell_size = cell_size
+        self.segments = []
+        self.boxes = np.zeros((0, 4))
+        self.cells = {}
+
+        #segment start / end points, for intersection queries
+        self.starts = np.zeros((0, 2))
+        self.ends = np.zeros((0, 2))
+
+        #sorted cell keys / item indices for vectorized queries
+        self._table = None
+
+        if segments:
+            self.build(segments)
+
+    def __len__(self):
+        """
+        Number of indexed items
+        """
+
+        return len(self.boxes)
+
+    @staticmethod
+    def estimate_cell_size(boxes):
+        """
+        Estimate a cell size from the mean bounding box extent
+        """
+
+        if not len(boxes):
+            return 1.0
+
+        _extent = np.maximum(boxes[:, 1] - boxes[:, 0], boxes[:, 3] - boxes[:, 2])
+        _size = 2.0 * float(np.mean(_extent))
+
+        if _size <= 0.0 or not math.isfinite(_size):
+            return 1.0
+
+        return _size
+
+    def build(self, segments):
+        """
+        Index a list of LineSegment objects
+        """
+
+        _starts, _ends = LineSegment.to_arrays(segments)
+        self.add_lines(_starts, _ends, segments)
+
+    def insert(self, segment):
+        """
+        Index a single LineSegment, returning its index
+        """
+
+        self.build([segment])
+
+        return len(self.boxes) - 1
+
+    def add_lines(self, starts, ends, items=None):
+        """
+        Index segments given as (n, 2) arrays of start and end points
+        """
+
+        self.starts = np.concatenate((self.starts, starts[:, 0:2]))
+        self.ends = np.concatenate((self.ends, ends[:, 0:2]))
+
+        self.add_boxes(LineSegment.get_boxes(starts, ends), items)
+
+    def add_boxes(self, boxes, items=None):
+        """
+        Index an (n, 4) array of bounding boxes, with optional
+        corresponding items.  Intersection queries require the segments
+        to be added with build() or add_lines() instead.
+        """
+
+        if not self.cell_size and len(boxes):
+            self.cell_size = SegmentIndex.estimate_cell_size(boxes)
+
+        _first = len(self.boxes)
+
+        self.boxes = np.concatenate((self.boxes, boxes))
+
+        if items is None:
+            items = [None] * len(boxes)
+
+        self.segments += list(items)
+
+        _cells = self._get_cell_ranges(boxes)
+
+        for _i, _c in enumerate(_cells.tolist(), _first):
+
+            for _x in range(_c[0], _c[1] + 1):
+                for _y in range(_c[2], _c[3] + 1):
+                    self.cells.setdefault((_x, _y), []).append(_i)
+
+        self._table = None
+
+    def _get_cell_ranges(self, boxes):
+        """
+        Return the (n, 4) integer cell ranges covered by the boxes
+        """
+
+        return np.floor(boxes / self.cell_size).astype(np.int64)
+
+    def query_box(self, box):
+        """
+        Return the indices of the items whose boxes overlap the box
+        """
+
+        _c = self._get_cell_ranges(np.array(box, dtype=np.float64)).tolist()
+        _found = set()
+
+        for _x in range(_c[0], _c[1] + 1):
+            for _y in range(_c[2], _c[3] + 1):
+                _found.update(self.cells.get((_x, _y), ()))
+
+        if not _found:
+            return []
+
+        _idx = np.fromiter(_found, dtype=np.int64, count=len(_found))
+        _idx.sort()
+
+        _b = self.boxes[_idx]
+
+        _hit = ~(
+            (_b[:, 0] > box[1]) | (_b[:, 1] < box[0])
+            | (_b[:, 2] > box[3]) | (_b[:, 3] < box[2])
+        )
+
+        return _idx[_hit].tolist()
+
+    def query(self, segment):
+        """
+        Return the indexed segments whose boxes collide with the segment
+        """
+
+        return [self.segments[_i] for _i in self.query_box(segment.box)]
+
+    def intersecting(self, segment):
+        """
+        Return a list of (index, intersection) tuples for the indexed
+        segments which intersect the segment, in index order.
+        Intersection is a 3D point tuple, as in LineSegment.is_intersecting
+        """
+
+        _idx = np.array(self.query_box(segment.box), dtype=np.int64)
+
+        if not len(_idx):
+            return []
+
+        _int = LineSegment.intersect_arrays(
+            np.array([segment.start[0:2]]), np.array([segment.end[0:2]]),
+            self.starts[_idx], self.ends[_idx]
+        )
+
+        _hits = _int.hits[0]
+
+        return [
+            (_i, tuple(_p) + (0.0,)) for _i, _p in
+            zip(_idx[_hits].tolist(), _int.points[0][_hits].tolist())
+        ]
+
+    def crossing_pairs(self, starts, ends):
+        """
+        Vectorized intersection of an array of query segments with the
+        indexed segments.
+
+        Returns a SimpleNamespace of (query, index, u, v, points) arrays,
+        one entry per intersecting pair, sorted by query and index
+        """
+
+        _q, _i = self.query_pairs(LineSegment.get_boxes(starts, ends))
+
+        _int = LineSegment.intersect_arrays(
+            starts[_q], ends[_q], self.starts[_i], self.ends[_i], paired=True)
+
+        _hits = np.flatnonzero(_int.hits)
+        _hits = _hits[np.lexsort((_i[_hits], _q[_hits]))]
+
+        return SimpleNamespace(
+            query=_q[_hits], index=_i[_hits], u=_int.u[_hits],
+            v=_int.v[_hits], points=_int.points[_hits]
+        )
+
+    def nearest(self, points, radius):
+        """
+        Return the nearest indexed segment to each of the (n, 2) points,
+        searching within the radius.
+
+        Returns a SimpleNamespace of (index, distance) arrays, with an
+        index of -1 and infinite distance for points with no segment
+        within the radius
+        """
+
+        _pts = np.asarray(points, dtype=np.float64)[:, 0:2]
+
+        _index = np.full(len(_pts), -1, dtype=np.int64)
+        _distance = np.full(len(_pts), np.inf)
+
+        _q, _i = self.query_pairs(np.stack((
+            _pts[:, 0] - radius, _pts[:, 0] + radius,
+            _pts[:, 1] - radius, _pts[:, 1] + radius
+        ), axis=1))
+
+        if not len(_q):
+            return SimpleNamespace(index=_index, distance=_distance)
+
+        _d = LineSegment.point_distances(
+            _pts[_q], self.starts[_i], self.ends[_i])
+
+        #closest candidate of each query point.  Pairs are grouped by query,
+        #so each group minimum is found with a segmented reduction
+        _starts = np.flatnonzero(np.diff(_q, prepend=-1))
+        _min = np.minimum.reduceat(_d, _starts)
+
+        _group = np.cumsum(np.diff(_q, prepend=-1) != 0) - 1
+        _is_min = np.flatnonzero(_d == _min[_group])
+
+        _best = _is_min[np.unique(_q[_is_min], return_index=True)[1]]
+
+        _hit = _d[_best] <= radius
+
+        _index[_q[_best][_hit]] = _i[_best][_hit]
+        _distance[_q[_best][_hit]] = _d[_best][_hit]
+
+        return SimpleNamespace(index=_index, distance=_distance)
+
+    def _build_table(self):
+        """
+        Build the sorted cell key / item index table for vectorized queries
+        """
+
+        _cells = self._get_cell_ranges(self.boxes)
+
+        _w = _cells[:, 1] - _cells[:, 0] + 1
+        _h = _cells[:, 3] - _cells[:, 2] + 1
+
+        _items, _x, _y = SegmentIndex._expand_cells(_cells, _w, _h)
+
+        _order = np.lexsort((_items, _y, _x))
+
+        _x, _y, _items = _x[_order], _y[_order], _items[_order]
+
+        #cell extents and sorted cell keys, so queries do not scale with
+        #the size of the table
+        _extents = (int(_x[0]), int(_x[-1]), int(_y.min()), int(_y.max()))
+        _span = _extents[3] - _extents[2] + 1
+
+        _keys = (_x - _extents[0]) * _span + (_y - _extents[2])
+
+        self._table = (_keys, _items, _extents)
+
+    @staticmethod
+    def _expand_cells(cells, widths, heights):
+        """
+        Expand cell ranges into individual (owner, x, y) cell entries
+        """
+
+        _counts = widths * heights
+        _owner = np.repeat(np.arange(len(cells)), _counts)
+
+        _k = np.arange(_counts.sum()) - np.repeat(np.cumsum(_counts) - _counts, _counts)
+
+        _x = cells[_owner, 0] + _k % widths[_owner]
+        _y = cells[_owner, 2] + _k // widths[_owner]
+
+        return _owner, _x, _y
+
+    def query_pairs(self, boxes):
+        """
+        Vectorized query of an (n, 4) array of boxes.  Returns arrays of
+        (query index, item index) pairs for overlapping boxes, grouped by
+        query index.
+        """
+
+        _empty = np.zeros(0, dtype=np.int64)
+
+        if not len(self.boxes) or not len(boxes):
+            return _empty, _empty
+
+        if self._table is None:
+            self._build_table()
+
+        _keys, _titems, _extents = self._table
+
+        _cells = self._get_cell_ranges(boxes)
+
+        #clip query ranges to the extents of the indexed cells
+        _cells[:, 0] = np.maximum(_cells[:, 0], _extents[0])
+        _cells[:, 1] = np.minimum(_cells[:, 1], _extents[1])
+        _cells[:, 2] = np.maximum(_cells[:, 2], _extents[2])
+        _cells[:, 3] = np.minimum(_cells[:, 3], _extents[3])
+
+        _w = np.maximum(_cells[:, 1] - _cells[:, 0] + 1, 0)
+        _h = np.maximum(_cells[:, 3] - _cells[:, 2] + 1, 0)
+
+        _query, _x, _y = SegmentIndex._expand_cells(_cells, _w, _h)
+
+        #locate each query cell in the sorted table
+        _span = _extents[3] - _extents[2] + 1
+
+        _qkeys = (_x - _extents[0]) * _span + (_y - _extents[2])
+
+        _lo = np.searchsorted(_keys, _qkeys, side='left')
+        _hi = np.searchsorted(_keys, _qkeys, side='right')
+
+        _counts = _hi - _lo
+        _qidx = np.repeat(_query, _counts)
+
+        _pos = np.arange(_counts.sum()) \
+            - np.repeat(np.cumsum(_counts) - _counts, _counts) \
+            + np.repeat(_lo, _counts)
+
+        _iidx = _titems[_pos]
+
+        _a = boxes[_qidx]
+        _b = self.boxes[_iidx]
+
+        _hit = ~(
+            (_b[:, 0] > _a[:, 1]) | (_b[:, 1] < _a[:, 0])
+            | (_b[:, 2] > _a[:, 3]) | (_b[:, 3] < _a[:, 2])
+        )
+
+        #a pair is found in every cell shared by the boxes, so keep it only
+        #in the cell holding the lower corner of the box overlap
+        _corner = np.floor(np.stack((
+            np.maximum(_a[:, 0], _b[:, 0]), np.maximum(_a[:, 2], _b[:, 2])
+        ), axis=1) / self.cell_size).astype(np.int64)
+
+        _hit &= (_corner[:, 0] == np.repeat(_x, _counts)) \
+            & (_corner[:, 1] == np.repeat(_y, _counts))
+
+        return _qidx[_hit], _iidx[_hit]
+
+    def finish(self):
+        """
+        Cleanup
+        """
+
+        self.segments = []
+        self.boxes = np.zeros((0, 4))
+        self.cells = {}
+        self.starts = np.zeros((0, 2))
+        self.ends = np.zeros((0, 2))
+        self._table = None
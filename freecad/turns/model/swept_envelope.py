@@ -0,0 +1,652 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Swept-area envelope of a vehicle footprint moving along a path
+"""
+
+import numpy as np
+
+from .line_segment import LineSegment
+from .segment_index import SegmentIndex
+
+class SweptEnvelope():
+    """
+    Outer boundary of the area swept by one or more vehicle footprints.
+
+    The motion is broken into convex pieces.  Where the footprint turns
+    by less than the tolerance, runs of footprints are replaced by their
+    convex hull.  Elsewhere the footprints are kept, and each vertex
+    track between two steps is covered by a small connecting hull.  The
+    boundary of the union of the pieces is found by splitting every
+    piece edge where it crosses another piece and keeping the parts not
+    covered by any other piece.  The spatial index limits the work to
+    pieces that overlap.
+    """
+
+    def __init__(self, footprints, spacing=None, tolerance=None):
+        """
+        Constructor
+
+        footprints - (n, m, 2) array of convex footprint polygons for
+                     each of n steps, or a list of such arrays (one per
+                     vehicle unit)
+        spacing - minimum footprint displacement between the steps used
+                  to build the envelope.  Defaults to a quarter of the
+                  shortest footprint edge
+        tolerance - allowed deviation of the envelope where runs of
+                    footprints are merged.  Defaults to 1/1000 of the
+                    footprint size
+        """
+
+        if isinstance(footprints, np.ndarray):
+            footprints = [footprints]
+
+        self.footprints = [
+            np.asarray(_f, dtype=np.float64)[:, :, 0:2] for _f in footprints
+        ]
+
+        self.spacing = spacing
+        self.tolerance = tolerance
+        self.outer = np.zeros((0, 2))
+        self.holes = []
+        self.left = np.zeros((0, 2))
+        self.right = np.zeros((0, 2))
+
+        _pts = np.concatenate([_f.reshape(-1, 2) for _f in self.footprints])
+
+        #tolerance scaled to the extents of the geometry
+        self.epsilon = 1e-9 * max(float(np.abs(_pts).max()), 1.0) \
+            if len(_pts) else 1e-9
+
+    @staticmethod
+    def get_steps(footprints, spacing):
+        """
+        Return the step indices at which the footprint has moved at least
+        the spacing distance since the previous index
+        """
+
+        _count = len(footprints)
+
+        if _count < 3:
+            return np.arange(_count)
+
+        _moved = np.linalg.norm(np.diff(footprints, axis=0), axis=2).max(axis=1)
+        _dist = np.concatenate(([0.0], np.cumsum(_moved)))
+
+        #first step of each spacing interval, always keeping the last step
+        _bucket = np.floor(_dist / spacing)
+        _keep = np.concatenate(([True], _bucket[1:] != _bucket[:-1]))
+        _keep[-1] = True
+
+        return np.nonzero(_keep)[0]
+
+    @staticmethod
+    def get_hulls(points, epsilon):
+        """
+        Return the convex hull edges of each set of points in a (p, k, 2)
+        array as (p, k, 2) start / end arrays, with a (p, k) validity mask.
+        Edges are oriented counter-clockwise.
+        """
+
+        _p, _k = points.shape[0:2]
+
+        #mask points duplicating an earlier point in the same set
+        _same = np.abs(points[:, :, None, :] - points[:, None, :, :]).max(axis=3)
+        _same = _same <= epsilon
+        _dup = np.tril(_same, -1).any(axis=2)
+
+        #edge a -> b is a hull edge if no point lies to the right of it
+        #and collinear points lie between a and b
+        _ab = points[:, None, :, :] - points[:, :, None, :]
+        _ac = _ab
+
+        _cross = _ab[:, :, :, None, 0] * _ac[:, :, None, :, 1] \
+            - _ab[:, :, :, None, 1] * _ac[:, :, None, :, 0]
+
+        _len_sq = (_ab ** 2).sum(axis=3)
+
+        _dot = (_ab[:, :, :, None, :] * _ac[:, :, None, :, :]).sum(axis=4)
+        _t = _dot / np.where(_len_sq > 0.0, _len_sq, 1.0)[:, :, :, None]
+
+        _tol = epsilon * np.sqrt(_len_sq)[:, :, :, None]
+
+        _ok = (_cross > _tol) \
+            | ((np.abs(_cross) <= _tol) & (_t >= -1e-12) & (_t <= 1.0 + 1e-12))
+
+        #ignore duplicate points as tests
+        _ok |= _dup[:, None, None, :]
+
+        _edge = _ok.all(axis=3) & (_len_sq > epsilon ** 2)
+        _edge &= ~_dup[:, :, None] & ~_dup[:, None, :]
+
+        #each hull vertex has exactly one outgoing edge
+        _has = _edge.any(axis=2)
+        _next = _edge.argmax(axis=2)
+
+        _idx = np.arange(_p)[:, None]
+
+        return points, points[_idx, _next], _has
+
+    def get_pieces(self, footprints, tolerance):
+        """
+        Return a list of convex point sets covering the motion of the
+        (n, m, 2) footprints
+        """
+
+        _count = len(footprints)
+
+        if _count == 1:
+            return [footprints[0]]
+
+        _center = footprints.mean(axis=1)
+
+        #heading of the first footprint edge and the footprint size
+        _edge = footprints[:, 1] - footprints[:, 0]
+        _heading = np.unwrap(np.arctan2(_edge[:, 1], _edge[:, 0]))
+
+        _size = 2.0 * float(
+            np.linalg.norm(footprints[0] - _center[0], axis=1).max())
+
+        #turning this much or less moves a hull edge by the tolerance
+        _limit = 4.0 * tolerance / max(_size, self.epsilon)
+
+        _straight = np.abs(np.diff(_heading)) <= _limit
+
+        _pieces = []
+        _kept = np.zeros(_count, dtype=bool)
+
+        _i = 0
+
+        while _i < _count - 1:
+
+            if not _straight[_i]:
+
+                _kept[_i:_i + 2] = True
+                _pieces.extend(self._get_connectors(footprints[_i:_i + 2]))
+
+                _i += 1
+                continue
+
+            #extend the run while it stays straight
+            _j = _i + 1
+
+            while _j < _count - 1 and _straight[_j]:
+
+                _turn = np.abs(_heading[_i:_j + 2] - _heading[_i]).max()
+
+                _chord = _center[_j + 1] - _center[_i]
+                _rel = _center[_i:_j + 2] - _center[_i]
+
+                _offset = np.abs(_chord[0] * _rel[:, 1] - _chord[1] * _rel[:, 0])
+                _offset = _offset.max() / max(np.linalg.norm(_chord), self.epsilon)
+
+                if _turn > _limit or _offset > tolerance:
+                    break
+
+                _j += 1
+
+            _pieces.append(np.concatenate((footprints[_i], footprints[_j])))
+
+            _i = _j
+
+        _pieces.extend(footprints[_kept])
+
+        return _pieces
+
+    def _get_connectors(self, footprints):
+        """
+        Return hulls covering the track of each footprint vertex between
+        two steps, reaching into both footprints
+        """
+
+        _first, _second = footprints
+
+        _moved = float(np.linalg.norm(_second - _first, axis=1).max())
+
+        _inner = []
+
+        for _f in footprints:
+
+            _center = _f.mean(axis=0)
+            _vec = _center - _f
+            _len = np.linalg.norm(_vec, axis=1)
+
+            _scale = np.minimum(1.0, 4.0 * _moved / np.maximum(_len, self.epsilon))
+            _inner.append(_f + _vec * _scale[:, None])
+
+        return list(np.stack((_first, _second, _inner[1], _inner[0]), axis=1))
+
+    def build(self):
+        """
+        Build the envelope, returning the (left, right) boundary arrays
+        """
+
+        _pieces = []
+
+        for _fp in self.footprints:
+
+            _spacing = self.spacing
+            _tolerance = self.tolerance
+
+            if not _spacing:
+                _edges = np.linalg.norm(np.roll(_fp[0], -1, axis=0) - _fp[0], axis=1)
+                _spacing = max(float(_edges.min()) / 4.0, self.epsilon)
+
+            if not _tolerance:
+                _tolerance = 1e-3 * max(float(np.ptp(_fp[0], axis=0).max()), 1.0)
+
+            _steps = SweptEnvelope.get_steps(_fp, _spacing)
+
+            _pieces.extend(self.get_pieces(_fp[_steps], _tolerance))
+
+        #pad pieces to a common vertex count by repeating the first vertex
+        _size = max(len(_p) for _p in _pieces)
+
+        _pieces = np.stack([
+            np.concatenate((_p, np.repeat(_p[0:1], _size - len(_p), axis=0)))
+            for _p in _pieces
+        ])
+
+        _starts, _ends, _valid = SweptEnvelope.get_hulls(_pieces, self.epsilon)
+
+        _rings = self._trace_boundary(_starts, _ends, _valid)
+
+        if not _rings:
+            return self.left, self.right
+
+        _areas = [SweptEnvelope.get_area(_r) for _r in _rings]
+        _outer = int(np.argmax(_areas))
+
+        self.outer = _rings[_outer]
+        self.holes = [_r for _i, _r in enumerate(_rings) if _i != _outer]
+
+        self.left, self.right = self._split_sides(self.outer)
+
+        return self.left, self.right
+
+    @staticmethod
+    def get_area(ring):
+        """
+        Signed area of a closed ring of points (positive if ccw)
+        """
+
+        _x = ring[:, 0]
+        _y = ring[:, 1]
+
+        return 0.5 * float(np.dot(_x, np.roll(_y, -1)) - np.dot(np.roll(_x, -1), _y))
+
+    def _get_piece_pairs(self, starts, valid):
+        """
+        Return arrays of (i, j) indices of pieces with overlapping boxes
+        """
+
+        _pts = np.where(valid[:, :, None], starts, np.nan)
+
+        _boxes = np.stack((
+            np.nanmin(_pts[:, :, 0], axis=1), np.nanmax(_pts[:, :, 0], axis=1),
+            np.nanmin(_pts[:, :, 1], axis=1), np.nanmax(_pts[:, :, 1], axis=1)
+        ), axis=1)
+
+        _index = SegmentIndex()
+        _index.add_boxes(_boxes)
+
+        _i, _j = _index.query_pairs(_boxes)
+        _diff = _i != _j
+
+        return _i[_diff], _j[_diff]
+
+    def _trace_boundary(self, starts, ends, valid):
+        """
+        Find the boundary edges of the union of the hulls and chain them
+        into closed rings
+        """
+
+        _eps = self.epsilon
+        _count, _k = valid.shape
+
+        _pi, _pj = self._get_piece_pairs(starts, valid)
+
+        #test against the largest overlapping hulls first, as they cover
+        #the most points
+        _areas = SweptEnvelope.get_hull_areas(starts, ends, valid)
+        _sort = np.lexsort((-_areas[_pj], _pi))
+
+        _pi = _pi[_sort]
+        _pj = _pj[_sort]
+
+        _lines = SweptEnvelope.get_lines(starts, ends, valid)
+
+        #drop hull edges lying inside another hull.  The hulls are convex,
+        #so an edge is inside a hull if both of its end points are.
+        _owner = np.nonzero(valid)[0]
+        _e0 = starts[valid]
+        _e1 = ends[valid]
+
+        def _is_inner(items, hulls):
+
+            return (SweptEnvelope.get_distances(_e0[items], _lines, hulls) > _eps) \
+                & (SweptEnvelope.get_distances(_e1[items], _lines, hulls) > _eps)
+
+        _edges = valid.copy()
+        _edges[valid] = ~self._scan_pairs(_owner, _pi, _pj, _count, _is_inner)
+
+        #surviving edges of each hull
+        _edge_count = _edges.sum(axis=1)
+        _edge_start = np.cumsum(_edge_count) - _edge_count
+
+        _e0 = starts[_edges]
+        _e1 = ends[_edges]
+
+        #split parameters along each edge, beginning with the end points
+        _split_edge = [np.arange(len(_e0))] * 2
+        _split_t = [np.zeros(len(_e0)), np.ones(len(_e0))]
+
+        #every edge of hull i against every edge / vertex of hull j
+        _ni = _edge_count[_pi]
+        _nj = _edge_count[_pj]
+        _counts = _ni * _nj
+
+        _pair = np.repeat(np.arange(len(_pi)), _counts)
+        _local = np.arange(_counts.sum()) \
+            - np.repeat(np.cumsum(_counts) - _counts, _counts)
+
+        _ei = _edge_start[_pi][_pair] + _local // _nj[_pair]
+        _ej = _edge_start[_pj][_pair] + _local % _nj[_pair]
+
+        _int = LineSegment.intersect_arrays(
+            _e0[_ei], _e1[_ei], _e0[_ej], _e1[_ej], paired=True)
+
+        _split_edge.append(_ei[_int.hits])
+        _split_t.append(_int.u[_int.hits])
+
+        #vertices of hull j lying on the edges of hull i (overlaps)
+        _vec = _e1[_ei] - _e0[_ei]
+        _rel = _e0[_ej] - _e0[_ei]
+        _len_sq = (_vec ** 2).sum(axis=1)
+
+        _cross = _vec[:, 0] * _rel[:, 1] - _vec[:, 1] * _rel[:, 0]
+        _t = (_vec * _rel).sum(axis=1) / _len_sq
+
+        _on = (np.abs(_cross) <= _eps * np.sqrt(_len_sq)) & (_t > 0.0) & (_t < 1.0)
+
+        _split_edge.append(_ei[_on])
+        _split_t.append(_t[_on])
+
+        _split_edge = np.concatenate(_split_edge)
+        _split_t = np.clip(np.concatenate(_split_t), 0.0, 1.0)
+
+        _split = np.lexsort((_split_t, _split_edge))
+        _split_edge = _split_edge[_split]
+        _split_t = _split_t[_split]
+
+        #sub-edges between consecutive split parameters of the same edge
+        _same = (_split_edge[1:] == _split_edge[:-1]) \
+            & (_split_t[1:] - _split_t[:-1] > 1e-12)
+
+        _sub = _split_edge[:-1][_same]
+        _t0 = _split_t[:-1][_same]
+        _t1 = _split_t[1:][_same]
+
+        _vec = _e1 - _e0
+        _s0 = _e0[_sub] + _t0[:, None] * _vec[_sub]
+        _s1 = _e0[_sub] + _t1[:, None] * _vec[_sub]
+
+        #sub-edges covered by another hull, where points on the boundary
+        #of a lower-numbered hull are covered, so overlapping boundaries
+        #are kept only once
+        _mid = (_s0 + _s1) / 2.0
+        _sub_owner = np.nonzero(_edges)[0][_sub]
+
+        def _is_covered(items, hulls):
+
+            _dist = SweptEnvelope.get_distances(_mid[items], _lines, hulls)
+
+            return (_dist > _eps) \
+                | ((_dist >= -_eps) & (hulls < _sub_owner[items]))
+
+        _covered = self._scan_pairs(_sub_owner, _pi, _pj, _count, _is_covered)
+
+        return self._chain(_s0[~_covered], _s1[~_covered])
+
+    @staticmethod
+    def get_lines(starts, ends, valid):
+        """
+        Return the (nx, ny, c) unit normal line coefficients of the hull
+        edges, with the distance nx * x + ny * y + c positive inside.
+        Invalid edges never limit the distance.
+        """
+
+        _vec = ends - starts
+        _len = np.sqrt((_vec ** 2).sum(axis=2))
+        _len = np.where(valid & (_len > 0.0), _len, np.inf)
+
+        _nx = -_vec[..., 1] / _len
+        _ny = _vec[..., 0] / _len
+
+        _c = np.where(
+            np.isfinite(_len), -(_nx * starts[..., 0] + _ny * starts[..., 1]),
+            np.inf)
+
+        return _nx, _ny, _c
+
+    @staticmethod
+    def get_distances(points, lines, hulls):
+        """
+        Return the signed distance of each point inside the hull of the
+        same index in the hulls array
+        """
+
+        _nx, _ny, _c = [_v[hulls] for _v in lines]
+
+        return (points[:, 0:1] * _nx + points[:, 1:2] * _ny + _c).min(axis=1)
+
+    @staticmethod
+    def get_hull_areas(starts, ends, valid):
+        """
+        Return the area of each hull
+        """
+
+        _cross = starts[..., 0] * ends[..., 1] - starts[..., 1] * ends[..., 0]
+
+        return 0.5 * np.where(valid, _cross, 0.0).sum(axis=1)
+
+    def _scan_pairs(self, owners, pi, pj, count, test):
+        """
+        Test items against the hulls overlapping their owner hull, one
+        hull per round, until the test passes.  Returns a mask of the
+        items which passed.
+
+        owners - owner hull index of each item
+        pi, pj - overlapping hull pairs, grouped by pi
+        count - number of hulls
+        test - callable(items, hulls) returning a mask of passed items
+        """
+
+        _first = np.searchsorted(pi, np.arange(count), side='left')
+        _last = np.searchsorted(pi, np.arange(count), side='right')
+
+        _passed = np.zeros(len(owners), dtype=bool)
+
+        _items = np.arange(len(owners))
+        _next = _first[owners]
+
+        while True:
+
+            _more = _next < _last[owners[_items]]
+            _items = _items[_more]
+            _next = _next[_more]
+
+            if not len(_items):
+                break
+
+            _pass = test(_items, pj[_next])
+            _passed[_items[_pass]] = True
+
+            _items = _items[~_pass]
+            _next = _next[~_pass] + 1
+
+        return _passed
+
+    def _chain(self, starts, ends):
+        """
+        Chain directed boundary edges into closed rings of points
+        """
+
+        _scale = 1.0 / max(self.epsilon * 1e3, 1e-12)
+
+        _key = lambda _p: (int(round(_p[0] * _scale)), int(round(_p[1] * _scale)))
+
+        _starts = starts.tolist()
+        _ends = ends.tolist()
+
+        _outgoing = {}
+
+        for _i, _p in enumerate(_starts):
+            _outgoing.setdefault(_key(_p), []).append(_i)
+
+        _used = [False] * len(_starts)
+        _rings = []
+
+        def _get_next(point):
+            """
+            Return the next unused edge starting at the point, checking
+            neighbouring keys in case of rounding differences
+            """
+
+            _k = _key(point)
+
+            for _dx in (0, -1, 1):
+                for _dy in (0, -1, 1):
+
+                    for _n in _outgoing.get((_k[0] + _dx, _k[1] + _dy), ()):
+
+                        if not _used[_n]:
+                            return _n
+
+            return None
+
+        for _i in range(len(_starts)):
+
+            if _used[_i]:
+                continue
+
+            _ring = []
+            _cur = _i
+
+            while _cur is not None and not _used[_cur]:
+
+                _used[_cur] = True
+                _ring.append(_starts[_cur])
+
+                _cur = _get_next(_ends[_cur])
+
+            if len(_ring) > 2:
+                _rings.append(SweptEnvelope.simplify(np.array(_ring)))
+
+        return _rings
+
+    @staticmethod
+    def simplify(ring, epsilon=1e-9):
+        """
+        Remove collinear vertices from a closed ring
+        """
+
+        _prev = np.roll(ring, 1, axis=0)
+        _next = np.roll(ring, -1, axis=0)
+
+        _a = ring - _prev
+        _b = _next - ring
+
+        _cross = _a[:, 0] * _b[:, 1] - _a[:, 1] * _b[:, 0]
+        _scale = np.linalg.norm(_a, axis=1) * np.linalg.norm(_b, axis=1)
+
+        _keep = np.abs(_cross) > epsilon * np.maximum(_scale, 1e-300)
+
+        if _keep.sum() < 3:
+            return ring
+
+        return ring[_keep]
+
+    @staticmethod
+    def insert_nearest(ring, point):
+        """
+        Insert the point of a closed ring nearest to the given point as a
+        vertex, returning the new ring and the index of the vertex
+        """
+
+        _next = np.roll(ring, -1, axis=0)
+        _vec = _next - ring
+
+        _len_sq = (_vec ** 2).sum(axis=1)
+        _t = ((point - ring) * _vec).sum(axis=1) / np.where(_len_sq > 0.0, _len_sq, 1.0)
+        _t = np.clip(_t, 0.0, 1.0)
+
+        _near = ring + _t[:, None] * _vec
+        _i = int(np.argmin(np.linalg.norm(_near - point, axis=1)))
+
+        if _t[_i] <= 0.0:
+            return ring, _i
+
+        if _t[_i] >= 1.0:
+            return ring, (_i + 1) % len(ring)
+
+        return np.insert(ring, _i + 1, _near[_i], axis=0), _i + 1
+
+    def _split_sides(self, ring):
+        """
+        Split the outer ring into left and right envelopes, ordered in
+        the direction of travel
+        """
+
+        _first = np.concatenate([_f[0] for _f in self.footprints])
+        _last = np.concatenate([_f[-1] for _f in self.footprints])
+
+        _lead = self.footprints[0]
+
+        _dir = [
+            _lead[min(1, len(_lead) - 1)].mean(axis=0) - _lead[0].mean(axis=0),
+            _lead[-1].mean(axis=0) - _lead[max(len(_lead) - 2, 0)].mean(axis=0)
+        ]
+
+        _dir = [_d / max(np.linalg.norm(_d), 1e-300) for _d in _dir]
+
+        #anchor points behind the start and ahead of the end footprints
+        _size = max(np.ptp(_first, axis=0).max(), np.ptp(_last, axis=0).max())
+
+        _rear = _first.mean(axis=0) - _dir[0] * _size
+        _front = _last.mean(axis=0) + _dir[1] * _size
+
+        ring, _i = SweptEnvelope.insert_nearest(ring, _rear)
+        _ring, _j = SweptEnvelope.insert_nearest(ring, _front)
+
+        #keep the rear index if a vertex was inserted before it
+        if len(_ring) > len(ring) and _j <= _i:
+            _i += 1
+
+        #ccw from the rear to the front is the right side of travel
+        _j = (_j - _i) % len(_ring)
+        _ring = np.roll(_ring, -_i, axis=0)
+
+        _right = _ring[:_j + 1]
+        _left = np.concatenate((_ring[_j:], _ring[0:1]))[::-1]
+
+        return _left, _right
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Lazily loaded, cached vehicle template library
+"""
+
+import inspect
+import json
+import os
+import time
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from .cache import get_cache_dir, get_cache_name, get_file_hash, get_file_stamp
+
+class TemplateLibrary(Mapping):
+    """
+    Mapping of vehicle template symbols to compiled templates.
+
+    Template files are read on first access.  Compiled templates are
+    stored in an .npz cache holding their arrays and a JSON manifest of
+    their other fields, which is reused while the file modification time
+    and size are unchanged, or while its contents hash is unchanged.
+    Later sources override templates of the same symbol in earlier ones.
+    Templates which fail to compile are skipped and listed in errors.
+    """
+
+    #cache format version, combined with the compiler source hash
+    format_version = 2
+
+    #file system timestamp resolution, in nanoseconds
+    stamp_resolution = 2000000000
+
+    def __init__(self, sources=None, compiler=None):
+        """
+        Constructor
+
+        sources - list of template json file names
+        compiler - callable returning the compiled form of a template dict
+        """
+
+        self.sources = list(sources or [])
+        self.compiler = compiler
+        self.templates = None
+
+        #messages of the templates skipped in the last load
+        self.errors = []
+
+        #cache directory, located on first load if None
+        self.cache_dir = None
+
+    def __getitem__(self, key):
+        """
+        Return the compiled template of a symbol
+        """
+
+        return self.load()[key]
+
+    def __iter__(self):
+        """
+        Iterate template symbols
+        """
+
+        return iter(self.load())
+
+    def __len__(self):
+        """
+        Number of templates
+        """
+
+        return len(self.load())
+
+    def add_source(self, file_name):
+        """
+        Add a template file, loaded on the next access
+        """
+
+        self.sources.append(os.path.abspath(file_name))
+        self.templates = None
+
+    def reload(self):
+        """
+        Discard the loaded templates, re-reading them on the next access
+        """
+
+        self.templates = None
+
+    def load(self):
+        """
+        Load the templates of all sources, if not already loaded
+        """
+
+        if self.templates is None:
+
+            _templates = {}
+            _version = self.get_version()
+
+            self.errors = []
+
+            for _f in self.sources:
+                _templates.update(self.load_source(_f, _version))
+
+            self.templates = _templates
+
+        return self.templates
+
+    def get_version(self):
+        """
+        Return the cache version, a hash of the cache format and of the
+        source file of the compiler, so cached templates are recompiled
+        whenever the compiler changes.  Returns None if the compiler source
+        cannot be found, in which case the cache is not used.
+        """
+
+        _key = str(TemplateLibrary.format_version)
+
+        if self.compiler:
+
+            try:
+                _file = inspect.getsourcefile(self.compiler)
+
+            except TypeError:
+                _file = None
+
+            if not _file or not os.path.exists(_file):
+                return None
+
+            _key += get_file_hash(_file)
+
+        return get_cache_name(_key, '')
+
+    def load_source(self, file_name, version=None):
+        """
+        Return the compiled templates of a file, from the cache if valid
+        """
+
+        _cache = self.get_cache_file(file_name) if version else None
+        _stamp = list(get_file_stamp(file_name))
+        _data = self.read_cache(_cache, file_name, version)
+
+        #a file modified within the timestamp resolution of the last check
+        #may have changed without changing its stamp, so it is hashed
+        if _data and _data['stamp'] == _stamp \
+            and _stamp[0] < _data.get('checked', 0) - TemplateLibrary.stamp_resolution:
+
+            self.errors.extend(_data['errors'])
+
+            return _data['templates']
+
+        _hash = get_file_hash(file_name)
+
+        #touched, but unchanged
+        if _data and _data['hash'] == _hash:
+            _templates, _errors = _data['templates'], _data['errors']
+
+        else:
+            _templates, _errors = self.compile_source(file_name)
+
+        self.errors.extend(_errors)
+
+        self.write_cache(_cache, {
+            'version': version, 'source': file_name, 'stamp': _stamp,
+            'hash': _hash, 'checked': time.time_ns(), 'errors': _errors,
+            'templates': _templates
+        })
+
+        return _templates
+
+    def compile_source(self, file_name):
+        """
+        Read and compile the templates of a json file, returning the
+        compiled templates and a list of messages for those skipped
+        """
+
+        with open(file_name, 'r') as _fp:
+            _db = json.load(_fp)['vehicles']
+
+        _templates = {}
+        _errors = []
+
+        for _i, _veh in enumerate(_db):
+
+            _key = _veh.get('Symbol') if isinstance(_veh, dict) else None
+
+            if isinstance(_key, list):
+                _key = _key[0] if _key else None
+
+            if not isinstance(_key, str):
+
+                _errors.append('{}: template {} has no symbol'.format(
+                    file_name, _i + 1))
+
+                continue
+
+            if self.compiler:
+
+                try:
+                    _veh = self.compiler(_veh)
+
+                except (ValueError, KeyError, TypeError, ZeroDivisionError) as _e:
+
+                    _errors.append('{}: {}'.format(file_name, _e))
+                    continue
+
+            _templates[_key] = _veh
+
+        return _templates, _errors
+
+    def get_cache_file(self, file_name):
+        """
+        Return the cache file name of a template file, or None if there
+        is no cache directory
+        """
+
+        if not self.cache_dir:
+            self.cache_dir = get_cache_dir('templates')
+
+        if not self.cache_dir:
+            return None
+
+        return os.path.join(self.cache_dir, get_cache_name(file_name, '.npz'))
+
+    @staticmethod
+    def read_cache(cache_file, file_name, version):
+        """
+        Return the cached data for a template file, or None if missing,
+        unreadable or of another version or source.  Only arrays and JSON
+        are read, so a cache file cannot run code.
+        """
+
+        if not cache_file or not os.path.exists(cache_file):
+            return None
+
+        try:
+            with np.load(cache_file, allow_pickle=False) as _npz:
+
+                _data = json.loads(_npz['manifest'].tobytes().decode('utf-8'))
+
+                if not isinstance(_data, dict) \
+                    or _data.get('version') != version \
+                    or _data.get('source') != file_name:
+
+                    return None
+
+                for _k, _fields in _data.pop('arrays').items():
+
+                    for _f in _fields:
+                        _data['templates'][_k][_f] = _npz['{}/{}'.format(_k, _f)]
+
+        except (OSError, EOFError, KeyError, AttributeError, TypeError,
+                ValueError):
+
+            return None
+
+        return _data
+
+    @staticmethod
+    def write_cache(cache_file, data):
+        """
+        Write the cached data of a template file, with the array fields of
+        the templates in the .npz file and the rest in its JSON manifest.
+        Failures are ignored, as the cache is only an optimization.
+        """
+
+        if not cache_file:
+            return
+
+        _manifest = dict(data, templates={}, arrays={})
+        _arrays = {}
+
+        for _k, _t in data['templates'].items():
+
+            _manifest['templates'][_k] = {
+                _f: _v for _f, _v in _t.items() if not isinstance(_v, np.ndarray)
+            }
+
+            _fields = [_f for _f, _v in _t.items() if isinstance(_v, np.ndarray)]
+
+            for _f in _fields:
+                _arrays['{}/{}'.format(_k, _f)] = _t[_f]
+
+            if _fields:
+                _manifest['arrays'][_k] = _fields
+
+        _temp = cache_file + '.{}.tmp'.format(os.getpid())
+
+        try:
+            _json = json.dumps(_manifest).encode('utf-8')
+
+            with open(_temp, 'wb') as _fp:
+                np.savez(_fp, manifest=np.frombuffer(_json, dtype=np.uint8),
+                         **_arrays)
+
+            os.replace(_temp, cache_file)
+
+        except (OSError, TypeError, ValueError):
+
+            if os.path.exists(_temp):
+                os.remove(_temp)
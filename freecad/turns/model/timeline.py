@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Precomputed analysis timeline
+"""
+
+import numpy as np
+
+class Timeline():
+    """
+    Random-access timeline of an analysis.
+
+    Indexes the solved kinematics of every vehicle and towed unit, and
+    precomputes the world coordinates of tracked vehicle points at every
+    step, so any step and the envelope tracks up to it are array lookups.
+    """
+
+    def __init__(self, vehicles, store=None):
+        """
+        Constructor
+
+        vehicles - list of lead Vehicle model objects with solved paths
+        store - ResultStore to hold the tracks, instead of memory (optional)
+        """
+
+        self.vehicles = [_v for _v in vehicles if _v.kinematics]
+
+        #solved kinematics of each unit, keyed to the unit vehicle
+        self.units = {}
+
+        for _v in self.vehicles:
+            for _k in [_v.kinematics] + _v.kinematics.trailers:
+                self.units[_k.vehicle] = _k
+
+        self.count = min(
+            (_v.kinematics.count for _v in self.vehicles), default=0)
+
+        #(n, m, 3) track coordinates, and the vehicle-relative points they
+        #track, keyed to the unit vehicle
+        self.tracks = {}
+        self.track_points = {}
+
+        #(n, m, 2) body footprints, keyed to the unit vehicle
+        self.footprints = {}
+
+        #result store and the store unit of each vehicle with tracks
+        self.store = store
+        self.store_units = {}
+
+        if store is not None:
+            store.clear()
+
+    def get_unit(self, vehicle):
+        """
+        Return the solved kinematics of a vehicle or towed unit
+        """
+
+        return self.units.get(vehicle)
+
+    def add_tracks(self, vehicle, points):
+        """
+        Precompute the world coordinates of vehicle-relative points at
+        every step, returning an (n, m, 3) array.  With a result store,
+        the tracks are written to it and a view of the store is returned.
+        """
+
+        _kinematics = self.get_unit(vehicle)
+
+        if not _kinematics or not len(points):
+            return None
+
+        #tracks of the same points already added by another tracker of
+        #the vehicle
+        _key = tuple(tuple(float(_c) for _c in _p[0:2]) for _p in points)
+
+        if vehicle in self.tracks and self.track_points[vehicle] == _key:
+            return self.tracks[vehicle]
+
+        self.track_points[vehicle] = _key
+
+        if self.store is not None:
+            return self.add_store_tracks(vehicle, points)
+
+        _xy = _kinematics.transform(points)
+
+        _tracks = np.zeros(_xy.shape[0:2] + (3,))
+        _tracks[:, :, 0:2] = _xy
+
+        self.tracks[vehicle] = _tracks
+
+        return _tracks
+
+    def add_store_tracks(self, vehicle, points):
+        """
+        Write the state and tracks of a vehicle to the result store,
+        returning an (n, m, 3) view of the stored tracks
+        """
+
+        _body = [tuple(_p[0:2]) for _p in vehicle.points]
+
+        #the footprint is stored if the tracks begin with the body points
+        _footprint = len(_body) \
+            if [tuple(_p[0:2]) for _p in points[0:len(_body)]] == _body else 0
+
+        _unit = self.store.add_unit(vehicle.name, len(points), _footprint)
+
+        self.store.write_kinematics(_unit, self.get_unit(vehicle), points)
+        self.store_units[vehicle] = _unit
+
+        self.tracks[vehicle] = self.store.get_tracks(_unit, 0, self.count)
+
+        return self.tracks[vehicle]
+
+    def get_footprint(self, vehicle):
+        """
+        Return the (n, m, 2) body footprints of a unit at every step, as a
+        view of the result store if stored, or computed on first use
+        """
+
+        _unit = self.store_units.get(vehicle)
+
+        if _unit is not None and self.store.units[_unit]['footprint']:
+            return self.store.get_footprints(_unit, 0, self.count)
+
+        if vehicle not in self.footprints:
+
+            self.footprints[vehicle] = \
+                self.units[vehicle].transform(vehicle.points)[:self.count]
+
+        return self.footprints[vehicle]
+
+    def get_footprints(self):
+        """
+        Return the (n, m, 2) body footprints of every unit at every step
+        """
+
+        return [self.get_footprint(_v) for _v in self.units]
+
+    def get_tracks(self, vehicle, step):
+        """
+        Return the track coordinates of a vehicle from the first step up
+        to and including the step
+        """
+
+        _tracks = self.tracks.get(vehicle)
+
+        if _tracks is None:
+            return None
+
+        return _tracks[:step + 1]
+
+    def finish(self):
+        """
+        Cleanup
+        """
+
+        self.vehicles = []
+        self.units = {}
+        self.tracks = {}
+        self.track_points = {}
+        self.footprints = {}
+        self.store_units = {}
+        self.store = None
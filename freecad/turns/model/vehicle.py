@@ -24,13 +24,19 @@ Vehicle model object
 """
 
 import math
-import json
 import os
 
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import numpy as np
+
 from freecad_python_support.tuple_math import TupleMath
 
 from .axis import Axis
 from .body import Body
+from .kinematics import Kinematics
+from .template_library import TemplateLibrary
 from .wheel import Wheel
 
 class Vehicle(Body):
@@ -38,37 +44,91 @@ class Vehicle(Body):
     Vehicle model object
     """
 
-    #static dictionary of pre-defined vehicle templates
-    templates = {}
+    #static library of pre-defined vehicle templates, loaded on first access
+    templates = None
+
+    #fields required of every template, and optional fields defaulting to 0
+    required_fields = ('Type', 'Symbol', 'Width', 'Length', 'Front', 'Rear',
+                       'WB1', 'Minimum Radius')
+
+    optional_fields = ('WB2', 'WB3', 'WB4', 'S', 'T', 'Kingpin')
 
     @staticmethod
     def populate_templates():
         """
-        Static method to populate the vehicle templates dict from json
+        Static method to load the vehicle templates
         """
 
-        if Vehicle.templates:
-            return
+        Vehicle.templates.load()
+
+    @staticmethod
+    def add_template_library(file_name):
+        """
+        Add a user / agency template file to the template library.  Its
+        templates are loaded on first access.
+        """
+
+        Vehicle.templates.add_source(file_name)
+
+    @staticmethod
+    def compile_template(template):
+        """
+        Validate a template and precompute the lead unit axle positions,
+        wheelbase and maximum steering angle, and the towed units
+        """
+
+        _t = dict(template)
+        _symbol = _t.get('Symbol')
+
+        for _k in Vehicle.required_fields:
+
+            if _k not in _t:
+                raise ValueError(
+                    'Template "{}" missing field "{}"'.format(_symbol, _k))
 
-        _fp = os.path.abspath(os.path.dirname(__file__))\
-            + '/vehicle_templates.json'
+        for _k in Vehicle.optional_fields:
+            _t.setdefault(_k, 0)
 
-        _db = json.load(open(_fp, 'r'))['vehicles']
+        for _k in Vehicle.required_fields[2:] + Vehicle.optional_fields:
 
-        for _veh in _db:
+            if not isinstance(_t[_k], (int, float)):
+                raise ValueError(
+                    'Template "{}" field "{}" is not a number'.format(_symbol, _k))
 
-            _key = _veh['Symbol']
+        if _t['Minimum Radius'] <= 0.0:
+            raise ValueError(
+                'Template "{}" minimum radius must be positive'.format(_symbol))
 
-            if isinstance(_key, list):
-                _key = _key[0]
+        _trailers = Vehicle.get_trailer_dimensions(_t)
 
-            Vehicle.templates[_key] = _veh
+        #the templates give no rear overhang for the lead vehicle of an
+        #articulated template, which ends at a tongue hitch behind its rear
+        #axle, or under the front overhang of a semitrailer
+        _length = _t['Length']
+        _front = _t['Length'] / 2.0 - _t['Front']
+        _back = -(_t['Length'] / 2.0 - _t['Rear'])
 
+        if _trailers:
+
+            _length = _t['Front'] + _t['WB1'] \
+                + max(_trailers[0][0], _trailers[0][2])
+            _front = _length / 2.0 - _t['Front']
+            _back = _front - _t['WB1']
+
+        _t['Lead Length'] = _length
+        #(displacement, is fixed) of each axle
+        _t['Axles'] = np.array([[_front, 0.0], [_back, 1.0]])
+        _t['Wheelbase'] = abs(_front - _back)
+        _t['Maximum Angle'] = math.atan(_t['Wheelbase'] / _t['Minimum Radius'])
+        _t['Trailers'] = np.array(_trailers, dtype=float).reshape(-1, 4)
+
+        return _t
 
     @staticmethod
     def from_template(symbol, name=None):
         """
-        Create a new vehicle object from a template
+        Create a new vehicle object from a template, with its chain of
+        towed units
         """
 
         assert (symbol in Vehicle.templates),\
@@ -79,20 +139,96 @@ class Vehicle(Body):
         if not name:
             name = _t['Type']
 
-        _vehicle = Vehicle(name, [_t['Length'], _t['Width']])
+        _vehicle = Vehicle(name, [_t['Lead Length'], _t['Width']])
 
         _axle_length = _t['Width'] - 1.0
-        _axle_positions = [
-            _t['Length']/2.0 - _t['Front'],
-            -1 * (_t['Length']/2.0 - _t['Rear'])
-        ]
 
-        _vehicle.add_axle(_axle_positions[0], _axle_length, False)
-        _vehicle.add_axle(_axle_positions[1], _axle_length, True)
-        _vehicle.set_minimum_radius(_t['Minimum Radius'])
+        for _displacement, _is_fixed in _t['Axles'].tolist():
+            _vehicle.add_axle(_displacement, _axle_length, bool(_is_fixed))
+
+        _vehicle.set_maximum_angle(_t['Maximum Angle'])
+
+        _lead = _vehicle
+
+        for _i, (_offset, _distance, _front, _rear) in enumerate(_t['Trailers'].tolist()):
+
+            _trailer = Vehicle.build_trailer(
+                '{} {}'.format(name, _i + 1), _t['Width'], _distance, _front,
+                _rear)
+
+            _lead.add_trailer(_trailer, _offset)
+            _lead = _trailer
 
         return _vehicle
 
+    @staticmethod
+    def get_trailer_dimensions(template):
+        """
+        Return the towed units of a template as a list of
+        (pivot offset, hitch distance, front overhang, rear overhang)
+        tuples, in towing order.  The pivot offset is measured back from
+        the rear axle of the towing unit.
+        """
+
+        _t = template
+        _result = []
+
+        #tractor / semitrailer, kingpin over the tractor rear axle.  The
+        #kingpin dimension is measured from the front of the semitrailer to
+        #its rear axle, so the front overhang is its excess over the
+        #wheelbase.
+        if _t['Kingpin'] and _t['WB2']:
+
+            _setback = max(_t['Kingpin'] - _t['WB2'], 0.0)
+
+            _result.append([0.0, _t['WB2'], _setback])
+
+            #additional trailers on converter dollies hitched behind the
+            #previous trailer axle
+            for _wb in (_t['WB3'], _t['WB4']):
+
+                if not _wb:
+                    break
+
+                _result.append([_t['S'], _t['T'], 0.0])
+                _result.append([0.0, _wb, _setback])
+
+        #trailer towed by a tongue hitched behind the lead vehicle rear axle
+        elif _t['T']:
+            _result.append([_t['S'], _t['T'], 0.0])
+
+        #each unit ends at the next hitch, the last at the rear overhang
+        for _i, _r in enumerate(_result):
+
+            _rear = _t['Rear']
+
+            if _i < len(_result) - 1:
+                _rear = _result[_i + 1][0]
+
+            _result[_i] = tuple(_r) + (_rear,)
+
+        return _result
+
+    @staticmethod
+    def build_trailer(name, width, distance, front, rear):
+        """
+        Create a towed unit with a single fixed axle
+
+        width - unit width
+        distance - distance from the hitch point to the axle
+        front - body length ahead of the hitch point
+        rear - body length behind the axle
+        """
+
+        _trailer = Vehicle(name, [front + distance + rear, width])
+
+        _trailer.hitch = _trailer.dimensions[0] / 2.0 - front
+        _trailer.hitch_distance = distance
+
+        _trailer.add_axle(_trailer.hitch - distance, width - 1.0, True)
+
+        return _trailer
+
     class Axle(Axis):
 
         def __init__(self, axis, length, displacement, is_fixed):
@@ -147,10 +283,35 @@ class Vehicle(Body):
         self.pivot_offset_sq = 0.0
         self.lead_vehicle = None
 
+        #towed units, and the hitch point / hitch-to-axle distance of
+        #this vehicle if it is towed
+        self.trailers = []
+        self.hitch = 0.0
+        self.hitch_distance = 0.0
+
+        #body center position at the current step
+        self.position = None
+
         self.path = None
+        self.kinematics = None
         self.step = 0
         self.angle = 0.0
 
+        #off-tracking method and integration sub-steps per path segment
+        self.tracking = Kinematics.TRACTRIX
+        self.substeps = 1
+
+        #least-recently used cache of the steering state, keyed to the
+        #steering angle quantized to the angle resolution (radians).  Cached
+        #states are solved at the quantized angle, so are within half the
+        #resolution of the requested angle.  Angles smaller than the
+        #resolution are solved exactly and not cached.
+        self.state_cache = OrderedDict()
+        self.cache_size = 1024
+        self.angle_resolution = 1e-4
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def set_lead_vehicle(self, vehicle):
         """
         Set the vehicle's lead vehicle if it is being towed
@@ -158,6 +319,30 @@ class Vehicle(Body):
 
         self.lead_vehicle = vehicle
 
+    def add_trailer(self, trailer, pivot_offset=0.0):
+        """
+        Add a towed unit, hitched at the pivot offset distance behind the
+        rear axle of this vehicle
+        """
+
+        trailer.set_lead_vehicle(self)
+        trailer.pivot_offset = pivot_offset
+        trailer.pivot_offset_sq = pivot_offset * pivot_offset
+
+        self.trailers.append(trailer)
+
+    def get_units(self):
+        """
+        Return this vehicle and all of its towed units in towing order
+        """
+
+        _units = [self]
+
+        for _t in self.trailers:
+            _units += _t.get_units()
+
+        return _units
+
     def add_axle(self, displacement, length, is_fixed=True):
         """
         Add an axle.
@@ -181,6 +366,9 @@ class Vehicle(Body):
 
         self.axle_distance = abs(_max_dist - _min_dist)
 
+        #cached steering states depend on the axle geometry
+        self.clear_cache()
+
         #reference the turning axle and the farthest-back fixed axle
         if not is_fixed:
             self.turn_axle = _axle
@@ -211,6 +399,10 @@ class Vehicle(Body):
 
         self.path = path
         self.step = 0
+
+        #solve the vehicle state for the entire path at once
+        self.kinematics = Kinematics(self, path, self.tracking, self.substeps)
+
         self.set_step(0, True)
 
     def set_step(self, step, force_refresh=False):
@@ -229,22 +421,8 @@ class Vehicle(Body):
         if self.step == step and not force_refresh:
             return
 
-        self.orientation = \
-            -TupleMath.bearing(
-                self.path.segments[step].vector, (1.0, 0.0, 0.0)
-            )
-
-        _ori = \
-            -TupleMath.signed_bearing(
-                self.path.segments[step].vector, (1.0, 0.0, 0.0)
-            )
-
-        if self.step < _num_segs:
-
-            _angle = self.path.segments[step].angle
-
-            if _angle:
-                self.update(_angle)
+        #the state of every step is pre-computed by the kinematics solver
+        self.kinematics.apply(step)
 
         self.step = step
 
@@ -255,9 +433,157 @@ class Vehicle(Body):
 
         return self.step >= len(self.path.segments) - 1
 
-    def update(self, angle):
+    def clear_cache(self):
         """
-        Update the vehicle position using the given steering angle (radians)
+        Clear the steering state cache and its statistics
+        """
+
+        self.state_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def get_cache_info(self):
+        """
+        Return the steering state cache statistics
+        """
+
+        return SimpleNamespace(
+            hits=self.cache_hits, misses=self.cache_misses,
+            size=len(self.state_cache), maximum=self.cache_size
+        )
+
+    def get_steering_state(self, angle):
+        """
+        Return the (radius, center, wheel angles) steering state for the
+        angle, solved at the angle rounded to the resolution and cached,
+        so the state steers within half the resolution of the angle
+        """
+
+        _key = round(angle / self.angle_resolution)
+
+        if not _key:
+            return self.solve_steering(angle)
+
+        _state = self.state_cache.get(_key)
+
+        if _state is not None:
+
+            self.cache_hits += 1
+            self.state_cache.move_to_end(_key)
+
+            return _state
+
+        self.cache_misses += 1
+
+        _state = self.solve_steering(_key * self.angle_resolution)
+        self.state_cache[_key] = _state
+
+        if len(self.state_cache) > self.cache_size:
+            self.state_cache.popitem(last=False)
+
+        return _state
+
+    def get_steering_states(self, angles):
+        """
+        Return the radii, rotation centers and wheel angles of an (n,)
+        array of steering angles as (n,), (n, 2) and (n, k) arrays, solved
+        at the angles rounded to the resolution as get_steering_state()
+        """
+
+        _count = len(angles)
+        _wheel_count = 2 * sum(1 for _a in self.axles if not _a.is_fixed)
+
+        _radius = np.empty(_count)
+        _center = np.empty((_count, 2))
+        _wheels = np.empty((_count, _wheel_count))
+
+        _keys = np.round(angles / self.angle_resolution).astype(np.int64)
+        _small = _keys == 0
+
+        if _small.any():
+            _radius[_small], _center[_small], _wheels[_small] = \
+                self.solve_steering_array(angles[_small])
+
+        _cached = ~_small
+
+        #solve each distinct quantized angle once, scattering the states
+        #back to the steps sharing it
+        _unique, _inverse = np.unique(_keys[_cached], return_inverse=True)
+
+        _states = [self.state_cache.get(_k) for _k in _unique.tolist()]
+        _missing = [_i for _i, _s in enumerate(_states) if _s is None]
+
+        self.cache_hits += len(_states) - len(_missing)
+        self.cache_misses += len(_missing)
+
+        for _k, _s in zip(_unique.tolist(), _states):
+
+            if _s is not None:
+                self.state_cache.move_to_end(_k)
+
+        if _missing:
+
+            _solved = self.solve_steering_array(
+                _unique[_missing] * self.angle_resolution)
+
+            for _j, _i in enumerate(_missing):
+
+                _states[_i] = (
+                    float(_solved[0][_j]), tuple(_solved[1][_j].tolist()),
+                    tuple(_solved[2][_j].tolist())
+                )
+
+                self.state_cache[int(_unique[_i])] = _states[_i]
+
+            while len(self.state_cache) > self.cache_size:
+                self.state_cache.popitem(last=False)
+
+        if _states:
+
+            _radius[_cached] = np.array([_s[0] for _s in _states])[_inverse]
+            _center[_cached] = np.array(
+                [_s[1] for _s in _states]).reshape(-1, 2)[_inverse]
+            _wheels[_cached] = np.array(
+                [_s[2] for _s in _states]).reshape(-1, _wheel_count)[_inverse]
+
+        return _radius, _center, _wheels
+
+    def solve_steering_array(self, angles):
+        """
+        Return the radii, rotation centers and wheel angles of an (n,)
+        array of non-zero steering angles (radians), as solve_steering
+        """
+
+        #rotation center lies on the rear axle line, offset by the radius
+        _back_axle = self.axles[self.axle_dists.index(min(self.axle_dists))]
+        _back_center = np.array(_back_axle.center[0:2])
+        _back_vector = np.array(_back_axle.ortho(True)[0:2])
+
+        _radius = self.axle_distance / np.tan(angles)
+        _center = _back_center - _radius[:, None] * _back_vector
+
+        #wheel angles, left wheel first for each turning axle
+        _wheels = []
+
+        for _axle in self.axles:
+
+            if _axle.is_fixed:
+                continue
+
+            _half = _axle.length / 2.0
+
+            _wheels.append(np.arctan(self.axle_distance / (_radius + _half)))
+            _wheels.append(np.arctan(self.axle_distance / (_radius - _half)))
+
+        _wheels = np.stack(_wheels, axis=1) if _wheels \
+            else np.zeros((len(angles), 0))
+
+        return _radius, _center, _wheels
+
+    def solve_steering(self, angle):
+        """
+        Return the (radius, center, wheel angles) steering state for the
+        given steering angle (radians)
         """
 
         # The angle subtended by the radius of the arc on which the front and
@@ -270,18 +596,8 @@ class Vehicle(Body):
         # the radius, offset by half the vehicle width.
         #
         # The arc direction is -cw / +ccw
-        #
-        # If the vehicle is towed (self.lead_vehicle is not None), angle is
-        # ignored and calculations are performed using the lead vehicle
-        # turning radius.
 
-        _half_pi = math.pi / 2.0
-
-        if abs(angle) > self.maximum_angle:
-            return False
-
-        self.axis.angle = angle
-        self.radius = self.axle_distance / math.tan(angle)
+        _radius = self.axle_distance / math.tan(angle)
 
         #sign of angle to add / subtract from central steering angle.
         #relative to ccw-oriented (left-hand) wheel
@@ -297,12 +613,14 @@ class Vehicle(Body):
         #get the unit orthogonal of the back axle axis
         _back_vector = self.axles[_back_axle].ortho(_sign > 0.0)
 
-        self.center = TupleMath.add(
+        _center = TupleMath.add(
             _back_center,
-            TupleMath.scale(_back_vector, self.radius * -_sign)
+            TupleMath.scale(_back_vector, _radius * -_sign)
         )
 
         #iterate each wheel pair.  Left wheel is first in pair
+        _wheels = []
+
         for _axle in self.axles:
 
             if _axle.is_fixed:
@@ -312,12 +630,42 @@ class Vehicle(Body):
             #added to the central steering angle
 
             _wheel_angles = (
-                _sign * self.axle_distance / (self.radius + _axle.length/2.0),
-                _sign * self.axle_distance / (self.radius - _axle.length/2.0)
+                _sign * self.axle_distance / (_radius + _axle.length/2.0),
+                _sign * self.axle_distance / (_radius - _axle.length/2.0)
             )
 
-            _axle.wheels[0].angle = math.atan(_wheel_angles[0])
-            _axle.wheels[1].angle = math.atan(_wheel_angles[1])
+            _wheels += [math.atan(_wheel_angles[0]), math.atan(_wheel_angles[1])]
+
+        return (_radius, _center, tuple(_wheels))
+
+    def update(self, angle):
+        """
+        Update the vehicle position using the given steering angle (radians)
+        """
+
+        # If the vehicle is towed (self.lead_vehicle is not None), angle is
+        # ignored and calculations are performed using the lead vehicle
+        # turning radius.
+        #
+        # The steering state of each angle is cached, as paths repeat the
+        # same angles over constant-radius arcs
+
+        if abs(angle) > self.maximum_angle:
+            return False
+
+        self.axis.angle = angle
+        self.radius, self.center, _wheels = self.get_steering_state(angle)
+
+        _i = 0
+
+        for _axle in self.axles:
+
+            if _axle.is_fixed:
+                continue
+
+            _axle.wheels[0].angle = _wheels[_i]
+            _axle.wheels[1].angle = _wheels[_i + 1]
+            _i += 2
 
         self.angle = angle
 
@@ -331,11 +679,21 @@ class Vehicle(Body):
         for _a in self.axles:
             _a.finish()
 
+        for _t in self.trailers:
+            _t.finish()
+
+        if self.kinematics:
+            self.kinematics.finish()
+            self.kinematics = None
+
         super().finish()
 
-#populate Vhecile.templates when module is first loaded
-if not Vehicle.templates:
-    Vehicle.populate_templates()
+#the default template library is read on first access, not at import
+Vehicle.templates = TemplateLibrary(
+    [os.path.join(os.path.abspath(os.path.dirname(__file__)),
+                  'vehicle_templates.json')],
+    Vehicle.compile_template
+)
 
 # INPUTS
 #
@@ -81,6 +81,7 @@ class AnalysisTask(BaseTask):
             'width_edit': ('', None, self.to_width_edit),
             'cur_angle_edit': ('', None, self.to_cur_angle),
             'cur_radius_edit': ('', None, self.to_cur_radius),
+            'fps_label': ('', None, self.to_fps),
 
             'back_button': ('clicked', self.fr_step_back, None),
             'play_button': ('clicked', self.fr_play, None),
@@ -107,6 +108,9 @@ class AnalysisTask(BaseTask):
         self.tracker.to_step = self.to_cur_step
         self.tracker.to_radius = self.to_cur_radius
         self.tracker.to_angle = self.to_cur_angle
+        self.tracker.to_fps = self.to_fps
+        self.tracker.to_clearance = self.to_clearance
+        self.tracker.to_conflicts = self.to_conflicts
 
         #button references
         _play = self.widgets.play_button
@@ -138,6 +142,10 @@ class AnalysisTask(BaseTask):
         for _k, _v in Vehicle.templates.items():
             self.widgets.type_combo.addItem('{} ({})'.format(_k, _v['Type']))
 
+        #report the templates skipped for errors
+        for _e in Vehicle.templates.errors:
+            App.Console.PrintWarning('Vehicle template skipped: {}\n'.format(_e))
+
         self.widgets.type_combo.setCurrentIndex(0)
 
     def fr_loop_checkbox(self, value):
@@ -205,6 +213,66 @@ class AnalysisTask(BaseTask):
 
         self.tracker.set_path(_sketch.Geometry)
 
+        #the other sketches in the document are treated as obstacles
+        _obstacles = {}
+
+        for _o in App.ActiveDocument.Objects:
+
+            if _o is _sketch or not _o.isDerivedFrom('Sketcher::SketchObject'):
+                continue
+
+            _obstacles[_o.Name] = [
+                _g for _i, _g in enumerate(_o.Geometry)
+                if not _o.getConstruction(_i)
+            ]
+
+        self.tracker.set_obstacles(_obstacles)
+
+    def to_clearance(self, value):
+        """
+        Callback for obstacle clearance update
+        """
+
+        if not value or not value.report:
+            return
+
+        #the report lists every encroaching part at every step, summarized
+        #by obstacle edge: first / last step, the encroaching parts and the
+        #minimum clearance
+        _summary = {}
+
+        for _v in value.report:
+
+            _key = (_v['Source'], _v['Obstacle'])
+            _s = _summary.setdefault(_key, [_v['Step'], _v['Step'], _v, set()])
+
+            _s[1] = _v['Step']
+            _s[3].add((_v['Unit'], _v['Part']))
+
+            if _v['Clearance'] < _s[2]['Clearance']:
+                _s[2] = _v
+
+        App.Console.PrintWarning(
+            '{} obstacle edges encroached\n'.format(len(_summary)))
+
+        for _k, _v in _summary.items():
+
+            App.Console.PrintWarning(
+                '  {} edge {}: steps {} - {}, {} parts, {} part {} at {:.3f}\n'
+                .format(_k[0], _k[1], _v[0], _v[1], len(_v[3]), _v[2]['Unit'],
+                        _v[2]['Part'], _v[2]['Clearance']))
+
+    def to_conflicts(self, value):
+        """
+        Callback for encroachments found during animation
+        """
+
+        for _v in value:
+
+            App.Console.PrintWarning(
+                'Step {Step}: {Unit} part {Part} encroaches on {Source} '
+                'edge {Obstacle} ({Clearance:.3f})\n'.format(**_v))
+
     def to_cur_angle(self, value):
         """
         Callback for vehicle steering angle update
@@ -212,6 +280,15 @@ class AnalysisTask(BaseTask):
 
         self.widgets.cur_angle_edit.setText('{:12.2f}'.format(value))
 
+    def to_fps(self, value):
+        """
+        Callback for animation frame rate statistics
+        """
+
+        self.widgets.fps_label.setText(
+            '{:.1f} / {:.1f} fps, {} steps skipped'.format(
+                value.achieved_fps, value.target_fps, value.skipped))
+
     def to_cur_radius(self, value):
         """
         Callback for vehicle radius
@@ -150,6 +150,10 @@ class VehicleTemplateTask(BaseTask):
         for _k, _v in Vehicle.templates.items():
             self.widgets.type_combo.addItem('{} ({})'.format(_k, _v['Type']))
 
+        #report the templates skipped for errors
+        for _e in Vehicle.templates.errors:
+            App.Console.PrintWarning('Vehicle template skipped: {}\n'.format(_e))
+
         self.widgets.type_combo.setCurrentIndex(0)
 
     def fr_edit_vehicle_type(self, value):
@@ -24,6 +24,8 @@
 Analysis Tracker class
 """
 
+import tempfile
+
 from types import SimpleNamespace
 
 import FreeCADGui as Gui
@@ -36,12 +38,17 @@ from ..core.tracker.context_tracker import ContextTracker
 from ..core.tracker.line_tracker import LineTracker
 
 from ...model.analyzer import Analyzer
+from ...model.cache import get_cache_dir
 from ...model.vehicle import Vehicle
 from ...model.path import Path
+from ...model.refinement import StepRefinement
+from ...model.result_store import ResultStore
 
+from .animation_scheduler import AnimationScheduler
+from .frame_transaction import FrameTransactions
 from .vehicle_tracker import VehicleTracker
 
-class AnalysisTracker(ContextTracker, Timer):
+class AnalysisTracker(ContextTracker, Timer, FrameTransactions):
     """
     Analysis Tracker class
     """
@@ -64,7 +71,18 @@ class AnalysisTracker(ContextTracker, Timer):
             view=Gui.ActiveDocument.ActiveView
         )
 
+        #name of the analysis session in the Analyzer registry
+        self.session = 'default'
+
         self.steps = 100
+        self.spacing = None
+
+        #path step count above which the precomputed tracks are held in a
+        #memory-mapped result store instead of memory, or None for never
+        self.store_steps = 100000
+
+        self.tolerance = None
+        self.adaptive = None
         self.vehicles = []
         self.envelopes = {}
         self.path = None
@@ -75,6 +93,17 @@ class AnalysisTracker(ContextTracker, Timer):
         self.to_width = lambda x: print('to_width')
         self.to_radius = lambda x: print('to_radius')
         self.to_angle = lambda x: print('to_angle')
+        self.to_fps = lambda x: None
+        self.to_clearance = lambda x: print('to_clearance')
+        self.to_conflicts = lambda x: print('to_conflicts')
+
+        #last step checked for conflicts during animation, and the
+        #(unit, source, obstacle) encroachments active at that step
+        self.checked_step = -1
+        self.conflicts = set()
+
+        #maps elapsed time to path steps, skipping frames as needed
+        self.scheduler = AnimationScheduler()
 
         #create analysis model / engine
         self.analyzer = self.build_analyzer()
@@ -95,14 +124,37 @@ class AnalysisTracker(ContextTracker, Timer):
 
     def build_analyzer(self):
         """
-        Create analyzer for vehicle
+        Get the default analysis session for the GUI
         """
 
-        _analyzer = Analyzer()
+        _analyzer = Analyzer.get_session(self.session)
         _analyzer.set_step(0, True)
 
         return _analyzer
 
+    def update_store(self, steps):
+        """
+        Hold the precomputed tracks of a path with more than store_steps
+        steps in a memory-mapped result store, so long paths do not grow
+        memory use.  Each store has a directory of its own.
+        """
+
+        _large = self.store_steps is not None and steps > self.store_steps
+
+        if _large == (self.analyzer.store is not None):
+            return
+
+        _store = None
+        _dir = get_cache_dir('results') if _large else None
+
+        if _dir:
+            _store = ResultStore(tempfile.mkdtemp(prefix='session_', dir=_dir))
+
+        if self.analyzer.store is not None:
+            self.analyzer.store.finish(remove=True)
+
+        self.analyzer.set_store(_store)
+
     def on_insert(self):
         """
         Override of base function
@@ -135,11 +187,24 @@ class AnalysisTracker(ContextTracker, Timer):
         _model = Vehicle.from_template(vehicle_symbol)
         self.analyzer.set_vehicle(_model)
 
-        #create amd add the vehicle tracker data to the tracker list
-        _tracker = VehicleTracker(
-            name=_model.name, data=_model, parent=self.base)
+        #create amd add the vehicle tracker data to the tracker list,
+        #including trackers for each towed unit
+        for _unit in _model.get_units():
+
+            _tracker = VehicleTracker(
+                name=_unit.name, data=_unit, parent=self.base)
+
+            self.vehicles.append(_tracker)
+
+        self.set_timelines()
 
-        self.vehicles.append(_tracker)
+    def set_timelines(self):
+        """
+        Set the analysis timeline of each vehicle tracker
+        """
+
+        for _v in self.vehicles:
+            _v.set_timeline(self.analyzer.timeline)
 
     def start_animation(self):
         """
@@ -151,6 +216,7 @@ class AnalysisTracker(ContextTracker, Timer):
 
         self.reset_animation()
         self.start_timer('analysis_animator')
+        self.scheduler.start(self.analyzer.cur_step)
 
     def pause_animation(self):
         """
@@ -158,6 +224,7 @@ class AnalysisTracker(ContextTracker, Timer):
         """
 
         self.stop_timer('analysis_animator')
+        self.scheduler.pause()
 
     def stop_animation(self):
         """
@@ -165,6 +232,7 @@ class AnalysisTracker(ContextTracker, Timer):
         """
 
         self.stop_timer('analysis_animator')
+        self.scheduler.pause()
 
         _result = None
 
@@ -172,7 +240,10 @@ class AnalysisTracker(ContextTracker, Timer):
             _result  = _v.envelope.get_envelope(self.path)
             break
 
-        _c = [_v[0] for _v in _result[0]] + [_v[0] for _v in _result[1]]
+        if not _result:
+            return
+
+        _c = [tuple(_v) for _v in _result[0]] + [tuple(_v) for _v in _result[1]]
         _g = [len(_result[0]), len(_result[1])]
 
         self.tracker.set_style(Styles.ERROR)
@@ -188,7 +259,11 @@ class AnalysisTracker(ContextTracker, Timer):
         for _v in self.vehicles:
             _v.envelope.reset()
 
+        self.checked_step = -1
+        self.conflicts = set()
+
         self.set_step(0)
+        self.scheduler.start(0)
 
         if not self.tracker:
             todo.delay(self.build_envelope_tracker, None)
@@ -199,10 +274,14 @@ class AnalysisTracker(ContextTracker, Timer):
 
     def set_animation_speed(self, value):
         """
-        Set the animation speed in frames per second
+        Set the animation speed in path steps per second.  Frames are
+        skipped if rendering cannot keep up.
         """
 
-        self.set_timer_interval('analysis_animator', 1.0 / float(value))
+        self.scheduler.set_rate(float(value))
+
+        self.set_timer_interval(
+            'analysis_animator', self.scheduler.get_frame_interval())
 
     def set_animation_loop(self, value):
         """
@@ -226,19 +305,69 @@ class AnalysisTracker(ContextTracker, Timer):
 
                 self.reset_animation()
 
-        self.analyzer.step()
+        if not self.analyzer.vehicles:
+            return
+
+        _last = min(len(_v.path.segments) - 1 for _v in self.analyzer.vehicles)
+        _frame = self.scheduler.next_frame(_last)
+
+        if not _frame:
+            return
+
+        #skipped steps are not rendered, but the envelope tracks are shown
+        #up to the current step from the timeline
+        self.analyzer.set_step(_frame[1])
         self.refresh()
+        self.check_conflicts(self.analyzer.cur_step)
         self.to_step(self.analyzer.cur_step)
+        self.to_fps(self.scheduler.get_stats())
         self.to_radius(self.analyzer.vehicles[0].radius)
         self.to_angle(self.analyzer.vehicles[0].angle)
 
+    def check_conflicts(self, step):
+        """
+        Check the slivers swept since the last checked step against the
+        obstacles, and report encroachments as they begin
+        """
+
+        if step <= self.checked_step:
+            return
+
+        _result = self.analyzer.check_steps(self.checked_step, step)
+        self.checked_step = step
+
+        if not _result:
+            return
+
+        _events = []
+        _active = set()
+
+        for _v in _result.report:
+
+            _key = (_v['Unit'], _v['Source'], _v['Obstacle'])
+
+            #encroachments continuing from the previous check are skipped
+            if _key not in self.conflicts and _key not in _active:
+                _events.append(_v)
+
+            if _v['Step'] == step:
+                _active.add(_key)
+
+        self.conflicts = _active
+
+        if _events:
+            self.to_conflicts(_events)
+
     def refresh(self):
         """
-        Refresh the vehicles in the tracker based on state changes
+        Refresh the vehicles in the tracker based on state changes, with
+        a single scenegraph notification for the frame
         """
 
-        for _v  in self.vehicles:
-            _v.refresh()
+        with self.frame():
+
+            for _v  in self.vehicles:
+                _v.refresh()
 
     def set_max_steps(self, steps):
         """
@@ -247,19 +376,56 @@ class AnalysisTracker(ContextTracker, Timer):
 
         self.steps = steps
 
+    def set_spacing(self, spacing, tolerance=None):
+        """
+        Set the arc-length spacing and chord error tolerance for path
+        discretization.  A spacing of None discretizes by steps.
+        """
+
+        self.spacing = spacing
+        self.tolerance = tolerance
+
+    def set_adaptive(self, tolerance):
+        """
+        Enable adaptive path refinement, refining the path until the
+        envelope converges to the tolerance.  A tolerance of None
+        discretizes by steps / spacing.
+        """
+
+        self.adaptive = tolerance
+
+    def set_obstacles(self, sources, clearance=0.0):
+        """
+        Set the obstacle geometry, as a dictionary of edge lists keyed to
+        their source names, and check the vehicles for encroachment
+        """
+
+        self.analyzer.set_obstacles(sources, clearance)
+        self.to_clearance(self.analyzer.clearance)
+
     def set_step(self, step):
         """
-        Set the current path step for the analyzer
+        Set the current path step for the analyzer.  Every step is
+        precomputed, so any step is shown immediately with its envelope.
         """
 
+        _timeline = self.analyzer.timeline
+
+        if _timeline and _timeline.count:
+            step = min(max(step, 0), _timeline.count - 1)
+
         self.analyzer.set_step(step)
+        self.refresh()
+        self.to_step(self.analyzer.cur_step)
 
     def move_step(self, step):
         """
         Move the specified number of steps from the current step
         """
 
-        self.analyzer.set_step(self.analyzer.step + step)
+        self.analyzer.move_steps(step)
+        self.refresh()
+        self.to_step(self.analyzer.cur_step)
 
     def set_path(self, geometry):
         """
@@ -269,8 +435,35 @@ class AnalysisTracker(ContextTracker, Timer):
         if self.is_inserted:
             self.reset_animation()
 
-        self.path = Path(geometry, self.steps)
+        _params = (self.steps, self.spacing, self.tolerance)
+
+        #refine the path until the envelope of the first vehicle converges
+        if self.adaptive and self.analyzer.vehicles:
+
+            _refinement = StepRefinement(
+                self.analyzer.vehicles[0], geometry, self.adaptive,
+                spacing=self.spacing
+            )
+
+            _refinement.run()
+            self.path = _refinement.path
+
+        #re-use the existing path to re-discretize only the changed edges
+        elif self.path and \
+            (self.path.steps, self.path.spacing, self.path.tolerance) == _params:
+
+            self.path.update(geometry)
+
+        else:
+            self.path = Path(
+                geometry, self.steps, spacing=self.spacing,
+                tolerance=self.tolerance
+            )
+
+        #attach the store first, so the timeline is built once, on the new path
+        self.update_store(len(self.path.segments))
         self.analyzer.set_path(self.path)
+        self.set_timelines()
 
         for _v in self.vehicles:
             _v.refresh()
@@ -282,7 +475,13 @@ class AnalysisTracker(ContextTracker, Timer):
         """
 
         if self.analyzer:
-            self.analyzer.finish()
+
+            if self.analyzer.store is not None:
+                self.analyzer.store.finish(remove=True)
+
+            #finishes the session and releases it from the registry
+            Analyzer.remove_session(self.session)
+            self.analyzer = None
 
         for _v in self.vehicles:
             _v.finish()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Time-based animation scheduler
+"""
+
+import time
+
+from types import SimpleNamespace
+
+class AnimationScheduler():
+    """
+    Maps wall-clock time to a path step at a fixed playback rate.
+
+    Each frame advances to the step due at the current time, so playback
+    speed is independent of rendering time.  When rendering falls behind,
+    the intermediate steps are skipped and reported.
+    """
+
+    def __init__(self, rate=1.0, max_fps=60.0, clock=time.perf_counter):
+        """
+        Constructor
+
+        rate - playback rate in steps per second
+        max_fps - maximum frame rate, above which steps are skipped
+        clock - callable returning the time in seconds
+        """
+
+        self.rate = rate
+        self.max_fps = max_fps
+        self.clock = clock
+
+        #time and step at which playback started, None if paused
+        self.origin = None
+        self.origin_step = 0
+        self.step = 0
+
+        #frame statistics
+        self.frames = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+        self.started = None
+
+    def start(self, step=0):
+        """
+        Start playback at the step, resetting the frame statistics
+        """
+
+        self.frames = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+
+        self.resume(step)
+
+    def resume(self, step=None):
+        """
+        Resume playback at the step, or the last scheduled step
+        """
+
+        if step is not None:
+            self.step = step
+
+        self.origin = self.clock()
+        self.origin_step = self.step
+        self.started = self.origin
+
+    def pause(self):
+        """
+        Pause playback, keeping the current step
+        """
+
+        if self.origin is None:
+            return
+
+        self.elapsed += self.clock() - self.started
+        self.origin = None
+
+    def set_rate(self, rate):
+        """
+        Change the playback rate, continuing from the current step
+        """
+
+        if self.origin is not None:
+            self.origin_step = self.get_step()
+            self.origin = self.clock()
+
+        self.rate = rate
+
+    def get_frame_interval(self):
+        """
+        Return the target time between frames in seconds
+        """
+
+        return 1.0 / min(self.rate, self.max_fps)
+
+    def get_step(self):
+        """
+        Return the step due at the current time
+        """
+
+        if self.origin is None:
+            return self.step
+
+        #tolerance against round-off at exact step times
+        return self.origin_step \
+            + int((self.clock() - self.origin) * self.rate + 1e-9)
+
+    def next_frame(self, last_step=None):
+        """
+        Advance to the step due at the current time, clamped to the last
+        step.  Returns the range of steps skipped since the previous
+        frame and the new step, or None if no step is due.
+        """
+
+        _step = self.get_step()
+
+        if last_step is not None:
+            _step = min(_step, last_step)
+
+        if _step <= self.step:
+            return None
+
+        _skipped = range(self.step + 1, _step)
+
+        self.step = _step
+        self.frames += 1
+        self.skipped += len(_skipped)
+
+        return _skipped, _step
+
+    def get_stats(self):
+        """
+        Return the target and achieved frame rates, and the number of
+        frames rendered and steps skipped
+        """
+
+        _elapsed = self.elapsed
+
+        if self.origin is not None:
+            _elapsed += self.clock() - self.started
+
+        return SimpleNamespace(
+            target_fps=min(self.rate, self.max_fps),
+            achieved_fps=self.frames / _elapsed if _elapsed > 0.0 else 0.0,
+            frames=self.frames,
+            skipped=self.skipped
+        )
@@ -26,6 +26,8 @@ Envelope Tracker class
 
 from types import SimpleNamespace
 
+import numpy as np
+
 from ..core.coin.coin_styles import CoinStyles as Styles
 
 from ..core.trait.base import Base
@@ -33,6 +35,10 @@ from ..core.tracker.polyline_tracker import PolyLineTracker
 
 from ..core.support.core.tuple_math import TupleMath
 from ...model.line_segment import LineSegment
+from ...model.kinematics import Kinematics
+from ...model.swept_envelope import SweptEnvelope
+
+from .track_buffer import TrackBuffer
 
 class EnvelopeTracker(Base):
 
@@ -61,8 +67,16 @@ class EnvelopeTracker(Base):
 
         self.points = self.get_track_points()
         self.transforms = self.get_track_transforms()
-        print('envelope points:', self.points)
         self.trackers = self.generate_trackers()
+
+        #coordinate buffers for each track, holding the precomputed
+        #track points of every step once a timeline is set
+        self.buffers = [TrackBuffer([_p]) for _p in self.points]
+        self.timeline = None
+
+        for _b in self.buffers:
+            _b.flush()
+
         self.body_start = data.center + (0.0,)
 
         self.set_visibility()
@@ -72,7 +86,8 @@ class EnvelopeTracker(Base):
         Get the track points for the envelope tracks
         """
 
-        _points = self.data.points
+        #a copy, as the vehicle points are its body footprint
+        _points = list(self.data.points)
 
         for _a in self.data.axles:
 
@@ -85,7 +100,7 @@ class EnvelopeTracker(Base):
                 if (abs(_u[1]) > abs(_t[1])):
                     _v = _u
 
-                _points += (_v,)
+                _points.append(_v)
 
         _points = tuple([_v + (0.0,) if len(_v) == 2 else _v for _v in _points])
 
@@ -117,49 +132,88 @@ class EnvelopeTracker(Base):
 
         return _r
 
-    def refresh(self, position):
+    def set_timeline(self, timeline):
         """
-        Update the polylines, appending new track points
+        Load the precomputed tracks of the vehicle from the timeline
         """
 
-        #print('\n\t>>>>>>> {} REFRESH <<<<<<<\n'.format(self.name))
-        _path_delta = TupleMath.subtract(self.body_start, self.data.center)
-        _orientation = self.data.orientation
+        self.timeline = timeline
 
-        #transform the points by biulding a matrix combining the orientation and
-        #the translation append transformed points to the individual trackers
+        _tracks = None
 
-        for _i, _t in enumerate(self.trackers):
-            #print('\n\t-=-=-=-=-=-=-=',self.name, position, _t.points)
+        if timeline:
+            _tracks = timeline.add_tracks(
+                self.data, [_p[0:2] for _p in self.points])
 
-            _pts = tuple(_t.points) + (TupleMath.add(_t.points[0], position),)
-            _t.update(coordinates=_pts)
+        if _tracks is None:
+            return
 
-    def reset(self):
+        for _i, _b in enumerate(self.buffers):
+            _b.set_data(_tracks[:, _i], 1)
+
+    def refresh(self, step):
         """
-        Reset the envelope tracker coordinates
+        Update the polylines to show the tracks up to the step
+        """
+
+        for _t, _b in zip(self.trackers, self.buffers):
+
+            _b.seek(step + 1)
+            self.push_track(_t, _b)
+
+    @staticmethod
+    def push_track(tracker, buffer):
         """
+        Push a track buffer to the tracker coordinate node, truncating
+        the node or writing only the new vertex range
+        """
+
+        _point = tracker.coordinate.point
+
+        if _point.getNum() > len(buffer):
+            _point.setNum(len(buffer))
 
-        return
+        _start, _pts = buffer.get_pending()
 
-        #_tracks = self.tracks.inner\
-        #        + self.tracks.outer_left + self.tracks.outer_right
+        if not len(_pts):
+            return
 
-        #if not _tracks:
-        #    return
+        _point.setValues(_start, len(_pts), _pts.tolist())
+        buffer.flush()
+
+    def reset(self):
+        """
+        Reset the envelope tracker coordinates
+        """
 
-        #for _i, _t in enumerate(_tracks):
-        #    _t[0].reset()
+        #truncate each track to its starting point
+        self.refresh(0)
 
     def get_envelope(self, path):
         """
-        Return the outer envelope
+        Return the outer envelope as (left, right) arrays of 3D points,
+        ordered in the direction of travel
         """
 
-        return None
+        _kinematics = self.data.kinematics
+
+        if not _kinematics or _kinematics.count != len(path.segments):
+            _kinematics = Kinematics(
+                self.data, path, self.data.tracking, self.data.substeps)
+
+        #footprints of the vehicle and each towed unit, read from the
+        #timeline (and its result store) when it holds this solution
+        _units = [_kinematics] + _kinematics.trailers
+
+        if self.timeline and self.timeline.get_unit(self.data) is _kinematics:
+            _footprints = [self.timeline.get_footprint(_k.vehicle) for _k in _units]
+
+        else:
+            _footprints = _kinematics.transform_units()
 
-        print('getting envelope for path', path.points, path.segments)
-        _x = self._build_envelope_segments(path)
-        _b = self._build_outer_envelope(_x)
+        _envelope = SweptEnvelope(_footprints)
+        _left, _right = _envelope.build()
 
-        return _b        
\ No newline at end of file
+        return tuple(
+            np.column_stack((_v, np.zeros(len(_v)))) for _v in (_left, _right)
+        )
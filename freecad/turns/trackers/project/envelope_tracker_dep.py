@@ -26,6 +26,8 @@ Envelope Tracker class
 
 from types import SimpleNamespace
 
+import numpy as np
+
 from ..core.coin.coin_styles import CoinStyles as Styles
 
 from ..core.trait.base import Base
@@ -33,6 +35,7 @@ from ..core.tracker.line_tracker import LineTracker
 
 from ..core.support.core.tuple_math import TupleMath
 from ...model.line_segment import LineSegment
+from ...model.segment_index import SegmentIndex
 
 class EnvelopeTracker(Base):
 
@@ -197,7 +200,7 @@ class EnvelopeTracker(Base):
                         for _i in range(0, len(_points)-1)
                 ]
 
-                _seg_group.append([_segments, 0, len(_segments)])
+                _seg_group.append([_segments, 0, SegmentIndex(_segments)])
 
             print('\n\tSEGMENT GROUP', [str(_s) for _s in _segments])
             _tracks.append(_seg_group)
@@ -211,65 +214,46 @@ class EnvelopeTracker(Base):
             for _j, _t in enumerate(_s):
                 _result[-1].append([])
 
-        #step along the path, building the individual orthos and the
-        #track segments that are on the left and right sides of each section
-        for _i, _seg in enumerate(path.segments):
+        #build the left and right orthos of every path segment at once
+        _cols = path.get_columns()
+        _pos = _cols.position[:, 0:2]
+        _ortho = np.stack((-_cols.tangent[:, 1], _cols.tangent[:, 0]), axis=1)
 
-            _prev = path.segments[_i]
+        _o_ends = [_pos + 10.0 * _ortho, _pos - 10.0 * _ortho]
 
-            _lt = TupleMath.scale(TupleMath.ortho(_prev.tangent), 10)
+        #iterate left and right sides
+        for _j, _side in enumerate(_tracks[0:2]):
 
-            #tangent / orthogonal pair
-            _o_segs = [_lt, TupleMath.scale(_lt, -1.0)]
+            #iterate each track on the side
+            for _k, _track in enumerate(_side):
 
-            #calculate end point for unit-length tangent and orthogonal
-            _o_segs = [TupleMath.add(_prev.position, _v) for _v in _o_segs]
-            _o_segs = [LineSegment(_prev.position, _v) for _v in _o_segs]
+                #intersect all orthos with the track segments in one pass,
+                #grouping the hits by path segment, in track order
+                _hits = _track[2].crossing_pairs(_pos, _o_ends[_j])
 
-            _pt = _prev.position
+                _bounds = np.searchsorted(
+                    _hits.query, np.arange(len(_pos) + 1)).tolist()
 
-            #iterate left and right sides
-            for _j, _side in enumerate(_tracks[0:2]):
+                _index = _hits.index.tolist()
+                _points = _hits.points.tolist()
 
-                #iterate each track on the side
-                for _k, _track in enumerate(_side):
+                #step along the path, continuing from the last matched
+                #segment or the one before it, in case of a 'close fail'
+                for _i, _seg in enumerate(path.segments):
 
+                    _pt = _seg.position
                     _pt_int = (_pt, 0.0)
 
-                    _segments = _track[0]
-
-                    #iterate each segment in the track
-                    for _l in range(_track[1], _track[2]):
-
-                        #pick the current segment from the track
-                        #and save it's manhattan distance from the path
-                        _seg = _segments[_l]
-
-                        _int = _o_segs[_j].is_intersecting(_seg)
-                        _dist = TupleMath.manhattan(_int[1], _pt)
-
-                        #if the segment intersects the orthogonal,
-                        #save the intersection constants and distance
-                        #and save the segment starting position
-                        if _int[0]:
-                            _pt_int = (_int[1], _dist)
-                            _track[1] = _l + 1
-                            break
-
-                        else:
+                    for _h in range(_bounds[_i], _bounds[_i + 1]):
 
-                            #test previous segment in case of a 'close fail'
-                            if _int[2][1] >= 0.0 or _l < 0:
-                                continue
+                        if _index[_h] < _track[1] - 1:
+                            continue
 
-                            _seg = _segments[_l - 1]
-                            _int = _o_segs[_j].is_intersecting(_seg)
-                            _dist = TupleMath.manhattan(_int[1], _pt)
+                        _int = tuple(_points[_h]) + (0.0,)
 
-                            if _int[0]:
-                                _pt_int = (_int[1], _dist)
-                                _track[1] = _l + 1
-                                break
+                        _pt_int = (_int, TupleMath.manhattan(_int, _pt))
+                        _track[1] = _index[_h] + 1
+                        break
 
                     #save the intersection data
                     _result[_j][_k].append(_pt_int)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Batched scenegraph updates
+"""
+
+class FrameTransaction():
+    """
+    Context manager which suspends coin notification on a set of nodes
+    while a frame is updated, then notifies each node once.
+
+    Field changes below a node with notification disabled do not
+    propagate past it, so the scenegraph redraws once per frame rather
+    than once per changed field.  Transactions nest: the previous
+    notification state is restored on exit, and only nodes which were
+    notifying before the transaction are touched.
+    """
+
+    def __init__(self, *nodes):
+        """
+        Constructor
+
+        nodes - the coin nodes to batch updates for
+        """
+
+        self.nodes = [_n for _n in nodes if _n is not None]
+        self.states = []
+
+    def __enter__(self):
+        """
+        Suspend notification
+        """
+
+        self.states = [_n.enableNotify(False) for _n in self.nodes]
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Restore notification and notify the outermost nodes once
+        """
+
+        for _n, _s in zip(self.nodes, self.states):
+            _n.enableNotify(_s)
+
+        for _n, _s in zip(self.nodes, self.states):
+
+            if _s:
+                _n.touch()
+
+        self.states = []
+
+        return False
+
+class FrameTransactions():
+    """
+    Tracker mixin providing a frame transaction on the tracker root node
+    """
+
+    def frame(self):
+        """
+        Return a transaction batching the updates below the tracker root
+        """
+
+        return FrameTransaction(self.root)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Coordinate buffer for precomputed polyline tracks
+"""
+
+import numpy as np
+
+class TrackBuffer():
+    """
+    Read-only view of an (n, 3) array of precomputed track points, of
+    which a leading range is visible.
+
+    The buffer tracks which points have not yet been pushed to the
+    scenegraph, so each frame only transfers the new vertex range.
+    """
+
+    def __init__(self, points=None):
+        """
+        Constructor
+
+        points - initial list of visible points (optional)
+        """
+
+        self.data = np.zeros((0, 3))
+        self.count = 0
+
+        #number of points already pushed to the scenegraph
+        self.flushed = 0
+
+        if points is not None:
+            self.set_data(points, len(points))
+
+    def __len__(self):
+        """
+        Number of visible points in the buffer
+        """
+
+        return self.count
+
+    @property
+    def points(self):
+        """
+        View of the visible points
+        """
+
+        return self.data[:self.count]
+
+    def set_data(self, points, count=0):
+        """
+        Replace the buffer with a precomputed (n, 3) array of points, of
+        which the first count are visible.  The array is held as a
+        read-only view without copying, so it may be a view of a result
+        store.
+        """
+
+        self.data = np.asarray(points, dtype=np.float64).reshape(-1, 3).view()
+        self.data.flags.writeable = False
+
+        self.count = 0
+        self.flushed = 0
+
+        self.seek(count)
+
+    def seek(self, count):
+        """
+        Show the first count points of the buffer, keeping the points
+        beyond them for random access
+        """
+
+        self.count = min(max(count, 0), len(self.data))
+        self.flushed = min(self.flushed, self.count)
+
+    def get_pending(self):
+        """
+        Return the index of the first point not yet pushed to the
+        scenegraph and a view of the pending points
+        """
+
+        return self.flushed, self.data[self.flushed:self.count]
+
+    def flush(self):
+        """
+        Mark all points as pushed to the scenegraph
+        """
+
+        self.flushed = self.count
+
+    def reset(self, count=0):
+        """
+        Truncate the buffer to the first count points
+        """
+
+        self.seek(min(count, self.count))
@@ -30,8 +30,9 @@ from ..core.tracker.line_tracker import LineTracker
 from ..core.support.core.tuple_math import TupleMath
 
 from .envelope_tracker import EnvelopeTracker
+from .frame_transaction import FrameTransactions
 
-class VehicleTracker(GeometryTracker):
+class VehicleTracker(GeometryTracker, FrameTransactions):
     """
     Vehicle Tracker class
     """
@@ -149,6 +150,10 @@ class VehicleTracker(GeometryTracker):
         Refresh the radius tracker
         """
 
+        #towed units are not steered
+        if not self.vehicle.turn_axle:
+            return
+
         _wheels = self.vehicle.turn_axle.wheels
 
         _axle_centers = [
@@ -173,29 +178,39 @@ class VehicleTracker(GeometryTracker):
 
     def refresh(self):
         """
-        Refresh the vehicle geometry based on the data model
+        Refresh the vehicle geometry based on the data model, with a
+        single scenegraph notification for all changes
         """
 
-        if not self.vehicle.path:
+        if not self.vehicle.position:
             return
 
-        _pos = self.vehicle.path.segments[self.vehicle.step].position
+        _pos = self.vehicle.position + (0.0,)
 
-        self.base.set_translation(_pos)
-        self.base.set_rotation(self.vehicle.orientation)
+        with self.frame():
 
-        for _axle in self.vehicle.axles:
+            self.base.set_translation(_pos)
+            self.base.set_rotation(self.vehicle.orientation)
 
-            if _axle.is_fixed:
-                continue
+            for _axle in self.vehicle.axles:
 
-            for _wheel in _axle.wheels:
+                if _axle.is_fixed:
+                    continue
+
+                for _wheel in _axle.wheels:
 
-                _ctr = _wheel.center + (0.0,)
-                self.wheels[_wheel].geometry.set_rotation(_wheel.angle)
+                    _ctr = _wheel.center + (0.0,)
+                    self.wheels[_wheel].geometry.set_rotation(_wheel.angle)
+
+            self.refresh_radius()
+            self.envelope.refresh(self.vehicle.step)
+
+    def set_timeline(self, timeline):
+        """
+        Set the precomputed analysis timeline of the vehicle
+        """
 
-        self.refresh_radius()
-        self.envelope.refresh(_pos)
+        self.envelope.set_timeline(timeline)
 
     def finish(self):
         """
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Shared test fixtures
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+#geometry of a line into a quarter turn
+TURN = [('line', (-100.0, 0.0), (0.0, 0.0)),
+        ('arc', (0.0, 50.0), 50.0, -math.pi / 2.0, 0.0)]
+
+#body outline of the random walk footprints
+RECTANGLE = np.array([(2.0, 1.0), (-2.0, 1.0), (-2.0, -1.0), (2.0, -1.0)])
+
+@pytest.fixture
+def random_footprints():
+    """
+    Return a function returning (n, 4, 2) footprints of a rectangle along
+    a random walk
+    """
+
+    def get_footprints(count, seed=1):
+
+        _rng = np.random.default_rng(seed)
+
+        _angle = np.cumsum(_rng.normal(0.0, 0.1, count))
+        _center = np.cumsum(
+            0.5 * np.stack((np.cos(_angle), np.sin(_angle)), axis=1), axis=0)
+
+        _cos, _sin = np.cos(_angle)[:, None], np.sin(_angle)[:, None]
+
+        return np.stack((
+            _cos * RECTANGLE[:, 0] - _sin * RECTANGLE[:, 1],
+            _sin * RECTANGLE[:, 0] + _cos * RECTANGLE[:, 1]
+        ), axis=2) + _center[:, None]
+
+    return get_footprints
+
+@pytest.fixture
+def random_segments():
+    """
+    Return a function returning the (n, 2) start and end points of random
+    segments, starting uniformly between the low and high corners, with
+    normally distributed extents
+    """
+
+    def get_segments(count, seed=1, low=0.0, high=40.0, extent=3.0):
+
+        _rng = np.random.default_rng(seed)
+        _starts = _rng.uniform(low, high, (count, 2))
+
+        return _starts, _starts + _rng.normal(0.0, extent, (count, 2))
+
+    return get_segments
+
+@pytest.fixture
+def turn_path():
+    """
+    Return a function returning a columnar path of a line into a quarter
+    turn
+    """
+
+    pytest.importorskip('freecad_python_support')
+
+    from freecad.turns.model.geometry import get_edges
+    from freecad.turns.model.path import Path
+
+    def get_path(spacing=2.0, steps=100):
+
+        return Path(get_edges(TURN), steps, columnar=True, spacing=spacing)
+
+    return get_path
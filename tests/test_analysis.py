@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Headless analysis tests
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.analysis import run_analysis
+from freecad.turns.model.kinematics import Kinematics
+
+@pytest.mark.parametrize('tracking', [Kinematics.TRACTRIX, Kinematics.SNAP])
+def test_run_analysis(turn_path, tracking):
+    """
+    A semitrailer analysis of a line into a quarter turn solves every
+    step, off-tracks the trailer inside the turn and reports only the
+    obstacles the vehicle reaches
+    """
+
+    _path = turn_path(1.0)
+    _cols = _path.get_columns()
+
+    #an obstacle across the end of the turn, and one beyond it
+    _result = run_analysis(
+        'WB-67', _path, tracking=tracking,
+        obstacles=[('line', (40.0, 52.0), (60.0, 52.0)),
+                   ('line', (40.0, 80.0), (60.0, 80.0))])
+
+    _count = len(_path.segments)
+
+    assert _result.count == _count
+    assert _result.position.shape == (_count, 2)
+    assert _result.orientation.shape == (_count,)
+    assert len(_result.units) == 1
+
+    if tracking == Kinematics.SNAP:
+
+        assert np.allclose(_result.position, _cols.position[:, 0:2])
+        assert np.allclose(
+            _result.orientation,
+            np.arctan2(_cols.vector[:, 1], _cols.vector[:, 0]))
+
+    #the trailer heading lags the lead heading through the left turn
+    _trailer = _result.units[0]
+
+    assert _trailer.position.shape == (_count, 2)
+    assert np.allclose(_trailer.orientation[0:10], 0.0)
+    assert np.all(_trailer.orientation <= _result.orientation + 1e-9)
+    assert 0.0 < _trailer.orientation[-1] < _result.orientation[-1]
+
+    assert len(_result.left) and len(_result.right)
+
+    #only the front of the lead unit reaches the first obstacle
+    _conflicts = _result.clearance.conflicts
+
+    assert len(_conflicts.step)
+    assert np.all(_conflicts.unit == 0)
+    assert np.all(_conflicts.obstacle == 0)
+    assert np.all(_conflicts.step > _count - 20)
+
+def test_no_envelope(turn_path):
+    """
+    An analysis without an envelope or obstacles returns only the state
+    """
+
+    _result = run_analysis('P', turn_path(), envelope=False)
+
+    assert _result.count == len(turn_path().segments)
+    assert _result.left is None and _result.right is None
+    assert _result.clearance is None
+    assert not _result.units
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Analysis session tests
+"""
+
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model import analyzer
+from freecad.turns.model.analyzer import Analyzer
+from freecad.turns.model.result_store import ResultStore
+from freecad.turns.model.vehicle import Vehicle
+
+def test_store_on_path(turn_path, tmp_path, monkeypatch):
+    """
+    Setting a store only attaches it, and the timeline is built once,
+    on the new path, when the path is set
+    """
+
+    _built = []
+
+    class _Timeline(analyzer.Timeline):
+        """
+        Timeline recording the path of the vehicles it is built on
+        """
+
+        def __init__(self, vehicles, store=None):
+            """
+            Constructor
+            """
+
+            _built.append((vehicles[0].path, store))
+            super().__init__(vehicles, store)
+
+    monkeypatch.setattr(analyzer, 'Timeline', _Timeline)
+
+    _analyzer = Analyzer()
+    _analyzer.add_vehicle(Vehicle.from_template('P'))
+    _analyzer.set_path(turn_path())
+
+    _store = ResultStore(str(tmp_path))
+    _path = turn_path(1.0)
+
+    del _built[:]
+
+    _analyzer.set_store(_store)
+
+    assert not _built
+
+    _analyzer.set_path(_path)
+
+    assert _built == [(_path, _store)]
+    assert _analyzer.timeline.store is _store
+
+    _analyzer.finish()
+    _store.finish(remove=True)
+
+def test_sessions(turn_path):
+    """
+    Named sessions with different paths do not share state, and removing
+    a session finishes it and releases it from the registry
+    """
+
+    _a = Analyzer.get_session('test_a')
+    _b = Analyzer.get_session('test_b')
+
+    assert _a is not _b
+    assert Analyzer.get_session('test_a') is _a
+
+    _a.add_vehicle(Vehicle.from_template('P'))
+    _b.add_vehicle(Vehicle.from_template('P'))
+
+    _a.set_path(turn_path(2.0))
+    _b.set_path(turn_path(1.0))
+
+    assert _a.vehicles[0] is not _b.vehicles[0]
+    assert _a.timeline is not _b.timeline
+
+    _count = len(_b.path.segments)
+
+    assert len(_a.path.segments) < _count
+
+    _a.move_steps(10)
+
+    assert _a.cur_step == _a.vehicles[0].step == 10
+    assert _b.cur_step == _b.vehicles[0].step == 0
+
+    Analyzer.remove_session('test_a')
+
+    assert 'test_a' not in Analyzer.sessions
+    assert not _a.vehicles and _a.timeline is None
+
+    assert Analyzer.get_session('test_b') is _b
+    assert len(_b.path.segments) == _count
+    assert _b.timeline is not None
+
+    Analyzer.remove_session('test_b')
+
+    assert 'test_b' not in Analyzer.sessions
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Animation scheduler tests
+"""
+
+import pytest
+
+from freecad.turns.trackers.project.animation_scheduler import \
+    AnimationScheduler
+
+class Clock():
+    """
+    Manually advanced clock
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+
+        self.time = 0.0
+
+    def __call__(self):
+        """
+        Return the current time
+        """
+
+        return self.time
+
+def test_next_frame():
+    """
+    Each frame advances to the step due at the current time, skipping the
+    steps in between, and no frame is due until the next step
+    """
+
+    _clock = Clock()
+    _scheduler = AnimationScheduler(rate=10.0, clock=_clock)
+
+    _scheduler.start(5)
+
+    assert _scheduler.next_frame() is None
+
+    _clock.time = 0.1
+    assert _scheduler.next_frame() == (range(6, 6), 6)
+
+    _clock.time = 0.15
+    assert _scheduler.next_frame() is None
+
+    #rendering fell behind by three steps
+    _clock.time = 0.5
+    assert _scheduler.next_frame() == (range(7, 10), 10)
+
+    #clamped to the last step
+    _clock.time = 10.0
+    assert _scheduler.next_frame(20) == (range(11, 20), 20)
+    assert _scheduler.next_frame(20) is None
+
+def test_pause():
+    """
+    Pausing keeps the current step, and changing the rate continues from
+    it
+    """
+
+    _clock = Clock()
+    _scheduler = AnimationScheduler(rate=10.0, clock=_clock)
+
+    _scheduler.start()
+
+    _clock.time = 0.3
+    assert _scheduler.next_frame()[1] == 3
+
+    _scheduler.pause()
+
+    _clock.time = 5.0
+    assert _scheduler.next_frame() is None
+
+    _scheduler.resume()
+    _scheduler.set_rate(100.0)
+
+    _clock.time = 5.05
+    assert _scheduler.next_frame() == (range(4, 8), 8)
+
+def test_stats():
+    """
+    The statistics count the frames rendered and steps skipped over the
+    time played, excluding pauses
+    """
+
+    _clock = Clock()
+    _scheduler = AnimationScheduler(rate=100.0, max_fps=60.0, clock=_clock)
+
+    assert _scheduler.get_frame_interval() == pytest.approx(1.0 / 60.0)
+
+    _scheduler.start()
+
+    assert _scheduler.get_stats().achieved_fps == 0.0
+
+    for _i in range(1, 11):
+
+        _clock.time = _i * 0.05
+        _scheduler.next_frame()
+
+    _scheduler.pause()
+    _clock.time = 100.0
+
+    _stats = _scheduler.get_stats()
+
+    assert _stats.target_fps == 60.0
+    assert _stats.frames == 10
+    assert _stats.skipped == 40
+    assert _stats.achieved_fps == pytest.approx(20.0)
+
+    #restarting resets the statistics
+    _scheduler.start()
+
+    assert _scheduler.get_stats().frames == 0
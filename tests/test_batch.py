@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Batch runner tests
+"""
+
+import math
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model import batch
+from freecad.turns.model.analysis import run_analysis
+from freecad.turns.model.geometry import get_edges
+
+#a polyline given as a tuple of points, and a line into a quarter turn
+PATHS = {
+    'polyline': ((0.0, 0.0), (50.0, 0.0), (80.0, 60.0)),
+    'turn': [('line', (-100.0, 0.0), (0.0, 0.0)),
+             ('arc', (0.0, 50.0), 50.0, -math.pi / 2.0, 0.0)]
+}
+
+def test_inline_paths():
+    """
+    Plain path descriptions are analyzed as by run_analysis
+    """
+
+    _results = list(batch.run_batch(PATHS, ['P', 'SU'], workers=2, spacing=2.0))
+
+    assert sorted((_r.vehicle, _r.path) for _r in _results) == [
+        ('P', 'polyline'), ('P', 'turn'), ('SU', 'polyline'), ('SU', 'turn')]
+
+    for _r in _results:
+
+        assert _r.error is None
+
+        _expected = run_analysis(_r.vehicle, PATHS[_r.path], spacing=2.0)
+
+        assert np.array_equal(_r.analysis.position, _expected.position)
+        assert np.array_equal(_r.analysis.left, _expected.left)
+
+def test_sketch_source(tmp_path, monkeypatch):
+    """
+    Saved sketches are loaded once per worker until the document changes
+    """
+
+    _file = tmp_path / 'paths.FCStd'
+    _file.write_bytes(b'document')
+
+    _loaded = []
+
+    def _get_geometry(source):
+
+        _loaded.append(source)
+
+        return get_edges(PATHS['turn'])
+
+    monkeypatch.setattr(batch, 'get_geometry', _get_geometry)
+    batch._load_geometry.cache_clear()
+
+    _job = ('P', 'paths:Sketch', (str(_file), 'Sketch'))
+
+    _first = batch._run_job(_job, {})
+    _second = batch._run_job(_job, {})
+
+    assert _first.error is None
+    assert np.array_equal(_first.analysis.position, _second.analysis.position)
+    assert _loaded == [(str(_file), 'Sketch')]
+
+    _stat = os.stat(_file)
+    os.utime(_file, ns=(_stat.st_atime_ns, _stat.st_mtime_ns + 10**9))
+
+    batch._run_job(_job, {})
+
+    assert len(_loaded) == 2
+
+    #plain descriptions are not sketches
+    assert not batch._is_sketch(PATHS['polyline'])
+
+    batch._load_geometry.cache_clear()
+
+def test_close(monkeypatch):
+    """
+    Closing the generator early cancels the queued jobs
+    """
+
+    _futures = []
+
+    class _Pool(ProcessPoolExecutor):
+
+        def submit(self, *args, **kwargs):
+
+            _futures.append(super().submit(*args, **kwargs))
+
+            return _futures[-1]
+
+    monkeypatch.setattr(batch, 'ProcessPoolExecutor', _Pool)
+
+    _paths = {str(_i): PATHS['turn'] for _i in range(12)}
+    _results = batch.run_batch(_paths, ['P'], workers=1, spacing=2.0)
+
+    assert next(_results).error is None
+
+    _results.close()
+
+    assert len(_futures) == 12
+    assert all(_f.done() for _f in _futures)
+    assert any(_f.cancelled() for _f in _futures)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Obstacle clearance tests
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.clearance import ClearanceEngine
+from freecad.turns.model.geometry import LineEdge
+
+def get_obstacles(footprints, segments, count, seed=2):
+    """
+    Return random obstacle line edges around the footprints
+    """
+
+    _starts, _ends = segments(
+        count, seed, footprints.reshape(-1, 2).min(axis=0) - 5.0,
+        footprints.reshape(-1, 2).max(axis=0) + 5.0, 2.0)
+
+    return [LineEdge(tuple(_s), tuple(_e))
+            for _s, _e in zip(_starts.tolist(), _ends.tolist())]
+
+def get_point_distance(point, start, end):
+    """
+    Distance of a point to a segment
+    """
+
+    _dx, _dy = end[0] - start[0], end[1] - start[1]
+    _len = _dx * _dx + _dy * _dy
+
+    _t = 0.0
+
+    if _len:
+        _t = ((point[0] - start[0]) * _dx + (point[1] - start[1]) * _dy) / _len
+        _t = min(max(_t, 0.0), 1.0)
+
+    return math.hypot(
+        point[0] - start[0] - _t * _dx, point[1] - start[1] - _t * _dy)
+
+def get_side(a, b, c):
+    """
+    Sign of the turn from a to b to c
+    """
+
+    return np.sign((b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0]))
+
+def get_edge_distance(start, end, other_start, other_end):
+    """
+    Distance between two segments
+    """
+
+    if get_side(start, end, other_start) * get_side(start, end, other_end) <= 0 \
+        and get_side(other_start, other_end, start) \
+            * get_side(other_start, other_end, end) <= 0:
+
+        return 0.0
+
+    return min(
+        get_point_distance(start, other_start, other_end),
+        get_point_distance(end, other_start, other_end),
+        get_point_distance(other_start, start, end),
+        get_point_distance(other_end, start, end))
+
+def get_distances(polygon, start, end):
+    """
+    Brute force distance of a segment to each edge of a convex ccw
+    polygon, with the nearest edge at zero distance if the segment is
+    within the polygon
+    """
+
+    _edges = list(zip(polygon, np.roll(polygon, -1, axis=0)))
+    _d = np.array([get_edge_distance(_p, _q, start, end) for _p, _q in _edges])
+
+    if all(get_side(_p, _q, start) >= 0 for _p, _q in _edges):
+        _d[np.argmin(_d)] = 0.0
+
+    return _d
+
+def test_check(random_footprints, random_segments):
+    """
+    The minimum clearance, nearest obstacle and encroachments of each
+    step match the distance of every obstacle to every footprint
+    """
+
+    _footprints = random_footprints(150)
+    _obstacles = get_obstacles(_footprints, random_segments, 200)
+
+    _engine = ClearanceEngine(_obstacles, clearance=1.0, radius=3.0)
+    _result = _engine.check([_footprints], ['unit'])
+
+    _conflicts = list(zip(
+        _result.conflicts.step.tolist(), _result.conflicts.obstacle.tolist(),
+        _result.conflicts.edge.tolist()))
+
+    _expected = set()
+
+    assert len(set(_conflicts)) == len(_conflicts)
+
+    for _s, _fp in enumerate(_footprints):
+
+        #(obstacle, edge) distances
+        _d = np.array([
+            get_distances(_fp, _o.StartPoint[0:2], _o.EndPoint[0:2])
+            for _o in _obstacles])
+
+        _expected |= {(_s, _o, _e) for _o, _e in zip(*np.nonzero(_d <= 1.0))}
+
+        if _d.min() > 3.0:
+
+            assert _result.minimum[0][_s] == np.inf
+            assert _result.nearest[0][_s] == -1
+            continue
+
+        assert math.isclose(_result.minimum[0][_s], _d.min(), abs_tol=1e-9)
+        assert math.isclose(
+            _d[_result.nearest[0][_s]].min(), _d.min(), abs_tol=1e-9)
+
+    #several parts of a footprint encroach on the same obstacle
+    assert len(_expected) > len({_k[0:2] for _k in _expected})
+    assert set(_conflicts) == _expected
+    assert len(_result.report) == len(_conflicts)
+
+def test_crossing():
+    """
+    Obstacles crossing a footprint without an end point within it, and
+    obstacles wholly within it, are at zero clearance
+    """
+
+    _footprints = np.array([[(2.0, 1.0), (-2.0, 1.0), (-2.0, -1.0), (2.0, -1.0)]])
+
+    _engine = ClearanceEngine([
+        LineEdge((-5.0, 0.0), (5.0, 0.0)), LineEdge((-0.5, 0.2), (0.5, 0.3)),
+        LineEdge((-5.0, 5.0), (5.0, 5.0))
+    ], clearance=0.5, radius=1.0)
+
+    _result = _engine.check([_footprints])
+
+    assert _result.minimum[0][0] == 0.0
+
+    #the crossing obstacle encroaches at both ends of the footprint
+    assert sorted(zip(
+        _result.conflicts.obstacle.tolist(), _result.conflicts.edge.tolist()
+    )) == [(0, 1), (0, 3), (1, 0)]
+
+def test_check_sweep(random_footprints, random_segments):
+    """
+    Checking the slivers swept between animation frames finds every
+    encroachment of the footprints at the frame steps and between them
+    """
+
+    _footprints = random_footprints(150)
+    _obstacles = get_obstacles(_footprints, random_segments, 200)
+
+    _engine = ClearanceEngine(_obstacles, clearance=1.0, radius=3.0)
+    _full = _engine.check([_footprints])
+
+    _found = set()
+
+    for _end in range(0, 154, 4):
+
+        _result = _engine.check([_footprints], None, _end - 4, _end)
+
+        assert _result.steps[0].tolist() == \
+            list(range(max(_end - 3, 0), min(_end + 1, 150)))
+
+        #each sliver contains the footprint of its step
+        assert np.all(
+            _result.minimum[0] <= _full.minimum[0][_result.steps[0]])
+
+        _found |= set(zip(
+            _result.conflicts.step.tolist(), _result.conflicts.obstacle.tolist()))
+
+    assert set(zip(
+        _full.conflicts.step.tolist(), _full.conflicts.obstacle.tolist())) <= _found
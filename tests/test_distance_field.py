@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Obstacle distance field tests
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.distance_field import DistanceField
+from freecad.turns.model.line_segment import LineSegment
+
+def get_distances(points, starts, ends, radius):
+    """
+    Brute force distance of (n, 2) points to the nearest segment, capped
+    at the radius
+    """
+
+    return np.array([
+        min(LineSegment.point_distances(
+            np.repeat(_p[None], len(starts), 0), starts, ends).min(), radius)
+        for _p in points
+    ])
+
+def test_nodes(tmp_path, random_segments):
+    """
+    Field values at the grid nodes are the capped nearest distances
+    """
+
+    _starts, _ends = random_segments(40)
+
+    _field = DistanceField(_starts, _ends, 1.0, 5.0, cache_dir=str(tmp_path))
+    _values = _field.load()
+
+    assert _values.shape == _field.shape
+
+    _rows, _cols = np.meshgrid(
+        np.arange(0, _field.shape[0], 3), np.arange(0, _field.shape[1], 3),
+        indexing='ij')
+
+    _nodes = _field.origin + np.stack(
+        (_cols.ravel(), _rows.ravel()), axis=1) * _field.resolution
+
+    assert np.allclose(
+        _values[_rows.ravel(), _cols.ravel()],
+        get_distances(_nodes, _starts, _ends, 5.0))
+
+def test_lookup(tmp_path, random_segments):
+    """
+    Interpolated lookups are within the resolution of the exact distance,
+    and points outside the field are at the radius
+    """
+
+    _starts, _ends = random_segments(40)
+
+    _field = DistanceField(_starts, _ends, 0.5, 5.0, cache_dir=str(tmp_path))
+
+    _points = np.random.default_rng(2).uniform(-10.0, 50.0, (2000, 2))
+
+    assert np.all(np.abs(
+        _field.lookup(_points) - get_distances(_points, _starts, _ends, 5.0)
+    ) <= _field.resolution)
+
+    assert _field.lookup(np.array([[-1000.0, 0.0]]))[0] == 5.0
+
+def test_cache(tmp_path, random_segments):
+    """
+    A field of the same segments is read from the cache, and a field of
+    other segments is not
+    """
+
+    _starts, _ends = random_segments(40)
+
+    _values = DistanceField(
+        _starts, _ends, 0.5, 5.0, cache_dir=str(tmp_path)).load()
+
+    _cached = DistanceField(_starts, _ends, 0.5, 5.0, cache_dir=str(tmp_path))
+
+    assert isinstance(_cached.load(), np.memmap)
+    assert np.array_equal(_cached.values, _values)
+
+    _other = DistanceField(
+        _starts + 1.0, _ends, 0.5, 5.0, cache_dir=str(tmp_path))
+
+    _other.load()
+
+    assert _other.key != _cached.key
+    assert len(list(tmp_path.iterdir())) == 4
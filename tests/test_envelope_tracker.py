@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Envelope tracker tests
+"""
+
+import pytest
+
+pytest.importorskip('freecad_python_support')
+pytest.importorskip('pivy')
+pytest.importorskip('freecad.turns.trackers.core.trait.base')
+
+from freecad.turns.model.vehicle import Vehicle
+from freecad.turns.trackers.project.envelope_tracker import EnvelopeTracker
+
+def test_track_points():
+    """
+    The tracked points are the body points followed by a point of each
+    wheel, leaving the vehicle body points unchanged
+    """
+
+    _vehicle = Vehicle.from_template('WB-67')
+    _body = list(_vehicle.points)
+
+    _tracker = EnvelopeTracker('WB-67', _vehicle, None)
+
+    assert _vehicle.points == _body
+
+    _wheels = sum(len(_a.wheels) for _a in _vehicle.axles)
+
+    assert len(_tracker.points) == len(_body) + _wheels
+    assert [_p[0:2] for _p in _tracker.points[0:len(_body)]] == _body
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Frame transaction tests
+"""
+
+import pytest
+
+from freecad.turns.trackers.project.frame_transaction import \
+    FrameTransaction, FrameTransactions
+
+class Node():
+    """
+    Stand-in for a coin node, recording notification state and touches
+    """
+
+    def __init__(self, notify=True):
+        """
+        Constructor
+        """
+
+        self.notify = notify
+        self.touches = 0
+
+    def enableNotify(self, flag):
+        """
+        Set the notification state, returning the previous state
+        """
+
+        _previous = self.notify
+        self.notify = flag
+
+        return _previous
+
+    def touch(self):
+        """
+        Notify the node
+        """
+
+        self.touches += 1
+
+def test_nested():
+    """
+    Nested transactions restore the previous notification state and touch
+    each node once, at the outermost exit
+    """
+
+    _root = Node()
+    _child = Node()
+
+    with FrameTransaction(_root, None, _child):
+
+        assert not _root.notify and not _child.notify
+
+        with FrameTransaction(_root):
+
+            with FrameTransaction(_child):
+                assert not _child.notify
+
+            assert not _root.notify and not _child.notify
+            assert _root.touches == _child.touches == 0
+
+        assert not _root.notify
+        assert _root.touches == 0
+
+    assert _root.notify and _child.notify
+    assert _root.touches == _child.touches == 1
+
+def test_suspended():
+    """
+    Nodes which were not notifying before the transaction are restored,
+    but not touched
+    """
+
+    _node = Node(False)
+
+    with FrameTransaction(_node):
+        pass
+
+    assert not _node.notify
+    assert _node.touches == 0
+
+def test_exception():
+    """
+    Notification is restored when the frame update raises
+    """
+
+    _tracker = FrameTransactions()
+    _tracker.root = Node()
+
+    with pytest.raises(ValueError):
+
+        with _tracker.frame():
+            raise ValueError()
+
+    assert _tracker.root.notify
+    assert _tracker.root.touches == 1
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Plain path geometry tests
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from freecad.turns.model.geometry import ArcEdge, LineEdge, get_edges
+
+def test_line_edge():
+    """
+    Line edges are parameterized by distance from the start
+    """
+
+    _line = LineEdge((0.0, 0.0), (30.0, 40.0))
+
+    assert _line.StartPoint == (0.0, 0.0, 0.0)
+    assert _line.length() == 50.0
+    assert _line.value(25.0) == (15.0, 20.0, 0.0)
+
+    assert _line.isDerivedFrom('Part::GeomLineSegment')
+    assert not _line.isDerivedFrom('Part::GeomArcOfCircle')
+
+    assert np.allclose(
+        _line.discretize(3), [(0.0, 0.0, 0.0), (15.0, 20.0, 0.0), (30.0, 40.0, 0.0)])
+
+    assert len(_line.discretize(Distance=4.0)) == 14
+    assert len(_line.discretize(Deflection=0.1)) == 2
+
+def test_arc_edge():
+    """
+    Arc edges are parameterized by angle, counter-clockwise
+    """
+
+    _arc = ArcEdge((0.0, 50.0), 50.0, -math.pi / 2.0, 0.0)
+
+    assert np.allclose(_arc.StartPoint, (0.0, 0.0, 0.0))
+    assert np.allclose(_arc.EndPoint, (50.0, 50.0, 0.0))
+    assert math.isclose(_arc.length(), 25.0 * math.pi)
+
+    assert _arc.isDerivedFrom('Part::GeomArcOfCircle')
+    assert not _arc.isDerivedFrom('Part::GeomLineSegment')
+
+    _points = np.array(_arc.discretize(Number=11))
+
+    assert len(_points) == 11
+    assert np.allclose(np.linalg.norm(_points[:, 0:2] - (0.0, 50.0), axis=1), 50.0)
+
+    #the deflection limits the chord error
+    _points = np.array(_arc.discretize(Deflection=0.01))
+    _chords = np.linalg.norm(np.diff(_points[:, 0:2], axis=0), axis=1)
+
+    assert 50.0 - math.sqrt(50.0 ** 2 - (_chords.max() / 2.0) ** 2) <= 0.01
+
+    #a last angle before the first wraps around
+    assert math.isclose(ArcEdge((0.0, 0.0), 1.0, 0.0, -math.pi / 2.0).length(),
+                        1.5 * math.pi)
+
+def test_arc_from_points():
+    """
+    Three point arcs pass through the points, with clockwise arcs
+    reversed into counter-clockwise ones
+    """
+
+    _ccw = ArcEdge.from_points((50.0, 0.0), (0.0, 50.0), (-50.0, 0.0))
+
+    assert np.allclose(_ccw.Center, (0.0, 0.0, 0.0))
+    assert math.isclose(_ccw.Radius, 50.0)
+    assert np.allclose(_ccw.StartPoint, (50.0, 0.0, 0.0))
+    assert np.allclose(_ccw.EndPoint, (-50.0, 0.0, 0.0))
+
+    _cw = ArcEdge.from_points((-50.0, 0.0), (0.0, 50.0), (50.0, 0.0))
+
+    assert np.allclose(_cw.StartPoint, (50.0, 0.0, 0.0))
+    assert np.allclose(_cw.EndPoint, (-50.0, 0.0, 0.0))
+
+    with pytest.raises(AssertionError):
+        ArcEdge.from_points((0.0, 0.0), (1.0, 1.0), (2.0, 2.0))
+
+def test_get_edges():
+    """
+    Descriptions build lines, arcs and polylines
+    """
+
+    _edges = get_edges([
+        ('line', (0.0, 0.0), (10.0, 0.0)),
+        ('Arc', (10.0, 5.0), 5.0, -math.pi / 2.0, math.pi / 2.0),
+        ('arc3', (10.0, 10.0), (5.0, 15.0), (0.0, 10.0))
+    ])
+
+    assert [type(_e) for _e in _edges] == [LineEdge, ArcEdge, ArcEdge]
+
+    _polyline = get_edges([(0.0, 0.0), (10.0, 0.0), (10.0, 10.0)])
+
+    assert len(_polyline) == 2
+    assert _polyline[1].StartPoint == (10.0, 0.0, 0.0)
+
+    with pytest.raises(ValueError):
+        get_edges([('spline', (0.0, 0.0), (1.0, 1.0))])
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Vectorized kinematics tests
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.kinematics import Kinematics
+from freecad.turns.model.vehicle import Vehicle
+
+def test_snapped_steps(turn_path):
+    """
+    The snapped solution of every step matches the vehicle steered one
+    step at a time
+    """
+
+    _path = turn_path(1.0)
+    _vehicle = Vehicle.from_template('P')
+    _kinematics = Kinematics(_vehicle, _path, Kinematics.SNAP)
+
+    _cols = _path.get_columns()
+    _wheels = [0.0] * _kinematics.wheel_angles.shape[1]
+
+    assert _kinematics.count == len(_cols.angle)
+
+    for _i, _angle in enumerate(_cols.angle.tolist()):
+
+        _vector = _cols.vector[_i]
+
+        assert math.isclose(
+            _kinematics.orientation[_i], math.atan2(_vector[1], _vector[0]),
+            abs_tol=1e-12)
+
+        assert np.allclose(_kinematics.position[_i], _cols.position[_i, 0:2])
+
+        #the steering state persists over straight or infeasible steps
+        if _angle and abs(_angle) <= _vehicle.maximum_angle:
+            _wheels = _vehicle.solve_steering(_angle)[2]
+
+        assert np.allclose(
+            _kinematics.wheel_angles[_i], _wheels,
+            atol=_vehicle.angle_resolution)
+
+def test_towed_headings():
+    """
+    The closed-form tractrix headings match a fine numerical integration
+    of the towed unit heading along a line - arc - line hitch path
+    """
+
+    _radius = 20.0
+    _distance = 12.0
+    _lengths = (30.0, _radius * math.pi / 2.0, 30.0)
+
+    def _direction(s):
+        """
+        Direction of the hitch motion at the distance along the path
+        """
+
+        return min(max(s - _lengths[0], 0.0), _lengths[1]) / _radius
+
+    def _point(s):
+        """
+        Hitch position at the distance along the path
+        """
+
+        _a = _direction(s)
+        _x = min(s, _lengths[0]) + _radius * math.sin(_a)
+        _y = _radius * (1.0 - math.cos(_a)) + max(s - _lengths[0] - _lengths[1], 0.0)
+
+        return (_x, _y)
+
+    _stations = np.concatenate((
+        np.linspace(0.0, _lengths[0], 16)[:-1],
+        np.linspace(_lengths[0], _lengths[0] + _lengths[1], 13)[:-1],
+        np.linspace(_lengths[0] + _lengths[1], sum(_lengths), 16)
+    ))
+
+    _points = np.array([_point(_s) for _s in _stations])
+
+    _curvature = np.where(
+        (_stations[:-1] >= _lengths[0] - 1e-9)
+        & (_stations[1:] <= _lengths[0] + _lengths[1] + 1e-9), 1.0 / _radius, 0.0)
+
+    _headings = Kinematics.get_towed_headings(
+        _points, _distance, 0.2, Kinematics.get_arcs(_points, _curvature))
+
+    #fourth-order Runge-Kutta integration of the heading rate
+    #sin(direction - heading) / distance
+    def _rate(s, heading):
+        return math.sin(_direction(s) - heading) / _distance
+
+    _heading = 0.2
+    _expected = [_heading]
+
+    for _s0, _s1 in zip(_stations[:-1], _stations[1:]):
+
+        _h = (_s1 - _s0) / 200.0
+
+        for _j in range(200):
+
+            _s = _s0 + _j * _h
+
+            _k1 = _rate(_s, _heading)
+            _k2 = _rate(_s + _h / 2.0, _heading + _h * _k1 / 2.0)
+            _k3 = _rate(_s + _h / 2.0, _heading + _h * _k2 / 2.0)
+            _k4 = _rate(_s + _h, _heading + _h * _k3)
+
+            _heading += _h * (_k1 + 2.0 * _k2 + 2.0 * _k3 + _k4) / 6.0
+
+        _expected.append(_heading)
+
+    assert np.allclose(_headings, _expected, atol=1e-8)
+
+def test_towed_headings_straight():
+    """
+    On straight steps the heading follows tan(a / 2) decaying by
+    exp(-s / distance)
+    """
+
+    _points = np.stack((np.linspace(0.0, 50.0, 26), np.zeros(26)), axis=1)
+
+    _headings = Kinematics.get_towed_headings(_points, 10.0, 1.0)
+
+    _expected = 2.0 * np.arctan(np.tan(0.5) * np.exp(-_points[:, 0] / 10.0))
+
+    assert np.allclose(_headings, _expected, atol=1e-12)
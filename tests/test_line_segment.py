@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Line segment kernel tests
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.line_segment import LineSegment
+
+def get_segments(segments, count, seed):
+    """
+    Return a list of random line segments
+    """
+
+    _starts, _ends = segments(count, seed, 0.0, 10.0)
+
+    return [LineSegment(tuple(_s), tuple(_e))
+            for _s, _e in zip(_starts.tolist(), _ends.tolist())]
+
+def test_intersect_arrays(random_segments):
+    """
+    All-pairs and paired intersections match the scalar test
+    """
+
+    _a = get_segments(random_segments, 40, 1)
+    _b = get_segments(random_segments, 50, 2)
+
+    _result = LineSegment.intersect_arrays(
+        *LineSegment.to_arrays(_a), *LineSegment.to_arrays(_b))
+
+    assert _result.hits.shape == (40, 50)
+    assert _result.hits.any()
+
+    for _i, _s in enumerate(_a):
+
+        for _j, _t in enumerate(_b):
+
+            _hit, _point, _uv = _s.is_intersecting(_t)
+
+            assert _hit == _result.hits[_i, _j]
+            assert np.allclose(_uv, (_result.u[_i, _j], _result.v[_i, _j]))
+
+            if _hit:
+                assert np.allclose(_point[0:2], _result.points[_i, _j])
+
+    _paired = LineSegment.intersect_arrays(
+        *LineSegment.to_arrays(_a), *LineSegment.to_arrays(_b[:40]),
+        paired=True)
+
+    assert np.array_equal(_paired.hits, np.diagonal(_result.hits))
+
+def test_parallel():
+    """
+    Parallel segments do not intersect
+    """
+
+    _result = LineSegment.intersect_arrays(
+        np.array([[0.0, 0.0]]), np.array([[1.0, 0.0]]),
+        np.array([[0.0, 1.0], [0.5, 0.0]]), np.array([[1.0, 1.0], [2.0, 0.0]]))
+
+    assert not _result.hits.any()
+    assert np.isnan(_result.u).all()
+
+def test_distance_arrays(random_segments):
+    """
+    Paired segment distances match the minimum distance between points
+    sampled along both segments
+    """
+
+    _a = get_segments(random_segments, 60, 3)
+    _b = get_segments(random_segments, 60, 4)
+
+    _distance = LineSegment.distance_arrays(
+        *LineSegment.to_arrays(_a), *LineSegment.to_arrays(_b))
+
+    _t = np.linspace(0.0, 1.0, 401)[:, None]
+
+    for _i, (_s, _u) in enumerate(zip(_a, _b)):
+
+        _p = np.array(_s.start[0:2]) + _t * np.array(_s.vector[0:2])
+        _q = np.array(_u.start[0:2]) + _t * np.array(_u.vector[0:2])
+
+        _sampled = np.hypot(*(_p[:, None] - _q[None]).T).min()
+
+        assert _distance[_i] <= _sampled + 1e-9
+        assert _sampled - _distance[_i] < 0.05
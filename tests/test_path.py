@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Path discretization tests
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.geometry import LineEdge, get_edges
+from freecad.turns.model.path import Path
+
+GEOMETRY = [('line', (-100.0, 0.0), (0.0, 0.0)),
+            ('arc', (0.0, 50.0), 50.0, -math.pi / 2.0, 0.0),
+            ('line', (50.0, 50.0), (50.0, 150.0)),
+            ('line', (50.0, 150.0), (80.0, 200.0))]
+
+class UnsupportedEdge(LineEdge):
+    """
+    Edge of a type the path does not discretize
+    """
+
+    def isDerivedFrom(self, type_id):
+        """
+        Part geometry type test
+        """
+
+        return type_id == 'Part::Geometry'
+
+def assert_same_segments(path, other):
+    """
+    Assert two paths have the same segments
+    """
+
+    assert len(path.segments) == len(other.segments)
+
+    for _a, _b in zip(path.segments, other.segments):
+
+        assert np.allclose(_a.position, _b.position)
+        assert np.allclose(_a.vector, _b.vector)
+        assert np.allclose(_a.tangent, _b.tangent)
+        assert math.isclose(_a.angle, _b.angle, abs_tol=1e-12)
+
+def test_columnar_segments():
+    """
+    Columnar path segments match the per-segment objects
+    """
+
+    for _spacing in (None, 2.5):
+
+        assert_same_segments(
+            Path(get_edges(GEOMETRY), 40, columnar=True, spacing=_spacing),
+            Path(get_edges(GEOMETRY), 40, spacing=_spacing))
+
+def test_incremental_update():
+    """
+    Updating a path with changed edges matches rebuilding it, and with
+    arc-length spacing only invalidates the segments after the change
+    """
+
+    _changes = [
+        GEOMETRY,
+        GEOMETRY[:3] + [('line', (50.0, 150.0), (90.0, 190.0))],
+        GEOMETRY + [('line', (80.0, 200.0), (80.0, 260.0))],
+        [('line', (-90.0, 20.0), (0.0, 0.0))] + GEOMETRY[1:],
+    ]
+
+    for _columnar in (False, True):
+
+        for _spacing in (None, 2.0):
+
+            _path = Path(get_edges(GEOMETRY), 40, columnar=_columnar,
+                         spacing=_spacing)
+
+            for _i, _geometry in enumerate(_changes):
+
+                _count = len(_path.segments)
+                _invalidated = _path.update(get_edges(_geometry))
+
+                assert_same_segments(
+                    _path, Path(get_edges(_geometry), 40, columnar=_columnar,
+                                spacing=_spacing))
+
+                #unchanged geometry
+                if _i == 0:
+                    assert not len(_invalidated)
+
+                #changed last edge
+                elif _i == 1 and _spacing:
+                    assert 0 < _invalidated.start < _count
+
+def test_unsupported_edge_update():
+    """
+    Updating a path which skips an unsupported edge matches rebuilding it
+    """
+
+    def get_geometry(end):
+        """
+        Return the edges with an unsupported edge before the arc
+        """
+
+        _edges = get_edges(GEOMETRY[:3] + [('line', (50.0, 150.0), end)])
+
+        return _edges[:1] + [UnsupportedEdge((0.0, 0.0), (0.0, 10.0))] + _edges[1:]
+
+    for _spacing in (None, 2.0):
+
+        _path = Path(get_geometry((80.0, 200.0)), 40, spacing=_spacing)
+
+        assert len(_path.edges) == 4
+
+        _invalidated = _path.update(get_geometry((90.0, 190.0)))
+
+        assert len(_invalidated)
+
+        assert_same_segments(
+            _path, Path(get_geometry((90.0, 190.0)), 40, spacing=_spacing))
+
+def test_spacing():
+    """
+    Arc-length spacing divides each edge into equal intervals no longer
+    than the spacing, with arc chord errors within the tolerance
+    """
+
+    _path = Path(get_edges(GEOMETRY), 40, columnar=True, spacing=2.5,
+                 tolerance=0.01)
+
+    _points = np.array(_path.points)[:, 0:2]
+    _lengths = np.linalg.norm(np.diff(_points, axis=0), axis=1)
+    _owner = _path.get_segment_edges()
+
+    assert np.all(_lengths <= 2.5 + 1e-9)
+
+    for _i, _edge in enumerate(_path.edges):
+
+        _chords = _lengths[_owner == _i]
+
+        assert len(_chords)
+        assert np.allclose(_chords, _chords[0])
+
+        if _edge.isDerivedFrom('Part::GeomArcOfCircle'):
+
+            _radius = _edge.Radius
+
+            assert _radius - math.sqrt(_radius ** 2 - (_chords[0] / 2.0) ** 2) <= 0.01
+
+        else:
+            assert math.isclose(_chords.sum(), _edge.length())
+
+def test_columns():
+    """
+    The columns of a path match its segments, whether or not it is columnar
+    """
+
+    for _columnar in (False, True):
+
+        _path = Path(get_edges(GEOMETRY), 40, columnar=_columnar, spacing=2.0)
+        _cols = _path.get_columns()
+
+        assert len(_cols.angle) == len(_path.segments)
+
+        for _i, _s in enumerate(_path.segments):
+
+            assert np.allclose(_cols.position[_i], _s.position)
+            assert np.allclose(_cols.vector[_i], _s.vector)
+            assert np.allclose(_cols.tangent[_i], _s.tangent)
+            assert math.isclose(_cols.angle[_i], _s.angle, abs_tol=1e-12)
+
+def test_curvatures():
+    """
+    Arc segments take the signed curvature of the arc, positive for ccw
+    turns, and all other segments are straight
+    """
+
+    _right = [
+        ('line', (50.0, 150.0), (50.0, 200.0)),
+        ('arc3', (50.0, 200.0), (50.0 + 30.0 * (1.0 - math.cos(math.pi / 4.0)),
+                                 200.0 + 30.0 * math.sin(math.pi / 4.0)),
+         (80.0, 230.0))
+    ]
+
+    _path = Path(get_edges(GEOMETRY[:3] + _right), 40, spacing=2.0)
+
+    _curvatures = _path.get_curvatures()
+    _owner = _path.get_segment_edges()
+
+    assert len(_curvatures) == len(_path.points) - 1
+
+    assert np.allclose(_curvatures[_owner == 1], 1.0 / 50.0)
+    assert np.allclose(_curvatures[_owner == 4], -1.0 / 30.0)
+    assert not np.any(_curvatures[~np.isin(_owner, (1, 4))])
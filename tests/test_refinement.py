@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Step refinement tests
+"""
+
+import math
+
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.refinement import StepRefinement
+
+GEOMETRY = [('line', (-150.0, 0.0), (0.0, 0.0)),
+            ('arc', (0.0, 50.0), 50.0, -math.pi / 2.0, 0.0)]
+
+def test_pass_limit():
+    """
+    An unconverged refinement runs exactly the maximum number of passes
+    """
+
+    for _iterations in (1, 2, 3):
+
+        _refinement = StepRefinement(
+            'WB-40', GEOMETRY, tolerance=1e-9, spacing=10.0,
+            minimum_spacing=1e-6, iterations=_iterations)
+
+        _refinement.run()
+
+        assert _refinement.passes == _iterations
+
+def test_converged():
+    """
+    A refinement stops once the envelope changes less than the tolerance
+    """
+
+    _refinement = StepRefinement(
+        'WB-40', GEOMETRY, tolerance=1e6, spacing=10.0, minimum_spacing=1e-6,
+        iterations=8)
+
+    _refinement.run()
+
+    assert _refinement.passes == 2
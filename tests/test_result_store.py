@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Memory-mapped result store tests
+"""
+
+import numpy as np
+import pytest
+
+from freecad.turns.model.result_store import ResultStore
+
+def get_state(count, points, seed=1):
+    """
+    Return random unit state arrays for a number of steps
+    """
+
+    _rng = np.random.default_rng(seed)
+
+    return (
+        _rng.normal(0.0, 100.0, (count, 2)), _rng.uniform(-3.0, 3.0, count),
+        _rng.uniform(-0.5, 0.5, count), _rng.normal(0.0, 100.0, count),
+        _rng.normal(0.0, 100.0, (count, points, 2))
+    )
+
+def test_append(tmp_path):
+    """
+    Rows appended beyond the initial capacity read back unchanged, and
+    views handed out before the files grow keep their data
+    """
+
+    _store = ResultStore(str(tmp_path), capacity=4)
+
+    _a = _store.add_unit('a', 5, 3)
+    _b = _store.add_unit('b', 2)
+
+    _state = get_state(300, 5)
+
+    _store.append(_a, *[_v[0:3] for _v in _state])
+
+    _view = _store.get_tracks(_a)
+    _first = np.array(_view)
+
+    for _s in range(3, 300, 37):
+        _store.append(_a, *[_v[_s:_s + 37] for _v in _state])
+
+    _store.append(_b, *get_state(10, 2, 2))
+    _store.flush()
+
+    assert _store.get_count(_a) == 300
+    assert _store.get_count(_b) == 10
+    assert len(_store.records[_a]) == 512
+
+    assert np.array_equal(_view, _first)
+
+    _rows = _store.get_rows(_a)
+
+    assert np.array_equal(_rows['position'], _state[0])
+    assert np.array_equal(_rows['orientation'], _state[1])
+    assert np.array_equal(_rows['angle'], _state[2])
+    assert np.array_equal(_rows['radius'], _state[3])
+
+    _tracks = _store.get_tracks(_a, 10, 20)
+
+    assert _tracks.shape == (10, 5, 3)
+    assert np.array_equal(_tracks[..., 0:2], _state[4][10:20])
+    assert not _tracks[..., 2].any()
+
+    assert np.array_equal(
+        _store.get_footprints(_a, 10, 20), _state[4][10:20, 0:3])
+
+    assert _store.get(_a, 299)['orientation'] == _state[1][299]
+
+    with pytest.raises(ValueError):
+        _rows['angle'][0] = 0.0
+
+    #only the current file of each unit is left
+    assert len(list(tmp_path.glob('unit_*.dat'))) == 2
+
+    _store.clear()
+    _store.add_unit('c', 5)
+    _store.append(0, *get_state(20, 5, 3))
+
+    assert np.array_equal(_view, _first)
+
+    _store.finish(remove=True)
+
+    assert not tmp_path.exists()
+
+def test_reopen(tmp_path):
+    """
+    A store reopened read-only holds the rows written, and a store
+    reopened for appending continues after them.  A store whose header
+    does not match its files is rejected.
+    """
+
+    _store = ResultStore(str(tmp_path), capacity=8)
+    _state = get_state(50, 4)
+
+    _store.add_unit('a', 4, 4)
+    _store.append(0, *_state)
+    _store.finish()
+
+    _read = ResultStore(str(tmp_path), 'r')
+
+    assert _read.units[0]['name'] == 'a'
+    assert np.array_equal(_read.get_rows(0)['position'], _state[0])
+    assert np.array_equal(_read.get_footprints(0), _state[4])
+
+    _read.finish()
+
+    _append = ResultStore(str(tmp_path), 'a')
+    _append.append(0, *get_state(30, 4, 2))
+    _append.finish()
+
+    assert ResultStore(str(tmp_path), 'r').get_count(0) == 80
+
+    #a header claiming more points per step than the file holds
+    _store = ResultStore(str(tmp_path), capacity=8)
+    _store.add_unit('a', 4)
+    _store.units[0]['points'] = 6
+    _store.flush()
+
+    with pytest.raises(ValueError):
+        ResultStore(str(tmp_path), 'r')
+
+def test_timeline(tmp_path, turn_path):
+    """
+    A timeline holding its tracks in a store matches one holding them in
+    memory
+    """
+
+    from freecad.turns.model.timeline import Timeline
+    from freecad.turns.model.vehicle import Vehicle
+
+    _vehicle = Vehicle.from_template('WB-67')
+    _vehicle.set_path(turn_path())
+
+    _store = ResultStore(str(tmp_path), capacity=16)
+
+    _memory = Timeline([_vehicle])
+    _stored = Timeline([_vehicle], _store)
+
+    for _v in _memory.units:
+
+        _points = list(_v.points) + [(0.0, 0.0)]
+
+        assert np.array_equal(
+            _memory.add_tracks(_v, _points), _stored.add_tracks(_v, _points))
+
+        assert np.array_equal(
+            _memory.get_tracks(_v, 40), _stored.get_tracks(_v, 40))
+
+    for _m, _s in zip(_memory.get_footprints(), _stored.get_footprints()):
+
+        assert isinstance(_s, np.memmap)
+        assert np.array_equal(_m, _s)
+
+    _store.finish(remove=True)
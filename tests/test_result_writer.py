@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Streaming result writer tests
+"""
+
+import csv
+
+import numpy as np
+
+from freecad.turns.model.result_writer import ResultWriter, iter_chunks, \
+    read_results, write_results
+
+def get_columns(start, count, rng):
+    """
+    Return a dictionary of random result columns for consecutive steps
+    """
+
+    _columns = {
+        'step': np.arange(start, start + count),
+        'unit': rng.integers(0, 3, count),
+    }
+
+    for _n in ('x', 'y', 'orientation', 'angle', 'radius', 'wheel_0_x',
+               'wheel_0_y'):
+        _columns[_n] = rng.normal(0.0, 100.0, count)
+
+    return _columns
+
+def test_round_trip(tmp_path):
+    """
+    Rows written in uneven batches are read back unchanged from the
+    binary file, chunk by chunk, and to 10 significant digits from the
+    CSV file
+    """
+
+    _rng = np.random.default_rng(1)
+    _file = str(tmp_path / 'result.bin')
+
+    _batches = []
+    _start = 0
+
+    with ResultWriter(_file, ['a', 'b', 'c'], 1, chunk_size=100) as _writer:
+
+        for _count in (1, 99, 250, 7, 0, 143):
+
+            _batches.append(get_columns(_start, _count, _rng))
+            _writer.write(**_batches[-1])
+            _start += _count
+
+    _expected = {_n: np.concatenate([_b[_n] for _b in _batches])
+                 for _n in _batches[0]}
+
+    assert _writer.rows == _start
+
+    _result = read_results(_file)
+
+    assert _result.names == ['a', 'b', 'c']
+    assert list(_result.columns) == list(_expected)
+
+    for _n, _v in _expected.items():
+        assert np.array_equal(_result.columns[_n], _v)
+
+    _chunks = list(iter_chunks(_file))
+
+    assert len(_chunks) == _writer.chunks
+    assert all(len(_c['step']) <= 100 + 250 for _c in _chunks)
+
+    with open(str(tmp_path / 'result.csv'), newline='') as _fp:
+        _rows = list(csv.reader(_fp))
+
+    assert _rows[0] == list(_expected)
+    assert len(_rows) == _start + 1
+
+    for _j, _n in enumerate(_expected):
+
+        _values = np.array([float(_r[_j]) for _r in _rows[1:]])
+
+        assert np.allclose(_values, _expected[_n], rtol=1e-9, atol=0.0)
+
+def test_empty(tmp_path):
+    """
+    A file without rows reads back as empty columns
+    """
+
+    _file = str(tmp_path / 'empty.bin')
+
+    ResultWriter(_file, csv=False).close()
+
+    _result = read_results(_file)
+
+    assert all(len(_v) == 0 for _v in _result.columns.values())
+    assert not list(iter_chunks(_file))
+
+def test_write_results(tmp_path, turn_path):
+    """
+    The state of a solved vehicle and its towed units is written for
+    every step
+    """
+
+    from freecad.turns.model.kinematics import Kinematics
+    from freecad.turns.model.vehicle import Vehicle
+
+    _path = turn_path()
+    _kinematics = Kinematics(Vehicle.from_template('WB-67'), _path)
+    _units = [_kinematics] + _kinematics.trailers
+
+    _file = str(tmp_path / 'vehicle.bin')
+
+    assert write_results(_file, _units, chunk_size=64, csv=False) \
+        == _kinematics.count * len(_units)
+
+    _c = read_results(_file).columns
+
+    for _i, _k in enumerate(_units):
+
+        _m = _c['unit'] == _i
+
+        assert np.array_equal(_c['step'][_m], np.arange(_k.count))
+        assert np.array_equal(_c['x'][_m], _k.position[:, 0])
+        assert np.array_equal(_c['y'][_m], _k.position[:, 1])
+        assert np.array_equal(_c['orientation'][_m], _k.orientation)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Segment spatial index tests
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.line_segment import LineSegment
+from freecad.turns.model.segment_index import SegmentIndex
+
+def get_segments(segments, count, seed=1):
+    """
+    Return (n, 2) start and end points of a random walk polyline and
+    scattered short segments
+    """
+
+    _walk = np.cumsum(
+        np.random.default_rng(seed).normal(size=(count + 1, 2)), axis=0)
+
+    _starts, _ends = segments(count, seed, -20.0, 20.0, 1.0)
+
+    return np.concatenate((_walk[:-1], _starts)), \
+        np.concatenate((_walk[1:], _ends))
+
+def test_query_pairs(random_segments):
+    """
+    Box queries return exactly the overlapping boxes, grouped by query
+    """
+
+    _starts, _ends = get_segments(random_segments, 500)
+
+    _index = SegmentIndex()
+    _index.add_lines(_starts, _ends)
+
+    _boxes = LineSegment.get_boxes(_starts[::7] + 0.5, _ends[::7] - 0.25)
+    _query, _items = _index.query_pairs(_boxes)
+
+    assert np.all(np.diff(_query) >= 0)
+
+    _b = _index.boxes
+
+    for _k, _box in enumerate(_boxes):
+
+        _expected = np.flatnonzero(~(
+            (_b[:, 0] > _box[1]) | (_b[:, 1] < _box[0])
+            | (_b[:, 2] > _box[3]) | (_b[:, 3] < _box[2])))
+
+        assert sorted(_items[_query == _k].tolist()) == _expected.tolist()
+        assert _index.query_box(_box) == _expected.tolist()
+
+def test_intersecting(random_segments):
+    """
+    Indexed intersections match testing every segment
+    """
+
+    _starts, _ends = get_segments(random_segments, 300)
+
+    _segments = [LineSegment(tuple(_s), tuple(_e))
+                 for _s, _e in zip(_starts.tolist(), _ends.tolist())]
+
+    _index = SegmentIndex(_segments)
+
+    for _q in _segments[::11]:
+
+        _expected = []
+
+        for _i, _s in enumerate(_segments):
+
+            #parallel segments, including the segment itself, are not
+            #intersecting
+            try:
+                _hit = _q.is_intersecting(_s)[0]
+
+            except ZeroDivisionError:
+                continue
+
+            if _hit:
+                _expected.append(_i)
+
+        assert [_i for _i, _p in _index.intersecting(_q)] == _expected
+
+def test_nearest(random_segments):
+    """
+    The nearest segment within the radius matches the minimum distance
+    to every segment
+    """
+
+    _starts, _ends = get_segments(random_segments, 400)
+
+    _index = SegmentIndex()
+    _index.add_lines(_starts, _ends)
+
+    _points = np.random.default_rng(3).uniform(-30.0, 30.0, (300, 2))
+
+    _result = _index.nearest(_points, 2.0)
+
+    for _i, _p in enumerate(_points):
+
+        _d = LineSegment.point_distances(
+            np.repeat(_p[None], len(_starts), 0), _starts, _ends)
+
+        if _d.min() > 2.0:
+
+            assert _result.index[_i] == -1
+            assert _result.distance[_i] == np.inf
+            continue
+
+        assert np.isclose(_result.distance[_i], _d.min())
+        assert np.isclose(_d[_result.index[_i]], _d.min())
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Steering state cache tests
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.vehicle import Vehicle
+
+def test_steering_states():
+    """
+    Cached steering states match the exact solution of each angle to
+    within the angle resolution, solving each distinct angle once
+    """
+
+    _vehicle = Vehicle.from_template('WB-67')
+    _vehicle.clear_cache()
+
+    _angles = np.concatenate((
+        np.linspace(-0.5, 0.5, 100), np.full(50, 0.2), [1e-6, -2e-5]))
+
+    _radius, _center, _wheels = _vehicle.get_steering_states(_angles)
+
+    for _i, _a in enumerate(_angles.tolist()):
+
+        _r, _c, _w = _vehicle.solve_steering(_a)
+
+        assert np.allclose(_wheels[_i], _w, atol=_vehicle.angle_resolution)
+        assert np.isclose(
+            np.arctan(_vehicle.axle_distance / _radius[_i]),
+            np.arctan(_vehicle.axle_distance / _r),
+            atol=_vehicle.angle_resolution)
+
+    #100 distinct angles, 0.2, and two angles below the resolution
+    assert _vehicle.get_cache_info().misses == 101
+
+    #the scalar and array lookups share the cache
+    _state = _vehicle.get_steering_state(0.2)
+
+    assert _vehicle.get_cache_info().misses == 101
+    assert np.isclose(_state[0], _radius[-3])
+    assert np.allclose(_state[1], _center[-3])
+
+def test_steering_tolerance():
+    """
+    The cached state of an angle steers within half the angle resolution
+    of the exact solution, for angles between the quantized angles
+    """
+
+    _vehicle = Vehicle.from_template('WB-67')
+    _vehicle.clear_cache()
+
+    _resolution = _vehicle.angle_resolution
+    _angles = np.random.default_rng(1).uniform(-0.5, 0.5, 200)
+
+    #the worst case, halfway between quantized angles
+    _angles[:10] = (np.arange(10) + 1000.5) * _resolution
+
+    _states = _vehicle.get_steering_states(_angles)
+
+    for _i, _a in enumerate(_angles.tolist()):
+
+        _state = _vehicle.get_steering_state(_a)
+        _exact = _vehicle.solve_steering(_a)
+
+        assert np.isclose(_state[0], _states[0][_i])
+
+        assert np.isclose(
+            np.arctan(_vehicle.axle_distance / _state[0]),
+            np.arctan(_vehicle.axle_distance / _exact[0]),
+            rtol=0.0, atol=_resolution / 2.0 + 1e-12)
+
+        assert np.allclose(_state[2], _exact[2], rtol=0.0, atol=_resolution)
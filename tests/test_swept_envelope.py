@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Swept envelope tests
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('freecad_python_support')
+
+from freecad.turns.model.segment_index import SegmentIndex
+from freecad.turns.model.swept_envelope import SweptEnvelope
+
+RECTANGLE = np.array([(2.0, 1.0), (-2.0, 1.0), (-2.0, -1.0), (2.0, -1.0)])
+
+def get_turn(radius, angle, count):
+    """
+    Return the footprints of the rectangle driven around a circular turn
+    """
+
+    _t = np.linspace(0.0, angle, count)
+    _cos, _sin = np.cos(_t), np.sin(_t)
+
+    _rotation = np.stack(
+        (np.stack((_cos, -_sin), axis=1), np.stack((_sin, _cos), axis=1)),
+        axis=1)
+
+    _centers = np.stack((radius * _sin, radius - radius * _cos), axis=1)
+
+    return np.einsum('nij,mj->nmi', _rotation, RECTANGLE) + _centers[:, None]
+
+def get_inside_ring(points, ring):
+    """
+    Even-odd test of (n, 2) points against a closed ring
+    """
+
+    _a = ring
+    _b = np.roll(ring, -1, axis=0)
+
+    _x, _y = points[:, 0:1], points[:, 1:2]
+
+    _crosses = (_a[:, 1] > _y) != (_b[:, 1] > _y)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _xi = _a[:, 0] + (_y - _a[:, 1]) * (_b[:, 0] - _a[:, 0]) \
+            / (_b[:, 1] - _a[:, 1])
+
+    return (np.count_nonzero(_crosses & (_x < _xi), axis=1) % 2) == 1
+
+def get_inside_footprints(points, footprints):
+    """
+    Return True for (n, 2) points inside any of the ccw convex footprints
+    """
+
+    _inside = np.zeros(len(points), dtype=bool)
+
+    for _fp in footprints:
+
+        _edge = np.roll(_fp, -1, axis=0) - _fp
+        _rel = points[:, None, :] - _fp[None]
+
+        _cross = _edge[None, :, 0] * _rel[..., 1] - _edge[None, :, 1] * _rel[..., 0]
+
+        _inside |= (_cross >= 0.0).all(axis=1)
+
+    return _inside
+
+def test_straight():
+    """
+    A straight sweep is the rectangle spanning the first and last
+    footprints
+    """
+
+    _footprints = np.array([RECTANGLE + (_x, 0.0) for _x in np.linspace(0.0, 20.0, 41)])
+
+    _envelope = SweptEnvelope(_footprints)
+    _left, _right = _envelope.build()
+
+    assert np.isclose(abs(SweptEnvelope.get_area(_envelope.outer)), 48.0)
+    assert np.allclose(_left[:, 1].max(), 1.0)
+    assert np.allclose(_right[:, 1].min(), -1.0)
+
+def test_turn():
+    """
+    Points away from the envelope boundary are inside the envelope only
+    if inside one of the footprints of a turning sweep
+    """
+
+    _footprints = get_turn(12.0, np.pi / 2.0, 400)
+
+    _envelope = SweptEnvelope(_footprints)
+    _envelope.build()
+
+    assert not _envelope.holes
+
+    _ring = _envelope.outer
+
+    _grid = np.stack(np.meshgrid(
+        np.arange(-4.0, 16.0, 0.1), np.arange(-3.0, 17.0, 0.1)), axis=-1
+    ).reshape(-1, 2)
+
+    #points near the boundary depend on the envelope tolerance
+    _index = SegmentIndex()
+    _index.add_lines(_ring, np.roll(_ring, -1, axis=0))
+
+    _grid = _grid[_index.nearest(_grid, 0.05).index < 0]
+
+    assert np.array_equal(
+        get_inside_ring(_grid, _ring), get_inside_footprints(_grid, _footprints))
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Vehicle template library tests
+"""
+
+import importlib.util
+import json
+
+import numpy as np
+
+from freecad.turns.model.template_library import TemplateLibrary
+
+COMPILER = '''
+import numpy as np
+
+def compile_template(template):
+    """
+    Compile a template, adding an array field
+    """
+
+    return dict(template, Points=np.array(template['Points'], dtype=float) * {})
+'''
+
+TEMPLATES = [
+    {'Symbol': 'A', 'Points': [[0.0, 0.0], [1.0, 2.0]]},
+    {'Symbol': ['B'], 'Points': [[3.0, 4.0]]},
+    {'Symbol': 'C'},
+    {'Points': [[5.0, 6.0]]},
+]
+
+def write_templates(file_name, templates):
+    """
+    Write a template json file
+    """
+
+    with open(file_name, 'w') as _fp:
+        json.dump({'vehicles': templates}, _fp)
+
+def get_compiler(file_name, scale):
+    """
+    Write and import a compiler module, returning its compiler function
+    """
+
+    with open(file_name, 'w') as _fp:
+        _fp.write(COMPILER.format(scale))
+
+    _spec = importlib.util.spec_from_file_location('template_compiler', file_name)
+    _module = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(_module)
+
+    return _module.compile_template
+
+def get_library(tmp_path, compiler, compiled):
+    """
+    Return a template library on the test file, caching in the test
+    directory and recording the files it compiles
+    """
+
+    class _Library(TemplateLibrary):
+        """
+        Template library recording compiled files
+        """
+
+        def compile_source(self, file_name):
+            """
+            Override of base function
+            """
+
+            compiled.append(file_name)
+
+            return super().compile_source(file_name)
+
+    _library = _Library([str(tmp_path / 'templates.json')], compiler)
+    _library.cache_dir = str(tmp_path / 'cache')
+
+    (tmp_path / 'cache').mkdir(exist_ok=True)
+
+    return _library
+
+def test_lazy_load(tmp_path):
+    """
+    Templates are compiled on first access only, skipping those which
+    fail to compile into the errors
+    """
+
+    _compiled = []
+
+    write_templates(tmp_path / 'templates.json', TEMPLATES)
+
+    _library = get_library(
+        tmp_path, get_compiler(tmp_path / 'compiler.py', 1), _compiled)
+
+    assert _library.templates is None
+    assert not _compiled
+
+    assert sorted(_library) == ['A', 'B']
+    assert np.array_equal(_library['A']['Points'], [[0.0, 0.0], [1.0, 2.0]])
+
+    assert _compiled == _library.sources
+
+    #one for the missing points, one for the missing symbol
+    assert len(_library.errors) == 2
+    assert 'template 4 has no symbol' in _library.errors[1]
+
+    assert len(_library) == 2
+    assert np.array_equal(_library['B']['Points'], [[3.0, 4.0]])
+    assert len(_compiled) == 1
+
+def test_cache(tmp_path):
+    """
+    Cached templates are reused until the template file or the compiler
+    source changes
+    """
+
+    _compiled = []
+    _file = tmp_path / 'templates.json'
+    _compiler = get_compiler(tmp_path / 'compiler.py', 1)
+
+    write_templates(_file, TEMPLATES)
+
+    _first = dict(get_library(tmp_path, _compiler, _compiled))
+
+    #cache hit, with the arrays and skipped templates restored
+    _library = get_library(tmp_path, _compiler, _compiled)
+
+    assert sorted(_library) == ['A', 'B']
+    assert len(_compiled) == 1
+    assert len(_library.errors) == 2
+
+    for _k, _v in _first.items():
+        assert np.array_equal(_library[_k]['Points'], _v['Points'])
+
+    #changed template file
+    write_templates(_file, TEMPLATES[:1] + [{'Symbol': 'D', 'Points': []}])
+
+    _library = get_library(tmp_path, _compiler, _compiled)
+
+    assert sorted(_library) == ['A', 'D']
+    assert len(_compiled) == 2
+    assert not _library.errors
+
+    #changed compiler source, of another size so it is not read from bytecode
+    _compiler = get_compiler(tmp_path / 'compiler.py', 10)
+    _library = get_library(tmp_path, _compiler, _compiled)
+
+    assert np.array_equal(_library['A']['Points'], [[0.0, 0.0], [10.0, 20.0]])
+    assert len(_compiled) == 3
+
+    #unchanged since
+    assert sorted(get_library(tmp_path, _compiler, _compiled)) == ['A', 'D']
+    assert len(_compiled) == 3